@@ -1,59 +1,70 @@
 import sys
+import time
 import logging
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTableWidget, QTableWidgetItem, QLabel, QLineEdit, QComboBox,
-    QPushButton, QMenuBar, QMenu, QMessageBox, QSplitter, QTextEdit,
-    QFormLayout, QGroupBox, QStatusBar, QHeaderView
+    QTableView, QAbstractItemView, QLabel, QLineEdit, QComboBox,
+    QPushButton, QMenuBar, QMenu, QMessageBox, QSplitter,
+    QFormLayout, QGroupBox, QStatusBar, QHeaderView, QProgressBar,
+    QFileDialog, QProgressDialog
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QAction, QFont
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-from models import Word, UserProgress
+from models import Word, UserProgress, WordChange
 from database import DatabaseManager
-from exceptions import EmptyFieldError, InvalidDifficultyError, DatabaseError
+from sharding import ShardedDatabaseManager
+from table_model import WordTableModel
+from workers import DbExecutor, DbEvents, TaskProgress
+from exceptions import (
+    EmptyFieldError, InvalidDifficultyError, DatabaseError, OperationCancelledError
+)
+from log_view import LogView
+import transfer
 import settings
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(settings.LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
-class MplCanvas(FigureCanvas):
-    """Холст для matplotlib"""
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.fig.add_subplot(111)
-        super().__init__(self.fig)
-        self.setParent(parent)
-        
-        self.axes.set_facecolor('#f0f0f0')
-        self.fig.patch.set_facecolor('#ffffff')
-
-
 class LanguageLearningApp(QMainWindow):
     """Главное окно приложения"""
     
+    chart_ready = Signal()  # Холст графика создан и отрисован
+    
     def __init__(self):
         super().__init__()
-        self.db = DatabaseManager()
-        self.current_word_id: Optional[int] = None
+        # Режим просмотра открывает файл только для чтения, без блокировок на запись
+        self.read_only = settings.DB_READ_ONLY
+        if settings.DB_SHARDED:
+            self.db = ShardedDatabaseManager(read_only=self.read_only)
+        else:
+            self.db = DatabaseManager(read_only=self.read_only)
+        
+        # Все операции с БД выполняются в фоне, изменения приходят сигналом
+        self.executor = DbExecutor(parent=self)
+        self.db_events = DbEvents(self)
+        self._db_listener = self.db_events.changed.emit
+        self.db.add_listener(self._db_listener)
+        
+        self.selected_word_ids: List[int] = []
+        self.graph_days = settings.DEFAULT_GRAPH_DAYS
+        
+        # Последние загруженные данные, обновляемые по изменениям из БД
+        self._progress: Optional[UserProgress] = None
+        self._daily_stats: List[dict] = []
+        self._search_task = None
+        
+        self.chart_import_ms: Optional[float] = None
         
         self._setup_ui()
         self._setup_menu()
+        if self.read_only:
+            self._disable_editing()
+        if not settings.FAST_STARTUP:
+            self._ensure_chart()
         self._load_data()
         self._setup_connections()
         
@@ -128,16 +139,35 @@ class LanguageLearningApp(QMainWindow):
         
         top_layout.addLayout(button_layout)
         
-        # Таблица слов
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Слово", "Перевод", "Язык", "Сложность", "Последний повтор"
-        ])
+        # Таблица слов: строки подгружаются из БД по мере прокрутки
+        self.word_model = WordTableModel(self.db, executor=self.executor, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.word_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         
-        top_layout.addWidget(QLabel("Ваши слова:"))
+        # Поиск по словам и переводам: запрос уходит после паузы во вводе
+        search_layout = QHBoxLayout()
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Поиск слова или перевода")
+        self.search_input.setClearButtonEnabled(True)
+        
+        self.search_language_combo = QComboBox()
+        self.search_language_combo.addItem("Все языки")
+        self.search_language_combo.addItems(settings.SUPPORTED_LANGUAGES)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(settings.SEARCH_DEBOUNCE_MS)
+        
+        search_layout.addWidget(QLabel("Ваши слова:"))
+        search_layout.addStretch()
+        search_layout.addWidget(self.search_input, 2)
+        search_layout.addWidget(self.search_language_combo)
+        
+        top_layout.addLayout(search_layout)
         top_layout.addWidget(self.table)
         
         splitter.addWidget(top_widget)
@@ -150,13 +180,31 @@ class LanguageLearningApp(QMainWindow):
         graph_widget = QWidget()
         graph_layout = QVBoxLayout(graph_widget)
         
-        self.graph_label = QLabel("Прогресс изучения (последние 7 дней)")
+        graph_header = QHBoxLayout()
+        
+        self.graph_label = QLabel()
         self.graph_label.setFont(QFont("Arial", 10, QFont.Bold))
         
-        self.canvas = MplCanvas(self, width=6, height=4, dpi=100)
+        # Период графика в днях
+        self.graph_range_combo = QComboBox()
+        for days in settings.GRAPH_RANGES:
+            self.graph_range_combo.addItem(f"{days} дней", days)
+        self.graph_range_combo.setCurrentIndex(settings.GRAPH_RANGES.index(self.graph_days))
+        self._update_graph_label()
+        
+        graph_header.addWidget(self.graph_label)
+        graph_header.addStretch()
+        graph_header.addWidget(self.graph_range_combo)
+        
+        # Холст создается отдельно: matplotlib загружается только вместе с ним
+        self.canvas = None
+        self.chart = None
+        self.chart_placeholder = QLabel("Загрузка графика...")
+        self.chart_placeholder.setAlignment(Qt.AlignCenter)
+        self._graph_layout = graph_layout
         
-        graph_layout.addWidget(self.graph_label)
-        graph_layout.addWidget(self.canvas)
+        graph_layout.addLayout(graph_header)
+        graph_layout.addWidget(self.chart_placeholder, 1)
         
         # Статистика
         stats_widget = QWidget()
@@ -184,8 +232,7 @@ class LanguageLearningApp(QMainWindow):
         log_label = QLabel("Лог действий:")
         log_label.setFont(QFont("Arial", 10, QFont.Bold))
         
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
+        self.log_text = LogView()
         self.log_text.setMaximumHeight(200)
         
         log_layout.addWidget(log_label)
@@ -204,6 +251,13 @@ class LanguageLearningApp(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Готово")
+        
+        # Индикатор фоновых операций
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(120)
+        self.busy_indicator.setVisible(False)
+        self.status_bar.addPermanentWidget(self.busy_indicator)
     
     def _setup_menu(self):
         """Настройка меню"""
@@ -212,6 +266,23 @@ class LanguageLearningApp(QMainWindow):
         # Меню
         file_menu = menubar.addMenu("Меню")
         
+        refresh_action = QAction("Обновить", self)
+        refresh_action.setShortcut("F5")
+        refresh_action.triggered.connect(self._load_data)
+        file_menu.addAction(refresh_action)
+        
+        export_action = QAction("Экспорт...", self)
+        export_action.setShortcut("Ctrl+E")
+        export_action.triggered.connect(self._export_words)
+        file_menu.addAction(export_action)
+        
+        self.import_action = QAction("Импорт...", self)
+        self.import_action.setShortcut("Ctrl+I")
+        self.import_action.triggered.connect(self._import_words)
+        file_menu.addAction(self.import_action)
+        
+        file_menu.addSeparator()
+        
         exit_action = QAction("Выход", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -223,106 +294,230 @@ class LanguageLearningApp(QMainWindow):
         about_action.triggered.connect(self._show_about)
         help_menu.addAction(about_action)
     
+    def _disable_editing(self):
+        """Режим только для чтения: изменяющие действия недоступны"""
+        self.setWindowTitle(f"{self.windowTitle()} (только чтение)")
+        for widget in (self.add_button, self.delete_button, self.learn_button,
+                       self.import_action):
+            widget.setEnabled(False)
+    
     def _setup_connections(self):
         """Настройка сигналов"""
         self.add_button.clicked.connect(self._add_word)
         self.delete_button.clicked.connect(self._delete_word)
         self.learn_button.clicked.connect(self._mark_as_learned)
         self.update_graph_button.clicked.connect(self._update_graph)
-        self.table.itemSelectionChanged.connect(self._on_table_selection)
+        self.graph_range_combo.currentIndexChanged.connect(self._on_graph_range_changed)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_language_combo.currentIndexChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self._run_search)
+        self.table.selectionModel().selectionChanged.connect(self._on_table_selection)
+        # Перезагрузка таблицы сбрасывает выделение без сигнала selectionChanged
+        self.word_model.modelReset.connect(self._on_table_selection)
+        self.db_events.changed.connect(self._on_word_changed)
+        self.executor.busy_changed.connect(self.busy_indicator.setVisible)
+        self.executor.failed.connect(
+            lambda e: self._on_db_error("Ошибка загрузки данных", e)
+        )
     
     def _load_data(self):
         """Загрузка данных из БД"""
-        try:
-            # Загрузка слов
-            words = self.db.get_all_words()
-            self._populate_table(words)
-            
-            # Загрузка статистики
-            self._update_stats()
-            
-            # Обновление графика
-            self._update_graph()
-            
-            self.status_bar.showMessage(f"Загружено {len(words)} слов")
-            self._log_action(f"Загружено {len(words)} слов из базы данных")
-            
-        except Exception as e:
-            self._show_error(f"Ошибка загрузки данных: {str(e)}")
-            logger.error(f"Ошибка загрузки данных: {e}")
-    
-    def _populate_table(self, words):
-        """Заполнение таблицы словами"""
-        self.table.setRowCount(len(words))
-        
-        for row, word in enumerate(words):
-            self.table.setItem(row, 0, QTableWidgetItem(str(word.id or "")))
-            self.table.setItem(row, 1, QTableWidgetItem(word.word))
-            self.table.setItem(row, 2, QTableWidgetItem(word.translation))
-            self.table.setItem(row, 3, QTableWidgetItem(word.language))
-            self.table.setItem(row, 4, QTableWidgetItem(str(word.difficulty)))
-            self.table.setItem(row, 5, QTableWidgetItem(
-                word.last_reviewed.strftime("%Y-%m-%d %H:%M") 
-                if word.last_reviewed else "Не изучено"
-            ))
-    
-    def _update_stats(self):
-        """Обновление статистики"""
-        try:
-            progress = self.db.get_user_progress()
-            
-            self.total_words_label.setText(f"Всего слов: {progress.total_words}")
-            self.learned_words_label.setText(f"Изучено слов: {progress.learned_words}")
-            self.progress_label.setText(
-                f"Прогресс: {progress.get_progress_percentage():.1f}%"
-            )
-            self.streak_label.setText(f"Серия дней: {progress.streak_days}")
-            
-        except Exception as e:
-            logger.error(f"Ошибка обновления статистики: {e}")
+        self._reload_words()
+        
+        # Новое обновление отменяет еще не завершенное предыдущее
+        self.executor.submit(
+            self._fetch_summary, key="refresh",
+            on_result=self._on_data_loaded,
+            on_error=lambda e: self._on_db_error("Ошибка загрузки данных", e)
+        )
+    
+    def _reload_words(self):
+        """Перезагрузка таблицы: все слова или результаты текущего поиска"""
+        if self._search_query():
+            self._run_search()
+        else:
+            # Первую страницу слов модель подгружает в фоне сама
+            self.word_model.refresh()
+    
+    def _search_query(self) -> str:
+        """Текущий поисковый запрос"""
+        return self.search_input.text().strip()
+    
+    def _run_search(self):
+        """Поиск слов по введенному запросу"""
+        self.search_timer.stop()
+        query = self._search_query()
+        
+        # Результат предыдущего поиска больше не нужен
+        if self._search_task is not None:
+            self.executor.cancel(self._search_task)
+            self._search_task = None
+        if not query:
+            self.word_model.refresh()
+            return
+        
+        language = None
+        if self.search_language_combo.currentIndex() > 0:
+            language = self.search_language_combo.currentText()
+        self._search_task = self.executor.submit(
+            self.db.search, query, language, key="search",
+            on_result=self._on_search_results,
+            on_error=lambda e: self._on_db_error("Ошибка поиска", e)
+        )
+    
+    def _on_search_results(self, words: List[Word]):
+        """Отображение результатов поиска"""
+        self._search_task = None
+        self.word_model.show_words(words)
+        self.status_bar.showMessage(f"Найдено слов: {len(words)}")
+    
+    def _fetch_summary(self):
+        """Прогресс и дневная статистика (выполняется в фоне)"""
+        return self.db.get_user_progress(), self.db.get_daily_stats(days=self.graph_days)
+    
+    def _on_data_loaded(self, result):
+        """Отображение загруженных данных"""
+        progress, stats = result
+        self._show_progress(progress)
+        self._on_graph_loaded(stats)
+        
+        self.status_bar.showMessage(f"Загружено {progress.total_words} слов")
+        self._log_action(f"Загружено {progress.total_words} слов из базы данных")
+    
+    def _show_progress(self, progress: UserProgress):
+        """Отображение прогресса пользователя"""
+        self._progress = progress
+        self.total_words_label.setText(f"Всего слов: {progress.total_words}")
+        self.learned_words_label.setText(f"Изучено слов: {progress.learned_words}")
+        self.progress_label.setText(
+            f"Прогресс: {progress.get_progress_percentage():.1f}%"
+        )
+        self.streak_label.setText(
+            f"Серия дней: {progress.streak_days} (рекорд: {progress.longest_streak})"
+        )
     
     def _update_graph(self):
         """Обновление графика прогресса"""
+        self.executor.submit(
+            self.db.get_daily_stats, days=self.graph_days, key="graph",
+            on_result=self._on_graph_loaded,
+            on_error=lambda e: self._on_db_error("Ошибка построения графика", e)
+        )
+    
+    def _on_graph_loaded(self, stats: List[dict]):
+        """Отображение загруженной дневной статистики"""
         try:
-            stats = self.db.get_daily_stats(days=7)
+            self._daily_stats = stats
+            self._draw_graph(stats)
             
-            if not stats:
-                self.canvas.axes.clear()
-                self.canvas.axes.text(0.5, 0.5, 'Нет данных', 
-                                     ha='center', va='center',
-                                     transform=self.canvas.axes.transAxes)
-                self.canvas.draw()
+        except Exception as e:
+            logger.error(f"Ошибка обновления графика: {e}")
+            self._show_error(f"Ошибка построения графика: {str(e)}")
+    
+    def _draw_graph(self, stats: List[dict]):
+        """Отрисовка графика по дневной статистике (без изменений данных не перерисовывается)"""
+        if self.chart is None:
+            return  # График построится по self._daily_stats при создании холста
+        self.chart.update(stats, self.graph_days)
+    
+    def _ensure_chart(self):
+        """Создание холста графика с загрузкой matplotlib"""
+        if self.chart is not None:
+            return
+        start = time.perf_counter()
+        from chart import MplCanvas, ProgressChart
+        self.chart_import_ms = (time.perf_counter() - start) * 1000
+        
+        self.canvas = MplCanvas(self, width=6, height=4, dpi=100)
+        self.chart = ProgressChart(self.canvas)
+        self._graph_layout.replaceWidget(self.chart_placeholder, self.canvas)
+        self.chart_placeholder.deleteLater()
+        self.chart_placeholder = None
+        
+        self._draw_graph(self._daily_stats)
+        self.chart_ready.emit()
+    
+    def showEvent(self, event):
+        """Первый показ окна: график создается после отрисовки окна"""
+        super().showEvent(event)
+        if self.chart is None:
+            QTimer.singleShot(0, self._ensure_chart)
+    
+    def _update_graph_label(self):
+        """Заголовок графика с текущим периодом"""
+        self.graph_label.setText(f"Прогресс изучения (последние {self.graph_days} дней)")
+    
+    def _on_graph_range_changed(self):
+        """Смена периода графика"""
+        self.graph_days = self.graph_range_combo.currentData()
+        self._update_graph_label()
+        self._update_graph()
+    
+    def _on_word_changed(self, change: WordChange):
+        """Инкрементальное обновление интерфейса по изменению в БД"""
+        try:
+            if change.action == WordChange.RELOADED:
+                self._load_data()
                 return
             
-            dates = [stat['date'] for stat in stats]
-            added = [stat['added'] for stat in stats]
-            learned = [stat['learned'] for stat in stats]
-            
-            self.canvas.axes.clear()
-            
-            x = range(len(dates))
-            width = 0.35
-            
-            self.canvas.axes.bar([i - width/2 for i in x], added, width, 
-                                label='Добавлено', color='#2196F3')
-            self.canvas.axes.bar([i + width/2 for i in x], learned, width, 
-                                label='Изучено', color='#4CAF50')
-            
-            self.canvas.axes.set_xlabel('Дата')
-            self.canvas.axes.set_ylabel('Количество слов')
-            self.canvas.axes.set_title('Статистика за последние 7 дней')
-            self.canvas.axes.set_xticks(x)
-            self.canvas.axes.set_xticklabels([d.split('-')[-1] + '/' + d.split('-')[-2] 
-                                            for d in dates], rotation=45)
-            self.canvas.axes.legend()
-            self.canvas.axes.grid(True, alpha=0.3)
-            
-            self.canvas.fig.tight_layout()
-            self.canvas.draw()
+            if self._search_query():
+                # Изменение может затронуть результаты: повторяем поиск
+                self.search_timer.start()
+            else:
+                self.word_model.apply_change(change)
+            
+            if self._progress is not None:
+                self._progress.total_words += change.total_delta
+                self._progress.learned_words += change.learned_delta
+                if change.action == WordChange.UPDATED:
+                    self._progress.last_active = change.word.last_reviewed
+                self._show_progress(self._progress)
+            
+            if change.action == WordChange.UPDATED:
+                # Повторение может продлить серию дней: одна строка user_progress
+                self.executor.submit(
+                    self.db.get_user_progress, key="progress",
+                    on_result=self._show_progress,
+                    on_error=lambda e: self._on_db_error("Ошибка загрузки прогресса", e)
+                )
+            
+            if self._apply_stats_delta(change):
+                self._draw_graph(self._daily_stats)
             
         except Exception as e:
-            logger.error(f"Ошибка обновления графика: {e}")
-            self._show_error(f"Ошибка построения графика: {str(e)}")
+            logger.error(f"Ошибка обновления интерфейса: {e}")
+    
+    def _apply_stats_delta(self, change: WordChange) -> bool:
+        """Применение изменения к дневной статистике графика"""
+        word = change.word
+        if word is None or word.created_at is None:
+            return False
+        
+        is_learned = word.difficulty >= 4
+        was_learned = change.previous is not None and change.previous.difficulty >= 4
+        if change.action == WordChange.ADDED:
+            added, learned = 1, int(is_learned)
+        elif change.action == WordChange.DELETED:
+            added, learned = -1, -int(was_learned)
+        else:
+            added, learned = 0, int(is_learned) - int(was_learned)
+        if not added and not learned:
+            return False
+        
+        day = word.created_at.date().isoformat()
+        for stat in self._daily_stats:
+            if stat['date'] == day:
+                stat['added'] += added
+                stat['learned'] += learned
+                return True
+        
+        # Новый день появляется на графике только если попадает в период
+        cutoff = (date.today() - timedelta(days=self.graph_days)).isoformat()
+        if added <= 0 or day < cutoff:
+            return False
+        self._daily_stats.append({'date': day, 'added': added, 'learned': learned})
+        self._daily_stats.sort(key=lambda stat: stat['date'])
+        return True
     
     def _add_word(self):
         """Добавление нового слова"""
@@ -348,127 +543,212 @@ class LanguageLearningApp(QMainWindow):
                 difficulty=difficulty
             )
             
-            # Сохранение в БД
-            word_id = self.db.add_word(new_word)
-            
-            # Обновление интерфейса
-            self._load_data()
-            
-            # Очистка полей ввода
-            self.word_input.clear()
-            self.translation_input.clear()
-            
-            self.status_bar.showMessage(f"Слово '{word}' добавлено")
-            self._log_action(f"Добавлено слово: '{word}' - '{translation}'")
-            
-            QMessageBox.information(self, "Успех", 
-                                  f"Слово '{word}' успешно добавлено!")
+            # Сохранение в БД в фоне: таблица и статистика обновятся по событию
+            self.executor.submit(
+                self.db.add_word, new_word,
+                on_result=lambda word_id: self._on_word_added(new_word),
+                on_error=lambda e: self._on_db_error("Ошибка добавления слова", e)
+            )
             
         except EmptyFieldError as e:
             self._show_error(str(e))
         except InvalidDifficultyError as e:
             self._show_error(str(e))
-        except DatabaseError as e:
-            self._show_error(str(e))
         except Exception as e:
             self._show_error(f"Неизвестная ошибка: {str(e)}")
             logger.error(f"Ошибка добавления слова: {e}")
     
+    def _on_word_added(self, word: Word):
+        """Завершение добавления слова"""
+        # Очистка полей ввода
+        self.word_input.clear()
+        self.translation_input.clear()
+        
+        self.status_bar.showMessage(f"Слово '{word.word}' добавлено")
+        self._log_action(f"Добавлено слово: '{word.word}' - '{word.translation}'")
+        
+        QMessageBox.information(self, "Успех", 
+                              f"Слово '{word.word}' успешно добавлено!")
+    
     def _delete_word(self):
-        """Удаление выбранного слова"""
-        if self.current_word_id is None:
+        """Удаление выбранных слов"""
+        if not self.selected_word_ids:
             return
         
-        try:
-            # Получение слова для подтверждения
-            words = self.db.get_all_words()
-            word_to_delete = None
-            for word in words:
-                if word.id == self.current_word_id:
-                    word_to_delete = word
-                    break
-            
-            if not word_to_delete:
-                raise DatabaseError("Слово не найдено")
-            
-            # Подтверждение удаления
-            reply = QMessageBox.question(
-                self, 'Подтверждение',
-                f"Вы уверены, что хотите удалить слово '{word_to_delete.word}'?",
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        if len(self.selected_word_ids) > 1:
+            self._confirm_delete_many(list(self.selected_word_ids))
+            return
+        
+        # Получение слова для подтверждения
+        self.executor.submit(
+            self.db.get_word, self.selected_word_ids[0],
+            on_result=self._confirm_delete,
+            on_error=lambda e: self._on_db_error("Ошибка удаления", e)
+        )
+    
+    def _confirm_delete(self, word_to_delete: Word):
+        """Подтверждение и удаление слова"""
+        reply = QMessageBox.question(
+            self, 'Подтверждение',
+            f"Вы уверены, что хотите удалить слово '{word_to_delete.word}'?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            self.executor.submit(
+                self.db.delete_word, word_to_delete.id,
+                on_result=lambda change: self._on_word_deleted(word_to_delete),
+                on_error=lambda e: self._on_db_error("Ошибка удаления", e)
             )
-            
-            if reply == QMessageBox.Yes:
-                self.db.delete_word(self.current_word_id)
-                self._load_data()
-                
-                self.status_bar.showMessage(f"Слово '{word_to_delete.word}' удалено")
-                self._log_action(f"Удалено слово: '{word_to_delete.word}'")
-                
-        except Exception as e:
-            self._show_error(f"Ошибка удаления: {str(e)}")
-            logger.error(f"Ошибка удаления слова: {e}")
+    
+    def _on_word_deleted(self, word: Word):
+        """Завершение удаления слова"""
+        self.status_bar.showMessage(f"Слово '{word.word}' удалено")
+        self._log_action(f"Удалено слово: '{word.word}'")
+    
+    def _confirm_delete_many(self, word_ids: List[int]):
+        """Подтверждение и удаление нескольких слов одним запросом"""
+        reply = QMessageBox.question(
+            self, 'Подтверждение',
+            f"Вы уверены, что хотите удалить выбранные слова ({len(word_ids)})?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            self.executor.submit(
+                self.db.delete_words, word_ids,
+                on_result=self._on_words_deleted,
+                on_error=lambda e: self._on_db_error("Ошибка удаления", e)
+            )
+    
+    def _on_words_deleted(self, count: int):
+        """Завершение удаления нескольких слов"""
+        self.status_bar.showMessage(f"Удалено слов: {count}")
+        self._log_action(f"Удалено слов: {count}")
     
     def _mark_as_learned(self):
-        """Отметить слово как изученное"""
-        if self.current_word_id is None:
+        """Отметить выбранные слова как изученные"""
+        if not self.selected_word_ids:
             return
         
-        try:
-            self.db.mark_as_learned(self.current_word_id)
-            self._load_data()
-            
-            self.status_bar.showMessage("Слово отмечено как изученное")
-            self._log_action(f"Слово отмечено как изученное (ID: {self.current_word_id})")
-            
-            QMessageBox.information(self, "Успех", "Слово отмечено как изученное!")
-            
-        except Exception as e:
-            self._show_error(f"Ошибка: {str(e)}")
-            logger.error(f"Ошибка отметки как изученное: {e}")
+        if len(self.selected_word_ids) > 1:
+            word_ids = list(self.selected_word_ids)
+            self.executor.submit(
+                self.db.mark_as_learned_many, word_ids,
+                on_result=self._on_words_learned,
+                on_error=lambda e: self._on_db_error("Ошибка", e)
+            )
+            return
+        
+        word_id = self.selected_word_ids[0]
+        self.executor.submit(
+            self.db.mark_as_learned, word_id,
+            on_result=lambda change: self._on_word_learned(word_id),
+            on_error=lambda e: self._on_db_error("Ошибка", e)
+        )
+    
+    def _on_word_learned(self, word_id: int):
+        """Завершение отметки слова как изученного"""
+        self.status_bar.showMessage("Слово отмечено как изученное")
+        self._log_action(f"Слово отмечено как изученное (ID: {word_id})")
+        
+        QMessageBox.information(self, "Успех", "Слово отмечено как изученное!")
+    
+    def _on_words_learned(self, count: int):
+        """Завершение отметки нескольких слов как изученных"""
+        self.status_bar.showMessage(f"Отмечено как изученные: {count}")
+        self._log_action(f"Отмечено как изученные слов: {count}")
     
     def _on_table_selection(self):
-        """Обработка выбора строки в таблице"""
-        selected_items = self.table.selectedItems()
+        """Обработка выбора строк в таблице"""
+        # Строки вытесненных страниц модель дочитывает в фоне
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        self.word_model.words_at(rows, self._on_selected_words)
+    
+    def _on_selected_words(self, words: List[Word]):
+        """Слова выделенных строк получены"""
+        self.selected_word_ids = [word.id for word in words if word.id is not None]
         
-        if selected_items:
-            row = selected_items[0].row()
-            word_id_item = self.table.item(row, 0)
-            
-            if word_id_item and word_id_item.text():
-                self.current_word_id = int(word_id_item.text())
-                self.delete_button.setEnabled(True)
-                self.learn_button.setEnabled(True)
-            else:
-                self.current_word_id = None
-                self.delete_button.setEnabled(False)
-                self.learn_button.setEnabled(False)
-        else:
-            self.current_word_id = None
-            self.delete_button.setEnabled(False)
-            self.learn_button.setEnabled(False)
+        has_selection = bool(self.selected_word_ids) and not self.read_only
+        self.delete_button.setEnabled(has_selection)
+        self.learn_button.setEnabled(has_selection)
+    
+    def _transfer_filters(self) -> dict:
+        """Фильтры файловых диалогов для форматов обмена: фильтр -> формат"""
+        return {f"{title} (*{suffix})": fmt for fmt, (suffix, title) in transfer.FORMATS.items()}
     
     def _export_words(self):
-        """Экспорт слов в файл"""
-        try:
-            words = self.db.get_all_words()
-            
-            if not words:
-                QMessageBox.warning(self, "Экспорт", "Нет слов для экспорта")
-                return
-            
-            # В реальном приложении здесь была бы логика выбора файла
-            # и сохранения в CSV/JSON формате
-            word_count = len(words)
-            
-            self._log_action(f"Экспортировано {word_count} слов")
-            QMessageBox.information(self, "Экспорт", 
-                                  f"Готово к экспорту {word_count} слов\n"
-                                  f"(В реальном приложении откроется диалог сохранения)")
-            
-        except Exception as e:
-            self._show_error(f"Ошибка экспорта: {str(e)}")
-            logger.error(f"Ошибка экспорта: {e}")
+        """Экспорт слов в файл выбранного формата"""
+        filters = self._transfer_filters()
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Экспорт слов", "words.csv", ";;".join(filters)
+        )
+        if not path:
+            return
+        
+        # Формат задается выбранным фильтром, даже если расширение не указано
+        self._run_transfer(
+            "Экспорт слов...", transfer.export_words, path, filters.get(selected),
+            on_result=lambda count: self._on_transfer_done(f"Экспортировано {count} слов в {path}"),
+            context="Ошибка экспорта"
+        )
+    
+    def _import_words(self):
+        """Импорт слов из файла"""
+        filters = self._transfer_filters()
+        path, selected = QFileDialog.getOpenFileName(
+            self, "Импорт слов", "", ";;".join(filters)
+        )
+        if not path:
+            return
+        
+        # Таблица и статистика обновятся по событию RELOADED после импорта
+        self._run_transfer(
+            "Импорт слов...", transfer.import_words, path, filters.get(selected),
+            on_result=lambda result: self._on_transfer_done(
+                f"Импортировано {result.inserted} слов, пропущено дубликатов: {result.skipped}"
+            ),
+            context="Ошибка импорта"
+        )
+    
+    def _run_transfer(self, label: str, fn, path: str, fmt: Optional[str],
+                      on_result, context: str):
+        """Фоновый экспорт или импорт с окном прогресса и отменой"""
+        progress = TaskProgress(self)
+        dialog = QProgressDialog(label, "Отмена", 0, 1000, self)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(progress.cancel)
+        progress.changed.connect(
+            lambda done, total: dialog.setValue(int(done * 1000 / total) if total else 0)
+        )
+        
+        def finish():
+            dialog.canceled.disconnect(progress.cancel)
+            dialog.close()
+            progress.deleteLater()
+        
+        def on_error(error: Exception):
+            finish()
+            if isinstance(error, OperationCancelledError):
+                self.status_bar.showMessage("Операция отменена")
+                self._log_action(f"{label.rstrip('.')} отменен")
+            else:
+                self._on_db_error(context, error)
+        
+        self.executor.submit(
+            fn, self.db, path, fmt,
+            progress=progress.report, cancelled=progress.is_cancelled,
+            key="transfer",
+            on_result=lambda result: (finish(), on_result(result)),
+            on_error=on_error
+        )
+    
+    def _on_transfer_done(self, message: str):
+        """Завершение экспорта или импорта"""
+        self.status_bar.showMessage(message)
+        self._log_action(message)
     
     def _show_about(self):
         """Показать информацию о программе"""
@@ -494,17 +774,20 @@ class LanguageLearningApp(QMainWindow):
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_message = f"[{timestamp}] {message}"
         
-        # Добавление в текстовое поле логов
-        self.log_text.append(log_message)
-        
-        # Прокрутка вниз
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        # Добавление в панель журнала (выводится пачками)
+        self.log_text.append_line(log_message)
         
         # Запись в файл логов
         logger.info(message)
     
+    def _on_db_error(self, context: str, error: Exception):
+        """Ошибка фоновой операции с БД"""
+        if isinstance(error, DatabaseError):
+            self._show_error(str(error))
+        else:
+            self._show_error(f"{context}: {str(error)}")
+            logger.error(f"{context}: {error}")
+    
     def _show_error(self, message: str):
         """Показать сообщение об ошибке"""
         QMessageBox.critical(self, "Ошибка", message)
@@ -513,4 +796,7 @@ class LanguageLearningApp(QMainWindow):
     def closeEvent(self, event):
         """Обработка закрытия окна"""
         logger.info("Приложение завершает работу")
+        self.executor.shutdown()
+        self.db.remove_listener(self._db_listener)
+        self.db.close()
         event.accept()
\ No newline at end of file
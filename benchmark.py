@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк менеджера базы данных
+
+Сценарий suite замеряет операции БД и интерфейса на словарях разного
+размера и сохраняет результаты в JSON для сравнения между коммитами.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import platform
+import tempfile
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent))
+
+from models import Word, to_timestamp
+from database import DatabaseManager, MEMORY_PATH
+import settings
+
+
+def create_vocabulary(db_path, size: int):
+    """Заполнение БД синтетическим словарем заданного размера"""
+    DatabaseManager(db_path).close()
+
+    conn = sqlite3.connect(db_path)
+    languages = settings.SUPPORTED_LANGUAGES
+    now = to_timestamp(datetime.now())
+    # Слова распределены по последнему году, чтобы статистика по дням была непустой
+    conn.executemany('''
+        INSERT INTO words (word, translation, language, difficulty, created_at, due_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        (f"word{i}", f"перевод{i}", languages[i % len(languages)], i % 5 + 1,
+         now - i % 365 * 86400, now - i % 365 * 86400)
+        for i in range(size)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def bench_calls(db: DatabaseManager, calls: int) -> dict:
+    """Замер количества вызовов в секунду для типичных операций"""
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        db.get_user_progress()
+    results['get_user_progress'] = calls / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(calls):
+        word_id = db.add_word(Word(
+            word=f"bench{i}", translation="тест", language="English", difficulty=1
+        ))
+        db.mark_as_learned(word_id)
+        db.delete_word(word_id)
+    results['add_learn_delete'] = calls / (time.perf_counter() - start)
+
+    return results
+
+
+def bench_connection(size: int, calls: int):
+    """Сравнение режима подключения на каждый вызов и пула подключений"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        create_vocabulary(db_path, size)
+
+        print(f"📦 Словарь: {size} слов, {calls} вызовов на операцию")
+        for pooled in (False, True):
+            with DatabaseManager(db_path, pooled=pooled) as db:
+                results = bench_calls(db, calls)
+            mode = "пул подключений" if pooled else "подключение на вызов"
+            print(f"\n⏱  {mode}:")
+            for name, rate in results.items():
+                print(f"   {name}: {rate:.0f} вызовов/с")
+
+
+def bench_decode(size: int):
+    """Скорость декодирования строк в Word и память на одно слово"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        create_vocabulary(db_path, size)
+
+        with DatabaseManager(db_path) as db:
+            start = time.perf_counter()
+            words = db.get_all_words()
+            elapsed = time.perf_counter() - start
+            del words
+
+            # Память считаем отдельным проходом, tracemalloc замедляет декодирование
+            tracemalloc.start()
+            words = db.get_all_words()
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        print(f"📦 Словарь: {size} слов")
+        print(f"⏱  Декодирование: {size / elapsed:.0f} строк/с ({elapsed:.2f} с)")
+        print(f"💾 Память: {memory / len(words):.0f} байт на слово "
+              f"(объект Word: {sys.getsizeof(words[0])} байт)")
+
+
+def bench_columnar(size: int):
+    """Загрузка колоночного снимка и скорость группировок по нему"""
+    from columnar import WordColumns
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        create_vocabulary(db_path, size)
+
+        with DatabaseManager(db_path) as db:
+            start = time.perf_counter()
+            columns = WordColumns.from_database(db)
+            load_time = time.perf_counter() - start
+
+            print(f"📦 Словарь: {size} слов")
+            print(f"⏱  Загрузка снимка: {load_time * 1000:.0f} мс")
+            for name, action in [
+                ("count_by_language", columns.count_by_language),
+                ("count_by_difficulty", columns.count_by_difficulty),
+                ("language_difficulty_matrix", columns.language_difficulty_matrix),
+                ("daily_stats(365)", lambda: columns.daily_stats(days=365)),
+            ]:
+                start = time.perf_counter()
+                action()
+                print(f"   {name}: {(time.perf_counter() - start) * 1000:.1f} мс")
+
+
+def bench_search(size: int):
+    """Время поиска: префикс, подстрока и нечеткое совпадение"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        create_vocabulary(db_path, size)
+
+        with DatabaseManager(db_path) as db:
+            print(f"📦 Словарь: {size} слов")
+            for query, language in [
+                ("wo", None),
+                ("word12345", None),
+                ("еревод99", None),
+                ("wrod123", None),
+                ("wrod123", "German"),
+            ]:
+                start = time.perf_counter()
+                found = len(db.search(query, language))
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"   {query!r} ({language or 'все языки'}): "
+                      f"{found} слов за {elapsed:.1f} мс")
+
+
+def bench_commit(calls: int):
+    """Скорость мелких записей: фиксация на каждую запись и очередь фиксации"""
+    from commit_queue import CommitQueue
+
+    def words(prefix):
+        return (Word(word=f"{prefix}{i}", translation="тест", language="English")
+                for i in range(calls))
+
+    print(f"📝 {calls} записей на сценарий")
+    # Для сравнения - БД в памяти, без обращений к диску
+    for profile in [*settings.STORAGE_PROFILES, "memory"]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if profile == "memory":
+                db = DatabaseManager(MEMORY_PATH)
+            else:
+                db = DatabaseManager(Path(tmp_dir) / "bench.db", profile=profile)
+            with db:
+                start = time.perf_counter()
+                for word in words("direct"):
+                    db.add_word(word)
+                direct = calls / (time.perf_counter() - start)
+
+                start = time.perf_counter()
+                with CommitQueue(db) as commits:
+                    futures = [commits.submit(db.add_word, word) for word in words("queued")]
+                    for future in futures:
+                        future.result()
+                queued = calls / (time.perf_counter() - start)
+
+        print(f"\n⏱  профиль {profile}:")
+        print(f"   фиксация на запись: {direct:.0f} записей/с")
+        print(f"   очередь фиксации: {queued:.0f} записей/с")
+
+
+def measure(action, repeat: int) -> dict:
+    """Время выполнения операции: медиана и минимум по повторам, в мс"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(timings), 'min_ms': min(timings), 'repeat': repeat}
+
+
+def suite_environment() -> dict:
+    """Описание окружения для сравнения результатов между коммитами"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'storage_profile': settings.DB_STORAGE_PROFILE,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def wait_idle(window, qapp):
+    """Ожидание фоновых операций окна и доставки их результатов"""
+    while window.executor.busy:
+        window.executor.wait()
+        qapp.processEvents()
+
+
+def bench_suite_size(size: int, repeat: int, qapp) -> dict:
+    """Замеры операций БД и интерфейса на словаре заданного размера"""
+    from app import LanguageLearningApp
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        start = time.perf_counter()
+        create_vocabulary(db_path, size)
+        print(f"📦 Словарь: {size} слов (создан за {time.perf_counter() - start:.1f} с)")
+
+        with DatabaseManager(db_path) as db:
+            counter = iter(range(10 ** 9))
+
+            def add_word():
+                db.add_word(Word(word=f"bench{next(counter)}", translation="тест",
+                                 language="English", difficulty=1))
+
+            # Операции со всей таблицей на больших словарях повторяются реже
+            heavy_repeat = max(1, repeat // 5) if size >= 1_000_000 else repeat
+            results['add_word'] = measure(add_word, repeat * 10)
+            results['get_all_words'] = measure(db.get_all_words, heavy_repeat)
+            results['get_words_by_language'] = measure(
+                lambda: db.get_words_by_language("English"), heavy_repeat
+            )
+            results['get_daily_stats(7)'] = measure(lambda: db.get_daily_stats(7), repeat)
+            results['get_daily_stats(365)'] = measure(lambda: db.get_daily_stats(365), repeat)
+
+        # Окно приложения поверх того же файла БД; операции идут через фоновый пул
+        database_path, settings.DATABASE_PATH = settings.DATABASE_PATH, db_path
+        try:
+            window = LanguageLearningApp()
+        finally:
+            settings.DATABASE_PATH = database_path
+        window.graph_days = 30
+        window._ensure_chart()
+        wait_idle(window, qapp)
+
+        def populate_table():
+            window.word_model.refresh()
+            wait_idle(window, qapp)
+            model = window.word_model
+            for row in range(min(model.rowCount(), 50)):
+                for column in range(model.columnCount()):
+                    model.data(model.index(row, column))
+
+        def update_graph():
+            window._update_graph()
+            wait_idle(window, qapp)
+
+        def draw_graph():
+            # Без кэша по отпечатку: полное построение и отрисовка
+            window.chart.invalidate()
+            window._draw_graph(stats)
+            window.canvas.draw()
+
+        stats = window.db.get_daily_stats(window.graph_days)
+        results['populate_table'] = measure(populate_table, repeat)
+        results['update_graph'] = measure(update_graph, repeat)
+        results['draw_graph'] = measure(draw_graph, repeat)
+        results['draw_graph_cached'] = measure(lambda: window._draw_graph(stats), repeat)
+        window.executor.shutdown()
+        window.db.close()
+        window.deleteLater()
+
+    for name, timing in results.items():
+        print(f"   {name}: {timing['median_ms']:.2f} мс (мин. {timing['min_ms']:.2f})")
+    return results
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> bool:
+    """Сравнение с результатами прошлого запуска; True, если нет регрессий"""
+    ok = True
+    print(f"\n📊 Сравнение с {baseline['environment'].get('commit') or 'базовым запуском'}:")
+    for size, results in current['results'].items():
+        for name, timing in results.items():
+            old = baseline['results'].get(size, {}).get(name)
+            if old is None:
+                continue
+            ratio = timing['median_ms'] / old['median_ms'] if old['median_ms'] else 1.0
+            regression = ratio > 1 + threshold
+            ok = ok and not regression
+            mark = "❌" if regression else "  "
+            print(f" {mark} {size} {name}: {old['median_ms']:.2f} → "
+                  f"{timing['median_ms']:.2f} мс (x{ratio:.2f})")
+    return ok
+
+
+def bench_suite(sizes, repeat: int, output=None, baseline=None, threshold: float = 0.2) -> bool:
+    """Набор замеров для нескольких размеров словаря с выводом в JSON"""
+    # Интерфейс замеряется без окна, на платформе offscreen
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    qapp = QApplication.instance() or QApplication([])
+
+    report = {
+        'environment': suite_environment(),
+        'results': {str(size): bench_suite_size(size, repeat, qapp) for size in sizes},
+    }
+
+    if output:
+        Path(output).write_text(json.dumps(report, ensure_ascii=False, indent=2),
+                                encoding='utf-8')
+        print(f"\n💾 Результаты сохранены: {output}")
+    if baseline:
+        return compare_results(report, json.loads(Path(baseline).read_text(encoding='utf-8')),
+                               threshold)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк DatabaseManager")
+    parser.add_argument("scenario", nargs="?", default="connection",
+                        choices=["connection", "decode", "columnar", "search", "commit", "suite"],
+                        help="connection - пул подключений, decode - декодирование строк, "
+                             "columnar - колоночная статистика, search - поиск, "
+                             "commit - профили хранения и очередь фиксации, "
+                             "suite - набор замеров БД и интерфейса с выводом в JSON")
+    parser.add_argument("--size", type=int, default=None,
+                        help="Количество слов в синтетическом словаре")
+    parser.add_argument("--calls", type=int, default=1000,
+                        help="Количество вызовов на операцию")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Размеры словарей для suite")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Повторов каждого замера в suite")
+    parser.add_argument("--output", help="Файл JSON для результатов suite")
+    parser.add_argument("--baseline", help="JSON прошлого запуска suite для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Допустимое замедление относительно baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.scenario == "decode":
+        bench_decode(args.size or 1_000_000)
+    elif args.scenario == "columnar":
+        bench_columnar(args.size or 1_000_000)
+    elif args.scenario == "search":
+        bench_search(args.size or 1_000_000)
+    elif args.scenario == "commit":
+        bench_commit(args.calls)
+    elif args.scenario == "suite":
+        if not bench_suite(args.sizes, args.repeat, args.output, args.baseline, args.threshold):
+            sys.exit(1)
+    else:
+        bench_connection(args.size or 100_000, args.calls)
+
+
+if __name__ == "__main__":
+    main()
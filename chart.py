@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+# Максимум подписей дат на оси X
+MAX_DATE_LABELS = 12
+
+BAR_WIDTH = 0.35
+
+
+class MplCanvas(FigureCanvas):
+    """Холст для matplotlib"""
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.fig.add_subplot(111)
+        super().__init__(self.fig)
+        self.setParent(parent)
+
+        self.axes.set_facecolor('#f0f0f0')
+        self.fig.patch.set_facecolor('#ffffff')
+
+
+class ProgressChart:
+    """График добавленных и изученных слов по дням
+
+    Перерисовка выполняется, только если изменились данные (отпечаток
+    статистики). Пока период и первый день не меняются, столбцы
+    обновляются на месте через set_height. Компоновка считается только
+    при перестроении осей, а отрисовка откладывается через draw_idle.
+    """
+
+    def __init__(self, canvas: MplCanvas):
+        self.canvas = canvas
+        self._fingerprint = None
+        self._layout_key = None
+        self._dates: List[str] = []
+        self._added_bars = None
+        self._learned_bars = None
+
+    def invalidate(self):
+        """Сброс кэша: следующий вызов update перестроит график"""
+        self._fingerprint = None
+        self._layout_key = None
+
+    def update(self, stats: List[dict], days: int, today: Optional[date] = None) -> bool:
+        """Обновление графика по дневной статистике; False, если данные не изменились"""
+        today = today or date.today()
+        fingerprint = (days, today, tuple(
+            (stat['date'], stat['added'], stat['learned']) for stat in stats
+        ))
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+
+        if not stats:
+            self._show_empty()
+        else:
+            # Все дни периода, включая дни без слов: число столбцов постоянно
+            first = today - timedelta(days=days)
+            layout_key = (days, first)
+            if layout_key != self._layout_key:
+                self._build(first, days)
+                self._layout_key = layout_key
+            self._set_heights(stats)
+
+        self.canvas.draw_idle()
+        return True
+
+    def _show_empty(self):
+        """Заглушка при отсутствии данных"""
+        axes = self.canvas.axes
+        axes.clear()
+        axes.text(0.5, 0.5, 'Нет данных',
+                  ha='center', va='center', transform=axes.transAxes)
+        self._layout_key = None
+
+    def _build(self, first: date, days: int):
+        """Перестроение осей и столбцов для периода"""
+        self._dates = [(first + timedelta(days=i)).isoformat() for i in range(days + 1)]
+        x = range(len(self._dates))
+        zeros = [0] * len(self._dates)
+
+        axes = self.canvas.axes
+        axes.clear()
+        self._added_bars = axes.bar([i - BAR_WIDTH / 2 for i in x], zeros, BAR_WIDTH,
+                                    label='Добавлено', color='#2196F3')
+        self._learned_bars = axes.bar([i + BAR_WIDTH / 2 for i in x], zeros, BAR_WIDTH,
+                                      label='Изучено', color='#4CAF50')
+
+        axes.set_xlabel('Дата')
+        axes.set_ylabel('Количество слов')
+        axes.set_title(f'Статистика за последние {days} дней')
+
+        # На длинных периодах подписывается только часть дней
+        step = max(1, -(-len(self._dates) // MAX_DATE_LABELS))
+        ticks = list(x)[::step]
+        axes.set_xticks(ticks)
+        axes.set_xticklabels([self._dates[i][8:] + '/' + self._dates[i][5:7] for i in ticks],
+                             rotation=45)
+        axes.set_xlim(-0.5, len(self._dates) - 0.5)
+        axes.legend()
+        axes.grid(True, alpha=0.3)
+
+        self.canvas.fig.tight_layout()
+
+    def _set_heights(self, stats: List[dict]):
+        """Обновление высот столбцов без их пересоздания"""
+        by_date = {stat['date']: stat for stat in stats}
+        highest = 0
+        for i, day in enumerate(self._dates):
+            stat = by_date.get(day)
+            added = stat['added'] if stat else 0
+            learned = stat['learned'] if stat else 0
+            self._added_bars[i].set_height(added)
+            self._learned_bars[i].set_height(learned)
+            highest = max(highest, added, learned)
+        self.canvas.axes.set_ylim(0, max(1, highest) * 1.1)
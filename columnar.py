@@ -0,0 +1,124 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import settings
+
+# Метка отсутствующего времени повторения в массиве last_reviewed
+NO_TIMESTAMP = -1
+
+
+class WordColumns:
+    """Колоночный снимок таблицы words в массивах NumPy
+
+    Позволяет считать группировки по языку, сложности и дням векторно,
+    без построения объектов Word. Снимок не обновляется вместе с БД.
+    """
+
+    def __init__(self, ids: np.ndarray, language_codes: np.ndarray, languages: List[str],
+                 difficulty: np.ndarray, created_at: np.ndarray, last_reviewed: np.ndarray):
+        self.ids = ids
+        self.language_codes = language_codes  # индексы в списке languages
+        self.languages = languages
+        self.difficulty = difficulty
+        self.created_at = created_at  # секунды эпохи
+        self.last_reviewed = last_reviewed  # секунды эпохи или NO_TIMESTAMP
+
+    @classmethod
+    def from_database(cls, db) -> "WordColumns":
+        """Загрузка снимка из БД пачками"""
+        languages = list(settings.SUPPORTED_LANGUAGES)
+        codes = {language: i for i, language in enumerate(languages)}
+        parts = {name: [] for name in ('ids', 'codes', 'difficulty', 'created', 'reviewed')}
+
+        for batch in db.iter_word_batches():
+            ids, batch_languages, difficulty, created, reviewed = zip(*batch)
+            for language in set(batch_languages) - codes.keys():
+                codes[language] = len(languages)
+                languages.append(language)
+
+            parts['ids'].append(np.array(ids, dtype=np.int64))
+            parts['codes'].append(np.fromiter(
+                (codes[language] for language in batch_languages),
+                dtype=np.int16, count=len(batch)
+            ))
+            parts['difficulty'].append(np.array(difficulty, dtype=np.int8))
+            parts['created'].append(np.array(created, dtype=np.int64))
+            parts['reviewed'].append(np.array(
+                [NO_TIMESTAMP if ts is None else ts for ts in reviewed], dtype=np.int64
+            ))
+
+        def join(name, dtype):
+            return np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+
+        return cls(
+            ids=join('ids', np.int64),
+            language_codes=join('codes', np.int16),
+            languages=languages,
+            difficulty=join('difficulty', np.int8),
+            created_at=join('created', np.int64),
+            last_reviewed=join('reviewed', np.int64)
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def learned_mask(self) -> np.ndarray:
+        """Маска изученных слов (сложность 4 и выше, как в статистике БД)"""
+        return self.difficulty >= 4
+
+    def count_by_language(self, learned_only: bool = False) -> Dict[str, int]:
+        """Количество слов по языкам"""
+        codes = self.language_codes[self.learned_mask()] if learned_only else self.language_codes
+        counts = np.bincount(codes, minlength=len(self.languages))
+        return {language: int(count) for language, count in zip(self.languages, counts)}
+
+    def count_by_difficulty(self) -> Dict[int, int]:
+        """Количество слов по уровням сложности"""
+        counts = np.bincount(self.difficulty, minlength=6)
+        return {level: int(counts[level]) for level in range(1, 6)}
+
+    def language_difficulty_matrix(self) -> np.ndarray:
+        """Матрица количества слов: строки - языки, столбцы - сложность 1..5"""
+        keys = self.language_codes.astype(np.int64) * 5 + (self.difficulty - 1)
+        counts = np.bincount(keys, minlength=len(self.languages) * 5)
+        return counts.reshape(len(self.languages), 5)
+
+    def daily_stats(self, days: Optional[int] = 7) -> List[dict]:
+        """Добавленные и изученные слова по дням, в формате get_daily_stats
+
+        Дни считаются в текущем часовом поясе системы. Границы дней -
+        локальные полуночи каждой даты, поэтому смена летнего времени
+        внутри периода не сдвигает записи на соседний день.
+        """
+        created = self.created_at
+        learned = self.learned_mask()
+
+        if days is not None:
+            since = datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
+            mask = created >= int(since.timestamp())
+            created = created[mask]
+            learned = learned[mask]
+        if not len(created):
+            return []
+
+        first = date.fromtimestamp(int(created.min()))
+        last = date.fromtimestamp(int(created.max()))
+        dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        midnights = np.array([int(time.mktime(day.timetuple())) for day in dates],
+                             dtype=np.int64)
+        day_index = np.searchsorted(midnights, created, side='right') - 1
+
+        added_counts = np.bincount(day_index, minlength=len(dates))
+        learned_counts = np.bincount(day_index, weights=learned, minlength=len(dates))
+
+        return [
+            {
+                'date': dates[i].isoformat(),
+                'added': int(added),
+                'learned': int(learned_counts[i])
+            }
+            for i, added in enumerate(added_counts) if added
+        ]
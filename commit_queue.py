@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from exceptions import DatabaseError
+import settings
+
+# Метка завершения работы потока очереди
+_STOP = object()
+
+
+class CommitQueue:
+    """Очередь групповой фиксации мелких записей в БД
+
+    Операции выполняются в отдельном потоке и собираются в пакеты:
+    пакет фиксируется одной транзакцией, то есть одной синхронизацией
+    журнала с диском вместо синхронизации на каждую запись. Каждая
+    операция выполняется в своей точке сохранения, поэтому ошибка одной
+    операции не отменяет остальные операции пакета.
+    """
+
+    def __init__(self, db, batch_size: int = settings.COMMIT_BATCH_SIZE,
+                 max_delay_ms: int = settings.COMMIT_MAX_DELAY_MS):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="commit-queue", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Постановка операции в очередь; результат доступен после фиксации"""
+        if self._closed:
+            raise DatabaseError("Очередь фиксации закрыта")
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def flush(self):
+        """Ожидание фиксации всех поставленных операций"""
+        self.submit(lambda: None).result()
+
+    def close(self):
+        """Фиксация оставшихся операций и остановка потока"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        """Цикл потока: сбор пакета и его фиксация"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+
+            # Добираем операции, пришедшие за время ожидания
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._commit(batch)
+
+    def _commit(self, batch: list):
+        """Выполнение пакета в одной транзакции"""
+        results = []
+        try:
+            with self.db._get_connection():
+                for fn, args, kwargs, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.db.savepoint():
+                            results.append((future, fn(*args, **kwargs)))
+                    except Exception as e:
+                        if not isinstance(e, DatabaseError):
+                            e = DatabaseError(f"Ошибка БД: {str(e)}")
+                        future.set_exception(e)
+        except Exception as e:
+            # Транзакция не зафиксирована: успешные операции тоже потеряны
+            for future, _ in results:
+                future.set_exception(e)
+            return
+
+        for future, result in results:
+            future.set_result(result)
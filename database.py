@@ -1,66 +1,295 @@
+import json
 import sqlite3
-from datetime import datetime
-from typing import List, Optional
+import threading
+from collections import Counter, OrderedDict
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from contextlib import contextmanager
+from pathlib import Path
 
-from models import Word, UserProgress
-from exceptions import DatabaseError
+from models import (Word, UserProgress, ImportResult, ReviewState, WordChange,
+                    WORD_COLUMNS, to_timestamp)
+from exceptions import DatabaseError, LanguageAppError
+import migrations
+from scheduler import sm2
+from profiling import QueryProfiler
 import settings
 
+# Путь БД в памяти (как в sqlite3.connect)
+MEMORY_PATH = ":memory:"
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Разбиение последовательности на пачки фиксированного размера"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class DatabaseManager:
     """Менеджер для работы с базой данных SQLite"""
     
-    def __init__(self, db_path: str = settings.DATABASE_PATH):
-        self.db_path = db_path
+    # Методы, замеряемые при включенном профилировании
+    PROFILED_METHODS = (
+        'add_word', 'add_words', 'delete_word', 'delete_words', 'mark_as_learned',
+        'mark_as_learned_many', 'rebuild_stats',
+        'clear_words', 'get_word', 'get_words', 'get_all_words', 'get_words_page', 'get_words_by_language',
+        'get_daily_stats', 'get_user_progress', 'search', 'get_review_queue',
+        'get_due_words', 'get_review_state', 'record_review', 'get_review_activity',
+        'get_activity_calendar',
+    )
+    
+    def __init__(self, db_path: Optional[str] = None, pooled: bool = settings.DB_POOLED,
+                 profile: Optional[str] = None, profiling: Optional[bool] = None,
+                 read_only: bool = False, load_from: Optional[str] = None):
+        """
+        db_path=":memory:" - БД в памяти: одно подключение на все потоки,
+        транзакции выполняются по очереди; load_from - файл, содержимое
+        которого копируется в память при открытии (сохранение - flush).
+        read_only - открытие файла с mode=ro: без блокировок на запись
+        и без миграций (схема должна быть актуальной).
+        """
+        # Путь и профиль берутся из настроек в момент создания, а не импорта модуля
+        self.db_path = db_path if db_path is not None else settings.DATABASE_PATH
+        self.profile = profile if profile is not None else settings.DB_STORAGE_PROFILE
+        if self.profile not in settings.STORAGE_PROFILES:
+            raise DatabaseError(f"Неизвестный профиль хранения: {self.profile}")
+        self.memory = str(self.db_path) == MEMORY_PATH
+        self.read_only = read_only
+        self.load_from = load_from
+        if self.memory and read_only:
+            raise DatabaseError("БД в памяти не открывается только для чтения")
+        if load_from is not None and not self.memory:
+            raise DatabaseError("Загрузка из файла доступна только для БД в памяти")
+        self.pooled = pooled or self.memory
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[WordChange], None]] = []
+        
+        # LRU-кэш строк недавно прочитанных слов; поколение растет при каждом
+        # сбросе, чтобы чтение, начатое до изменения, не вернуло в кэш старую строку
+        self._word_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        
+        # Обертки устанавливаются на экземпляр только при включенном профилировании
+        self.profiler: Optional[QueryProfiler] = None
+        if settings.DB_PROFILING if profiling is None else profiling:
+            self.profiler = QueryProfiler()
+            for name in self.PROFILED_METHODS:
+                setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+        
+        # У БД в памяти единственное подключение: оно и хранит данные
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._memory_lock = threading.RLock() if self.memory else None
+        if self.memory:
+            self._memory_conn = self._connect()
+            self._connections.append(self._memory_conn)
+            if load_from is not None:
+                self._load(load_from)
+        elif read_only:
+            # mode=ro не создает файл: отсутствие файла - понятная ошибка
+            if not Path(self.db_path).exists():
+                raise DatabaseError(f"Файл БД не найден: {self.db_path}")
+        else:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        
         self._init_database()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Открытие нового подключения к БД"""
+        try:
+            if self.read_only:
+                conn = sqlite3.connect(
+                    f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True,
+                    check_same_thread=False,
+                    cached_statements=settings.DB_CACHED_STATEMENTS
+                )
+            else:
+                conn = sqlite3.connect(
+                    self.db_path,
+                    check_same_thread=False,
+                    cached_statements=settings.DB_CACHED_STATEMENTS
+                )
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Не удалось открыть БД {self.db_path}: {e}")
+        conn.row_factory = sqlite3.Row
+        for name, value in settings.STORAGE_PROFILES[self.profile].items():
+            # Режим журнала задает тот, кто пишет в файл
+            if not (self.read_only and name == 'journal_mode'):
+                conn.execute(f"PRAGMA {name} = {value}")
+        if self.profiler is not None:
+            conn.set_trace_callback(self.profiler.trace)
+        return conn
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Долгоживущее подключение текущего потока"""
+        if self._memory_conn is not None:
+            return self._memory_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
     @contextmanager
     def _get_connection(self):
         """Контекстный менеджер для подключения к БД"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        depth = getattr(self._local, 'depth', 0)
+        if depth:
+            # Вложенный вызов: транзакцией управляет внешний блок
+            self._local.depth = depth + 1
+            try:
+                yield self._local.active
+            finally:
+                self._local.depth = depth
+            return
+        
+        # Общее подключение БД в памяти занимает одна транзакция за раз
+        if self._memory_lock is not None:
+            self._memory_lock.acquire()
+        conn = self._thread_connection() if self.pooled else self._connect()
+        self._local.active = conn
+        self._local.depth = 1
+        self._local.changes = []
         try:
             yield conn
             conn.commit()
+        except LanguageAppError:
+            # Ошибки приложения (в т.ч. отмена операции) передаются как есть
+            conn.rollback()
+            raise
         except Exception as e:
             conn.rollback()
             raise DatabaseError(f"Ошибка БД: {str(e)}")
         finally:
+            changes, self._local.changes = self._local.changes, []
+            self._local.depth = 0
+            self._local.active = None
+            if not self.pooled:
+                conn.close()
+            if self._memory_lock is not None:
+                self._memory_lock.release()
+        
+        # Подписчики узнают только о зафиксированных изменениях
+        for change in changes:
+            self._notify(change)
+    
+    @contextmanager
+    def transaction(self):
+        """Общая транзакция для нескольких операций
+
+        Операции внутри блока фиксируются вместе при выходе из него,
+        при исключении откатываются все. Подписчики узнают об изменениях
+        после фиксации.
+        """
+        with self._get_connection():
+            yield self
+    
+    @contextmanager
+    def savepoint(self):
+        """Вложенная транзакция внутри текущего блока _get_connection
+
+        При ошибке откатываются только изменения блока, а внешняя
+        транзакция продолжается. Изменения блока не рассылаются подписчикам.
+        """
+        with self._get_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            mark = len(self._local.changes)
+            conn.execute("SAVEPOINT batch_item")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK TO batch_item")
+                conn.execute("RELEASE batch_item")
+                del self._local.changes[mark:]
+                raise
+            conn.execute("RELEASE batch_item")
+    
+    def add_listener(self, listener: Callable[[WordChange], None]):
+        """Подписка на изменения слов"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[WordChange], None]):
+        """Отписка от изменений слов"""
+        self._listeners.remove(listener)
+    
+    def _emit(self, change: WordChange):
+        """Регистрация изменения в текущей транзакции"""
+        self._local.changes.append(change)
+    
+    def _notify(self, change: WordChange):
+        """Рассылка изменения подписчикам"""
+        self._invalidate_cache(change)
+        for listener in list(self._listeners):
+            listener(change)
+    
+    def stats(self) -> dict:
+        """Статистика вызовов по методам (пусто, если профилирование выключено)"""
+        return self.profiler.stats() if self.profiler is not None else {}
+    
+    def close(self):
+        """Закрытие всех подключений пула"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
             conn.close()
     
     def _init_database(self):
-        """Инициализация таблиц БД"""
+        """Инициализация и миграция схемы БД"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Таблица слов
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS words (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL,
-                    translation TEXT NOT NULL,
-                    language TEXT NOT NULL,
-                    difficulty INTEGER CHECK(difficulty BETWEEN 1 AND 5),
-                    last_reviewed DATETIME,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            if not self.read_only:
+                migrations.migrate(conn)
+            elif migrations.get_schema_version(conn) != migrations.SCHEMA_VERSION:
+                raise DatabaseError(
+                    "Схема БД устарела: откройте ее на запись для миграции"
                 )
-            ''')
-            
-            # Таблица прогресса пользователя
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_progress (
-                    id INTEGER PRIMARY KEY CHECK(id = 1),
-                    total_words INTEGER DEFAULT 0,
-                    learned_words INTEGER DEFAULT 0,
-                    streak_days INTEGER DEFAULT 0,
-                    last_active DATETIME
-                )
-            ''')
-            
-            # Инициализация записи прогресса
-            cursor.execute('''
-                INSERT OR IGNORE INTO user_progress (id) VALUES (1)
-            ''')
+    
+    def _load(self, path):
+        """Копирование файла БД в память через backup API (схема
+        мигрирует уже в памяти, файл не меняется)"""
+        try:
+            source = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Не удалось открыть БД {path}: {e}")
+        try:
+            source.backup(self._memory_conn)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Ошибка загрузки БД {path}: {e}")
+        finally:
+            source.close()
+    
+    def flush(self, path: Optional[str] = None):
+        """Сохранение снимка БД в файл через backup API
+
+        По умолчанию БД в памяти сохраняется в файл, из которого загружена.
+        Страницы копируются одной транзакцией в целевой файл, поэтому
+        читатели файла видят либо старое, либо новое содержимое.
+        """
+        target = path if path is not None else self.load_from
+        if target is None:
+            raise DatabaseError("Не указан файл для сохранения БД")
+        with self._get_connection() as conn:
+            dest = sqlite3.connect(target)
+            try:
+                conn.backup(dest)
+            finally:
+                dest.close()
     
     def add_word(self, word: Word) -> int:
         """Добавление нового слова"""
@@ -75,163 +304,643 @@ class DatabaseManager:
             if cursor.fetchone():
                 raise DatabaseError(f"Слово '{word.word}' уже существует в языке '{word.language}'")
             
+            added = Word(
+                word=word.word,
+                translation=word.translation,
+                language=word.language,
+                difficulty=word.difficulty,
+                created_at=datetime.now()
+            )
             cursor.execute('''
-                INSERT INTO words (word, translation, language, difficulty, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (word.word, word.translation, word.language, word.difficulty, datetime.now()))
+                INSERT INTO words (word, translation, language, difficulty, created_at, due_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (added.word, added.translation, added.language, added.difficulty,
+                  added.created_ts, added.created_ts))
             
-            word_id = cursor.lastrowid
+            word_id = added.id = cursor.lastrowid
             
-            # Обновление статистики
-            cursor.execute('''
-                UPDATE user_progress 
-                SET total_words = total_words + 1
+            # Счетчики прогресса обновляет триггер
+            self._emit(WordChange(
+                WordChange.ADDED, word=added, total_delta=1,
+                learned_delta=int(added.difficulty >= 4)
+            ))
+            return word_id
+    
+    def add_words(self, words: Iterable[Word]) -> ImportResult:
+        """Пакетное добавление слов в одной транзакции"""
+        result = ImportResult()
+        now = to_timestamp(datetime.now())
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self._begin_write(conn)
+            _, learned_before = self._read_counters(cursor)
+            
+            for chunk in _chunked(words, settings.BULK_CHUNK_SIZE):
+                rows = []
+                for word in chunk:
+                    created = word.created_ts or now
+                    rows.append((
+                        word.word, word.translation, word.language, word.difficulty,
+                        word.last_reviewed_ts, created, created
+                    ))
+                
+                # Дубликаты отсекает уникальный индекс (language, word);
+                # нарушения CHECK/NOT NULL, в отличие от OR IGNORE, не глушатся
+                cursor.executemany('''
+                    INSERT INTO words (word, translation, language, difficulty,
+                                       last_reviewed, created_at, due_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(language, word) DO NOTHING
+                ''', rows)
+                result.inserted += cursor.rowcount
+                result.skipped += len(chunk) - cursor.rowcount
+            
+            if result.inserted:
+                _, learned_after = self._read_counters(cursor)
+                self._emit(WordChange(
+                    WordChange.RELOADED,
+                    total_delta=result.inserted,
+                    learned_delta=learned_after - learned_before
+                ))
+        
+        return result
+    
+    @staticmethod
+    def _begin_write(conn: sqlite3.Connection):
+        """Открытие пишущей транзакции до первого чтения
+
+        Неявный BEGIN выполняется только перед первым изменением, поэтому
+        счетчики, прочитанные раньше, могли бы учесть чужую запись.
+        """
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+    
+    @staticmethod
+    def _read_counters(cursor: sqlite3.Cursor) -> Tuple[int, int]:
+        """Текущие счетчики (всего слов, изучено слов)"""
+        cursor.execute("SELECT total_words, learned_words FROM user_progress WHERE id = 1")
+        return tuple(cursor.fetchone())
+    
+    def rebuild_stats(self) -> UserProgress:
+        """Пересчет счетчиков прогресса по таблице слов за один проход"""
+        with self._get_connection() as conn:
+            conn.execute(migrations.REBUILD_PROGRESS)
+            conn.execute(migrations.REBUILD_STREAK)
+            self._emit(WordChange(WordChange.RELOADED))
+            return self.get_user_progress()
+    
+    def clear_words(self):
+        """Удаление всех слов и сброс прогресса"""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM words")
+            for table in ("review_events", "review_daily", "review_weekly"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute('''
+                UPDATE user_progress
+                SET streak_days = 0, longest_streak = 0, last_active = NULL
                 WHERE id = 1
             ''')
-            
-            return word_id
+            self._emit(WordChange(WordChange.RELOADED))
+    
+    @staticmethod
+    def _fetch_words(cursor: sqlite3.Cursor) -> List[Word]:
+        """Декодирование выборки столбцов WORD_COLUMNS в объекты Word"""
+        return list(map(Word.from_row, cursor.fetchall()))
+    
+    @staticmethod
+    def _word_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """Курсор, возвращающий строки кортежами для Word.from_row"""
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
+    
+    def _invalidate_cache(self, change: WordChange):
+        """Сброс закэшированных слов, затронутых зафиксированным изменением"""
+        if change.action == WordChange.ADDED:
+            return
+        with self._cache_lock:
+            self._cache_generation += 1
+            if change.action == WordChange.RELOADED or change.word is None:
+                self._word_cache.clear()
+            else:
+                self._word_cache.pop(change.word.id, None)
+    
+    def _cache_words(self, rows: List[tuple], generation: int, conn: sqlite3.Connection):
+        """Сохранение прочитанных строк в кэше"""
+        # Внутри пишущей транзакции строки могут быть еще не зафиксированы
+        if conn.in_transaction:
+            return
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            for row in rows:
+                self._word_cache[row[0]] = row
+                self._word_cache.move_to_end(row[0])
+            while len(self._word_cache) > settings.WORD_CACHE_SIZE:
+                self._word_cache.popitem(last=False)
+    
+    def get_word(self, word_id: int) -> Word:
+        """Слово по ID (из кэша недавно прочитанных слов или по первичному ключу)"""
+        words = self.get_words([word_id])
+        if not words:
+            raise DatabaseError(f"Слово с ID {word_id} не найдено")
+        return words[0]
+    
+    def get_words(self, word_ids: Iterable[int]) -> List[Word]:
+        """Слова по списку ID в том же порядке; отсутствующие пропускаются"""
+        word_ids = list(word_ids)
+        rows = {}
+        with self._cache_lock:
+            generation = self._cache_generation
+            for word_id in word_ids:
+                row = self._word_cache.get(word_id)
+                if row is not None:
+                    self._word_cache.move_to_end(word_id)
+                    rows[word_id] = row
+        
+        missing = [word_id for word_id in dict.fromkeys(word_ids) if word_id not in rows]
+        if missing:
+            with self._get_connection() as conn:
+                cursor = self._word_cursor(conn)
+                fetched = []
+                for batch in _chunked(missing, settings.BULK_CHUNK_SIZE):
+                    cursor.execute(f'''
+                        SELECT {WORD_COLUMNS} FROM words
+                        WHERE id IN (SELECT value FROM json_each(?))
+                    ''', (json.dumps(batch),))
+                    fetched.extend(cursor.fetchall())
+                self._cache_words(fetched, generation, conn)
+            rows.update((row[0], row) for row in fetched)
+        
+        # Каждый вызов получает свои объекты: кэш хранит только строки
+        return [Word.from_row(rows[word_id]) for word_id in word_ids if word_id in rows]
     
     def get_all_words(self) -> List[Word]:
         """Получение всех слов"""
+        with self._get_connection() as conn:
+            cursor = self._word_cursor(conn)
+            cursor.execute(f'''
+                SELECT {WORD_COLUMNS} FROM words ORDER BY created_at DESC, id DESC
+            ''')
+            
+            return self._fetch_words(cursor)
+    
+    def get_words_page(self, after: Optional[Tuple[Any, int]] = None,
+                       limit: int = settings.PAGE_SIZE) -> List[Word]:
+        """Страница слов в порядке get_all_words после ключа (created_at, id)"""
+        with self._get_connection() as conn:
+            cursor = self._word_cursor(conn)
+            if after is None:
+                cursor.execute(f'''
+                    SELECT {WORD_COLUMNS} FROM words
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (limit,))
+            else:
+                cursor.execute(f'''
+                    SELECT {WORD_COLUMNS} FROM words
+                    WHERE (created_at, id) < (?, ?)
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (*after, limit))
+            
+            return self._fetch_words(cursor)
+    
+    def iter_words(self, after: Optional[Tuple[Any, int]] = None,
+                   page_size: int = settings.PAGE_SIZE) -> Iterator[Word]:
+        """Ленивый обход слов постранично, без загрузки всей таблицы"""
+        while True:
+            page = self.get_words_page(after, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = self.page_key(page[-1])
+    
+    def iter_word_batches(self, batch_size: int = settings.BULK_CHUNK_SIZE) -> Iterator[List[tuple]]:
+        """Обход слов пачками кортежей (id, language, difficulty, created_at,
+        last_reviewed) для колоночных снимков"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute('''
-                SELECT * FROM words ORDER BY created_at DESC
+                SELECT id, language, difficulty, created_at, last_reviewed FROM words
             ''')
-            
-            words = []
-            for row in cursor.fetchall():
-                words.append(Word(
-                    id=row['id'],
-                    word=row['word'],
-                    translation=row['translation'],
-                    language=row['language'],
-                    difficulty=row['difficulty'],
-                    last_reviewed=datetime.fromisoformat(row['last_reviewed']) 
-                        if row['last_reviewed'] else None,
-                    created_at=datetime.fromisoformat(row['created_at'])
-                        if row['created_at'] else None
-                ))
-            return words
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield batch
+    
+    @staticmethod
+    def page_key(word: Word) -> Tuple[Any, int]:
+        """Ключ постраничной выборки для слова"""
+        return (word.created_ts, word.id)
     
-    def delete_word(self, word_id: int):
+    def delete_word(self, word_id: int) -> WordChange:
         """Удаление слова по ID"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = self._word_cursor(conn)
             
             # Получаем слово для обновления статистики
-            cursor.execute("SELECT difficulty FROM words WHERE id = ?", (word_id,))
+            cursor.execute(f"SELECT {WORD_COLUMNS} FROM words WHERE id = ?", (word_id,))
             row = cursor.fetchone()
             if not row:
                 raise DatabaseError(f"Слово с ID {word_id} не найдено")
+            word = Word.from_row(row)
             
+            # Счетчики прогресса обновляет триггер
             cursor.execute("DELETE FROM words WHERE id = ?", (word_id,))
             
-            # Обновляем статистику
-            if row['difficulty'] >= 4:  # Если слово было изучено
-                cursor.execute('''
-                    UPDATE user_progress 
-                    SET learned_words = learned_words - 1,
-                        total_words = total_words - 1
-                    WHERE id = 1
-                ''')
-            else:
-                cursor.execute('''
-                    UPDATE user_progress 
-                    SET total_words = total_words - 1
-                    WHERE id = 1
-                ''')
+            change = WordChange(
+                WordChange.DELETED,
+                word=word,
+                previous=word,
+                total_delta=-1,
+                learned_delta=-int(word.difficulty >= 4)
+            )
+            self._emit(change)
+            return change
     
-    def mark_as_learned(self, word_id: int):
+    def mark_as_learned(self, word_id: int) -> WordChange:
         """Отметить слово как изученное"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now()
             
+            cursor.execute(f"SELECT {WORD_COLUMNS} FROM words WHERE id = ?", (word_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise DatabaseError(f"Слово с ID {word_id} не найдено")
+            previous = Word.from_row(row)
+            
             cursor.execute('''
                 UPDATE words 
                 SET last_reviewed = ?, difficulty = 5
                 WHERE id = ?
-            ''', (now, word_id))
+            ''', (to_timestamp(now), word_id))
+            self._log_review(cursor, word_id, to_timestamp(now),
+                             learned=previous.difficulty < 4)
+            
+            # Счетчик изученных слов и серию дней обновляют триггеры
+            self._touch_activity(cursor, now)
+            
+            word = Word.from_row(row)
+            word.difficulty = 5
+            word.last_reviewed = now
+            change = WordChange(
+                WordChange.UPDATED,
+                word=word,
+                previous=previous,
+                learned_delta=int(previous.difficulty < 4)
+            )
+            self._emit(change)
+            return change
+    
+    @staticmethod
+    def _touch_activity(cursor: sqlite3.Cursor, now: datetime):
+        """Отметка последней активности пользователя
+
+        Серию дней ведут триггеры дневной сводки журнала повторений.
+        """
+        cursor.execute('''
+            UPDATE user_progress
+            SET last_active = ?
+            WHERE id = 1 AND (last_active IS NULL OR last_active < ?)
+        ''', (now, now))
+    
+    @staticmethod
+    def _log_review(cursor: sqlite3.Cursor, word_id: int, reviewed_ts: int,
+                    quality: Optional[int] = None, learned: bool = False):
+        """Запись события в журнал повторений (сводки обновляет триггер)
+
+        quality - оценка ответа, None для отметки «изучено» без оценки;
+        learned - слово стало изученным в результате этого события.
+        """
+        cursor.execute('''
+            INSERT INTO review_events (word_id, reviewed_at, quality, learned)
+            VALUES (?, ?, ?, ?)
+        ''', (word_id, reviewed_ts, quality, int(learned)))
+    
+    def delete_words(self, word_ids: Iterable[int]) -> int:
+        """Удаление слов по списку ID одним запросом; возвращает число удаленных"""
+        ids = json.dumps(list(dict.fromkeys(word_ids)))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self._begin_write(conn)
+            _, learned_before = self._read_counters(cursor)
+            
+            # Счетчики прогресса обновляет триггер
+            cursor.execute(
+                "DELETE FROM words WHERE id IN (SELECT value FROM json_each(?))", (ids,)
+            )
+            deleted = cursor.rowcount
+            
+            if deleted:
+                _, learned_after = self._read_counters(cursor)
+                self._emit(WordChange(
+                    WordChange.RELOADED,
+                    total_delta=-deleted,
+                    learned_delta=learned_after - learned_before
+                ))
+            return deleted
+    
+    def mark_as_learned_many(self, word_ids: Iterable[int]) -> int:
+        """Отметить слова как изученные одним запросом; возвращает число найденных"""
+        ids = json.dumps(list(dict.fromkeys(word_ids)))
+        now = datetime.now()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self._begin_write(conn)
+            _, learned_before = self._read_counters(cursor)
             
-            # Обновление статистики
+            # События пишутся до обновления, пока видна прежняя сложность
             cursor.execute('''
-                UPDATE user_progress 
-                SET learned_words = learned_words + 1,
-                    last_active = ?
-                WHERE id = 1
-            ''', (now,))
-            
-            # Проверка и обновление серии дней
-            cursor.execute("SELECT last_active FROM user_progress WHERE id = 1")
-            result = cursor.fetchone()
-            if result and result['last_active']:
-                last_active = datetime.fromisoformat(result['last_active'])
-                if (now.date() - last_active.date()).days == 1:
-                    cursor.execute('''
-                        UPDATE user_progress 
-                        SET streak_days = streak_days + 1
-                        WHERE id = 1
-                    ''')
-                elif (now.date() - last_active.date()).days > 1:
-                    cursor.execute('''
-                        UPDATE user_progress 
-                        SET streak_days = 1
-                        WHERE id = 1
-                    ''')
+                INSERT INTO review_events (word_id, reviewed_at, learned)
+                SELECT id, ?, difficulty < 4 FROM words
+                WHERE id IN (SELECT value FROM json_each(?))
+            ''', (to_timestamp(now), ids))
+            
+            cursor.execute('''
+                UPDATE words
+                SET last_reviewed = ?, difficulty = 5
+                WHERE id IN (SELECT value FROM json_each(?))
+            ''', (to_timestamp(now), ids))
+            updated = cursor.rowcount
+            
+            if updated:
+                self._touch_activity(cursor, now)
+                _, learned_after = self._read_counters(cursor)
+                self._emit(WordChange(
+                    WordChange.RELOADED, learned_delta=learned_after - learned_before
+                ))
+            return updated
+    
+    def search(self, query: str, language: Optional[str] = None,
+               limit: int = settings.SEARCH_LIMIT) -> List[Word]:
+        """Поиск слов по слову и переводу
+
+        Сначала идут слова, начинающиеся с запроса, затем совпадения по
+        подстроке слова или перевода, затем нечеткие совпадения по общим
+        триграммам, ранжированные по bm25. Запросы короче трех символов
+        ищутся только по префиксу слова.
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        
+        with self._get_connection() as conn:
+            cursor = self._word_cursor(conn)
+            found = {}
+            
+            # Префикс по индексу lower(word): lower в SQLite меняет регистр
+            # только у ASCII, поэтому запрос приводится так же
+            prefix = ''.join(c.lower() if c.isascii() else c for c in query)
+            # Унарный плюс не дает планировщику выбрать индекс по языку
+            language_filter = "AND +language = ?" if language else ""
+            cursor.execute(f'''
+                SELECT {WORD_COLUMNS} FROM words
+                WHERE lower(word) >= ? AND lower(word) < ? {language_filter}
+                ORDER BY lower(word)
+                LIMIT ?
+            ''', (prefix, prefix + '\U0010ffff', *([language] if language else []), limit))
+            self._collect(found, cursor, limit)
+            
+            if len(query) >= 3 and len(found) < limit:
+                # Подстрока слова или перевода по триграммному индексу
+                self._search_fts(cursor, self._fts_phrase(query), language,
+                                 limit + len(found))
+                self._collect(found, cursor, limit)
+            
+            if len(query) >= 4 and len(found) < limit:
+                self._search_fuzzy(cursor, query, language, found, limit)
+            
+            return list(found.values())
+    
+    @staticmethod
+    def _fts_phrase(text: str) -> str:
+        """Строка как фраза FTS5 с экранированием кавычек"""
+        return '"' + text.replace('"', '""') + '"'
+    
+    @staticmethod
+    def _search_fts(cursor: sqlite3.Cursor, match: str, language: Optional[str], limit: int):
+        """Выборка слов по полнотекстовому индексу
+
+        Ранжирование bm25 не используется: для частых триграмм оно требует
+        подсчета по всему индексу.
+        """
+        columns = ", ".join(f"w.{column}" for column in WORD_COLUMNS.split(", "))
+        language_filter = "AND w.language = ?" if language else ""
+        # CROSS JOIN закрепляет порядок: сначала индекс, затем строки по rowid
+        cursor.execute(f'''
+            SELECT {columns} FROM words_fts f
+            CROSS JOIN words w ON w.id = f.rowid
+            WHERE words_fts MATCH ? {language_filter}
+            LIMIT ?
+        ''', (match, *([language] if language else []), limit))
+    
+    def _search_fuzzy(self, cursor: sqlite3.Cursor, query: str, language: Optional[str],
+                      found: dict, limit: int):
+        """Нечеткий поиск: слова с наибольшим числом общих с запросом триграмм
+
+        По каждой триграмме берется не больше SEARCH_FUZZY_CANDIDATES строк,
+        поэтому частые триграммы почти не влияют на время поиска.
+        """
+        trigrams = {query[i:i + 3].lower() for i in range(len(query) - 2)}
+        hits = Counter()
+        for trigram in trigrams:
+            cursor.execute(
+                "SELECT rowid FROM words_fts WHERE words_fts MATCH ? LIMIT ?",
+                (self._fts_phrase(trigram), settings.SEARCH_FUZZY_CANDIDATES)
+            )
+            hits.update(row[0] for row in cursor)
+        
+        # Совпадение по одной триграмме из многих считаем случайным
+        min_hits = 2 if len(trigrams) > 2 else 1
+        candidates = [word_id for word_id, count in hits.most_common()
+                      if count >= min_hits and word_id not in found]
+        
+        language_filter = "AND +language = ?" if language else ""
+        for batch in _chunked(candidates, limit):
+            cursor.execute(f'''
+                SELECT {WORD_COLUMNS} FROM words
+                WHERE id IN (SELECT value FROM json_each(?)) {language_filter}
+            ''', (json.dumps(batch), *([language] if language else [])))
+            words = {word.id: word for word in self._fetch_words(cursor)}
+            for word_id in batch:
+                if word_id in words and len(found) < limit:
+                    found[word_id] = words[word_id]
+            if len(found) >= limit:
+                break
+    
+    @staticmethod
+    def _collect(found: dict, cursor: sqlite3.Cursor, limit: int):
+        """Добавление новых результатов поиска без повторов"""
+        for row in cursor:
+            if len(found) >= limit:
+                break
+            if row[0] not in found:
+                found[row[0]] = Word.from_row(row)
+    
+    def get_review_queue(self, limit: int = settings.REVIEW_QUEUE_CACHE) -> List[Tuple[int, int]]:
+        """Ближайшие по сроку карточки: пары (due_at, id) по индексу очереди"""
+        with self._get_connection() as conn:
+            cursor = self._word_cursor(conn)
+            cursor.execute('''
+                SELECT due_at, id FROM words
+                WHERE due_at IS NOT NULL
+                ORDER BY due_at, id
+                LIMIT ?
+            ''', (limit,))
+            return cursor.fetchall()
+    
+    def get_due_words(self, limit: int = settings.PAGE_SIZE,
+                      now: Optional[datetime] = None) -> List[Word]:
+        """Слова, срок повторения которых наступил, от самых просроченных"""
+        with self._get_connection() as conn:
+            cursor = self._word_cursor(conn)
+            cursor.execute(f'''
+                SELECT {WORD_COLUMNS} FROM words
+                WHERE due_at <= ?
+                ORDER BY due_at, id
+                LIMIT ?
+            ''', (to_timestamp(now or datetime.now()), limit))
+            return self._fetch_words(cursor)
+    
+    def get_review_state(self, word_id: int) -> ReviewState:
+        """Состояние интервального повторения слова"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT due_at, interval_days, ease, repetitions
+                FROM words WHERE id = ?
+            ''', (word_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise DatabaseError(f"Слово с ID {word_id} не найдено")
+            return ReviewState(word_id, *row)
+    
+    def record_review(self, word_id: int, quality: int,
+                      reviewed_at: Optional[datetime] = None) -> ReviewState:
+        """Запись ответа на карточку и расчет следующего повторения по SM-2"""
+        reviewed_at = reviewed_at or datetime.now()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {WORD_COLUMNS} FROM words WHERE id = ?", (word_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise DatabaseError(f"Слово с ID {word_id} не найдено")
+            previous = Word.from_row(row)
+            
+            state = self.get_review_state(word_id)
+            state.repetitions, state.interval_days, state.ease = sm2(
+                quality, state.repetitions, state.interval_days, state.ease
+            )
+            reviewed_ts = to_timestamp(reviewed_at)
+            state.due_at = reviewed_ts + round(state.interval_days * 86400)
+            
+            cursor.execute('''
+                UPDATE words
+                SET due_at = ?, interval_days = ?, ease = ?, repetitions = ?,
+                    last_reviewed = ?
+                WHERE id = ?
+            ''', (state.due_at, state.interval_days, state.ease, state.repetitions,
+                  reviewed_ts, word_id))
+            self._log_review(cursor, word_id, reviewed_ts, quality)
+            self._touch_activity(cursor, reviewed_at)
+            
+            word = Word.from_row(row)
+            word.last_reviewed = reviewed_at
+            self._emit(WordChange(WordChange.UPDATED, word=word, previous=previous,
+                                  due_at=state.due_at))
+            return state
+    
+    def get_review_activity(self, days: Optional[int] = None,
+                            weekly: bool = False) -> List[dict]:
+        """Повторения и изученные слова по дням или неделям
+
+        Читается из сводок, которые ведет триггер журнала повторений,
+        поэтому время зависит от числа дней в периоде, а не событий.
+        days=None - за все время; неделя обозначается датой понедельника.
+        """
+        table, key = ("review_weekly", "week") if weekly else ("review_daily", "day")
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if days is None:
+                cursor.execute(f"SELECT {key}, reviews, learned FROM {table} ORDER BY {key}")
+            else:
+                since = date.today() - timedelta(days=days)
+                if weekly:
+                    since -= timedelta(days=since.weekday())
+                cursor.execute(f'''
+                    SELECT {key}, reviews, learned FROM {table}
+                    WHERE {key} >= ?
+                    ORDER BY {key}
+                ''', (since.isoformat(),))
+            return [{'date': day, 'reviews': reviews, 'learned': learned}
+                    for day, reviews, learned in cursor.fetchall()]
     
     def get_user_progress(self) -> UserProgress:
-        """Получение прогресса пользователя"""
+        """Получение прогресса пользователя
+
+        Серия из кэша user_progress считается текущей, только если
+        последний день активности - сегодня или вчера.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM user_progress WHERE id = 1")
+            cursor.execute('''
+                SELECT p.*, (SELECT MAX(day) FROM review_daily) AS last_day
+                FROM user_progress p WHERE p.id = 1
+            ''')
             row = cursor.fetchone()
             
+            yesterday = (date.today() - timedelta(days=1)).isoformat()
+            current = row['last_day'] is not None and row['last_day'] >= yesterday
             return UserProgress(
                 total_words=row['total_words'],
                 learned_words=row['learned_words'],
-                streak_days=row['streak_days'],
+                streak_days=row['streak_days'] if current else 0,
                 last_active=datetime.fromisoformat(row['last_active']) 
-                    if row['last_active'] else None
+                    if row['last_active'] else None,
+                longest_streak=row['longest_streak']
             )
     
+    def get_activity_calendar(self, days: Optional[int] = 365) -> Dict[str, int]:
+        """Число повторений по дням для календаря активности (дни без
+        повторений отсутствуют); days=None - за все время"""
+        return {stat['date']: stat['reviews'] for stat in self.get_review_activity(days)}
+    
     def get_words_by_language(self, language: str) -> List[Word]:
         """Получение слов по языку"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM words 
+            cursor = self._word_cursor(conn)
+            cursor.execute(f'''
+                SELECT {WORD_COLUMNS} FROM words 
                 WHERE language = ? 
                 ORDER BY difficulty DESC
             ''', (language,))
             
-            words = []
-            for row in cursor.fetchall():
-                words.append(Word(
-                    id=row['id'],
-                    word=row['word'],
-                    translation=row['translation'],
-                    language=row['language'],
-                    difficulty=row['difficulty']
-                ))
-            return words
+            return self._fetch_words(cursor)
     
     def get_daily_stats(self, days: int = 7) -> List[dict]:
         """Получение статистики за последние дни"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
+            # Начало периода: локальная полночь days дней назад
+            since = datetime.combine(date.today() - timedelta(days=days), time())
+            
             # Получаем количество добавленных слов по дням
             cursor.execute('''
                 SELECT 
-                    DATE(created_at) as date,
+                    DATE(created_at, 'unixepoch', 'localtime') as date,
                     COUNT(*) as added_count,
                     SUM(CASE WHEN difficulty >= 4 THEN 1 ELSE 0 END) as learned_count
                 FROM words 
-                WHERE created_at >= date('now', ?)
-                GROUP BY DATE(created_at)
+                WHERE created_at >= ?
+                GROUP BY 1
                 ORDER BY date
-            ''', (f'-{days} days',))
+            ''', (to_timestamp(since),))
             
             stats = []
             for row in cursor.fetchall():
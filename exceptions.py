@@ -18,6 +18,19 @@ class InvalidDifficultyError(LanguageAppError):
     def __init__(self, value):
         super().__init__(f"Сложность должна быть от 1 до 5, получено: {value}")
 
+class InvalidQualityError(LanguageAppError):
+    """Исключение при некорректной оценке ответа"""
+    def __init__(self, value):
+        super().__init__(f"Оценка ответа должна быть от 0 до 5, получено: {value}")
+
 class WordNotFoundError(LanguageAppError):
     """Исключение при отсутствии слова"""
+    pass
+
+class ImportFormatError(LanguageAppError):
+    """Исключение при некорректном файле импорта"""
+    pass
+
+class OperationCancelledError(LanguageAppError):
+    """Исключение при отмене длительной операции пользователем"""
     pass
\ No newline at end of file
@@ -0,0 +1,63 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List
+
+import settings
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+SLOW_LOG_FORMAT = '%(asctime)s - %(message)s'
+
+_listeners: List[QueueListener] = []
+
+
+def queue_logging(logger: logging.Logger, *handlers: logging.Handler) -> QueueListener:
+    """Неблокирующая запись журнала: логгер кладет записи в очередь,
+    а обработчики выполняются в отдельном потоке QueueListener"""
+    records = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+def rotating_file_handler(path, fmt: str = LOG_FORMAT,
+                          max_bytes: int = settings.LOG_FILE_MAX_BYTES,
+                          backups: int = settings.LOG_FILE_BACKUPS) -> RotatingFileHandler:
+    """Файловый обработчик с ротацией по размеру (файл создается при первой записи)"""
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                  encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter(fmt))
+    return handler
+
+
+def setup_logging():
+    """Настройка журналов приложения
+
+    Основной журнал пишется в logs/app.log с ротацией и в консоль,
+    медленные запросы - в отдельный файл без передачи в основной журнал.
+    Поток GUI только ставит записи в очередь и не ждет диска.
+    """
+    for path in (settings.LOG_FILE, settings.SLOW_QUERY_LOG):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    queue_logging(root, rotating_file_handler(settings.LOG_FILE), console)
+
+    slow = logging.getLogger("database.slow")
+    slow.propagate = False
+    queue_logging(slow, rotating_file_handler(settings.SLOW_QUERY_LOG, SLOW_LOG_FORMAT))
+
+
+def stop_logging():
+    """Запись оставшихся в очередях сообщений и остановка потоков журнала"""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,54 @@
+from typing import List
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QPlainTextEdit
+
+import settings
+
+
+class LogView(QPlainTextEdit):
+    """Панель журнала действий с ограниченным числом строк
+
+    Хранит не больше max_lines последних строк: старые блоки документ
+    удаляет сам (maximumBlockCount). Строки копятся в буфере и
+    добавляются одной вставкой раз в flush_ms, поэтому серия сообщений
+    вызывает одну перекомпоновку и одну прокрутку. Прокрутка вниз
+    выполняется, только если пользователь уже был в конце журнала.
+    """
+
+    def __init__(self, max_lines: int = settings.LOG_PANEL_MAX_LINES,
+                 flush_ms: int = settings.LOG_PANEL_FLUSH_MS, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self._pending: List[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append_line(self, line: str):
+        """Добавление строки в журнал (отложенно, вместе с соседними)"""
+        self._pending.append(line)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Вывод накопленных строк одной вставкой"""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        # В буфере достаточно последних max_lines строк
+        lines = self._pending[-self.maximumBlockCount():]
+        self._pending.clear()
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def lines(self) -> List[str]:
+        """Строки журнала, включая еще не выведенные"""
+        self.flush()
+        return self.toPlainText().splitlines()
@@ -1,16 +1,107 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from app import LanguageLearningApp
+import time
+import importlib
+
+# Замер запуска начинается до импорта Qt и модулей приложения
+START = time.perf_counter()
+
+# Модули, время импорта которых показывает замер запуска (в порядке загрузки)
+STARTUP_MODULES = [
+    "PySide6.QtCore", "PySide6.QtWidgets", "settings", "models",
+    "database", "table_model", "workers", "app",
+]
+
+
+def elapsed_ms(since: float) -> float:
+    """Миллисекунды с момента since"""
+    return (time.perf_counter() - since) * 1000
+
+
+def profile_startup():
+    """Замер времени запуска: импорты, создание окна, первая отрисовка,
+    загрузка первых данных и готовность графика"""
+    imports = []
+    for name in STARTUP_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        imports.append((name, elapsed_ms(start)))
+
+    from log_config import setup_logging
+    setup_logging()
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    from app import LanguageLearningApp
+
+    stages = []
+    app = QApplication(sys.argv)
+    stages.append(("QApplication", elapsed_ms(START)))
+
+    window = LanguageLearningApp()
+    stages.append(("окно создано", elapsed_ms(START)))
+
+    pending = {"данные загружены", "график готов"}
+
+    def done(stage: str):
+        if stage in pending:
+            pending.discard(stage)
+            stages.append((stage, elapsed_ms(START)))
+        if not pending:
+            app.quit()
+
+    # Таймер ставится до показа окна, чтобы сработать раньше создания графика
+    QTimer.singleShot(0, lambda: stages.append(("окно показано", elapsed_ms(START))))
+    window.show()
+
+    # Первая страница таблицы и статистика загружаются в фоне
+    window.executor.busy_changed.connect(lambda busy: busy or done("данные загружены"))
+    window.chart_ready.connect(lambda: done("график готов"))
+    QTimer.singleShot(30000, app.quit)  # Защита от зависания замера
+    app.exec()
+
+    print("⏱  Импорт модулей:")
+    for name, ms in imports:
+        print(f"   {name}: {ms:.1f} мс")
+    if window.chart_import_ms is not None:
+        print(f"   chart (matplotlib, отложенно): {window.chart_import_ms:.1f} мс")
+    print("\n⏱  Этапы запуска (от старта процесса):")
+    for stage, ms in stages:
+        print(f"   {stage}: {ms:.1f} мс")
+    window.close()
+
 
 def main():
     """Точка входа в приложение"""
+    if "--startup-profile" in sys.argv:
+        sys.argv.remove("--startup-profile")
+        profile_startup()
+        return
+
+    if "--read-only" in sys.argv:
+        sys.argv.remove("--read-only")
+        import settings
+        settings.DB_READ_ONLY = True
+
+    # Журналы настраивает запуск приложения, а не импорт модуля app
+    from log_config import setup_logging
+    setup_logging()
+
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    from app import LanguageLearningApp
+    from exceptions import DatabaseError
+
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Установка стиля
-    
-    window = LanguageLearningApp()
+
+    try:
+        window = LanguageLearningApp()
+    except DatabaseError as e:
+        # Например, --read-only для еще не созданного файла БД
+        QMessageBox.critical(None, "Ошибка", f"Не удалось открыть базу данных:\n{e}")
+        sys.exit(1)
     window.show()
-    
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,391 @@
+# Миграции схемы базы данных
+#
+# Версия схемы хранится в PRAGMA user_version. Каждая миграция получает
+# курсор внутри общей транзакции и переводит схему на следующую версию.
+import sqlite3
+
+
+def _initial_schema(cursor: sqlite3.Cursor):
+    """Версия 1: исходные таблицы слов и прогресса"""
+    # Таблица слов
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS words (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            language TEXT NOT NULL,
+            difficulty INTEGER CHECK(difficulty BETWEEN 1 AND 5),
+            last_reviewed DATETIME,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Таблица прогресса пользователя
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_progress (
+            id INTEGER PRIMARY KEY CHECK(id = 1),
+            total_words INTEGER DEFAULT 0,
+            learned_words INTEGER DEFAULT 0,
+            streak_days INTEGER DEFAULT 0,
+            last_active DATETIME
+        )
+    ''')
+
+    # Инициализация записи прогресса
+    cursor.execute('''
+        INSERT OR IGNORE INTO user_progress (id) VALUES (1)
+    ''')
+
+
+def _add_word_indexes(cursor: sqlite3.Cursor):
+    """Версия 2: уникальность (language, word) и индексы для выборок"""
+    # Старые БД могли накопить дубликаты: оставляем самую раннюю запись
+    duplicates = '''
+        FROM words WHERE id NOT IN (
+            SELECT MIN(id) FROM words GROUP BY language, word
+        )
+    '''
+    cursor.execute(f"SELECT COUNT(*), TOTAL(difficulty >= 4) {duplicates}")
+    removed, removed_learned = cursor.fetchone()
+    if removed:
+        cursor.execute(f"DELETE {duplicates}")
+        cursor.execute('''
+            UPDATE user_progress
+            SET total_words = total_words - ?,
+                learned_words = learned_words - ?
+            WHERE id = 1
+        ''', (removed, int(removed_learned)))
+
+    # Проверка дубликатов в add_word / add_words
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_words_language_word
+        ON words (language, word)
+    ''')
+    # Фильтр и сортировка в get_words_by_language
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_words_language_difficulty
+        ON words (language, difficulty)
+    ''')
+    # Сортировка в get_all_words и покрывающий индекс для get_daily_stats
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_words_created_difficulty
+        ON words (created_at, difficulty)
+    ''')
+
+
+def _add_keyset_index(cursor: sqlite3.Cursor):
+    """Версия 3: индекс для постраничной выборки по ключу (created_at, id)"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_words_created_id
+        ON words (created_at, id)
+    ''')
+
+
+def _epoch_timestamps(cursor: sqlite3.Cursor):
+    """Версия 4: метки времени слов в секундах эпохи вместо текста"""
+    # Тип и значение по умолчанию столбца меняются только пересозданием таблицы
+    cursor.execute('''
+        CREATE TABLE words_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            language TEXT NOT NULL,
+            difficulty INTEGER CHECK(difficulty BETWEEN 1 AND 5),
+            last_reviewed INTEGER,
+            created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    ''')
+
+    # Текст записывался в локальном времени: модификатор 'utc' переводит
+    # его в UTC, после чего '%s' дает секунды эпохи
+    cursor.execute('''
+        INSERT INTO words_new (id, word, translation, language, difficulty,
+                               last_reviewed, created_at)
+        SELECT id, word, translation, language, difficulty,
+               CASE WHEN last_reviewed IS NULL OR typeof(last_reviewed) = 'integer'
+                    THEN last_reviewed
+                    ELSE CAST(strftime('%s', last_reviewed, 'utc') AS INTEGER) END,
+               CASE WHEN created_at IS NULL
+                    THEN CAST(strftime('%s', 'now') AS INTEGER)
+                    WHEN typeof(created_at) = 'integer' THEN created_at
+                    ELSE CAST(strftime('%s', created_at, 'utc') AS INTEGER) END
+        FROM words
+    ''')
+    # Счетчик AUTOINCREMENT переносим, чтобы ID удаленных слов не выдавались снова
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'words'")
+    sequence = cursor.fetchone()
+    cursor.execute("DROP TABLE words")
+    cursor.execute("ALTER TABLE words_new RENAME TO words")
+    if sequence:
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'words'")
+        cursor.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('words', ?)", (sequence[0],)
+        )
+
+    # Индексы удаляются вместе со старой таблицей
+    cursor.execute('''
+        CREATE UNIQUE INDEX idx_words_language_word ON words (language, word)
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_words_language_difficulty ON words (language, difficulty)
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_words_created_difficulty ON words (created_at, difficulty)
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_words_created_id ON words (created_at, id)
+    ''')
+
+
+def _review_schedule(cursor: sqlite3.Cursor):
+    """Версия 5: состояние интервальных повторений и индекс очереди"""
+    cursor.execute("ALTER TABLE words ADD COLUMN due_at INTEGER")
+    cursor.execute("ALTER TABLE words ADD COLUMN interval_days REAL NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE words ADD COLUMN ease REAL NOT NULL DEFAULT 2.5")
+    cursor.execute("ALTER TABLE words ADD COLUMN repetitions INTEGER NOT NULL DEFAULT 0")
+
+    # Существующие слова доступны для повторения сразу
+    cursor.execute("UPDATE words SET due_at = created_at")
+    cursor.execute('''
+        CREATE INDEX idx_words_due ON words (due_at, id)
+    ''')
+
+
+def _full_text_search(cursor: sqlite3.Cursor):
+    """Версия 6: полнотекстовый индекс по словам и переводам"""
+    # Триграммный токенизатор позволяет искать по любой подстроке
+    # от трех символов и сравнивать слова по общим триграммам
+    cursor.execute('''
+        CREATE VIRTUAL TABLE words_fts USING fts5(
+            word, translation,
+            content = 'words', content_rowid = 'id',
+            tokenize = 'trigram'
+        )
+    ''')
+
+    # Синхронизация индекса с таблицей words
+    cursor.execute('''
+        CREATE TRIGGER words_fts_insert AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts (rowid, word, translation)
+            VALUES (new.id, new.word, new.translation);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER words_fts_delete AFTER DELETE ON words BEGIN
+            INSERT INTO words_fts (words_fts, rowid, word, translation)
+            VALUES ('delete', old.id, old.word, old.translation);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER words_fts_update AFTER UPDATE OF word, translation ON words BEGIN
+            INSERT INTO words_fts (words_fts, rowid, word, translation)
+            VALUES ('delete', old.id, old.word, old.translation);
+            INSERT INTO words_fts (rowid, word, translation)
+            VALUES (new.id, new.word, new.translation);
+        END
+    ''')
+    cursor.execute("INSERT INTO words_fts (words_fts) VALUES ('rebuild')")
+
+    # Запросы короче триграммы ищутся по префиксу слова без учета регистра
+    cursor.execute('''
+        CREATE INDEX idx_words_word_lower ON words (lower(word))
+    ''')
+
+
+# Пересчет счетчиков прогресса за один проход по таблице words
+REBUILD_PROGRESS = '''
+    UPDATE user_progress
+    SET (total_words, learned_words) = (
+        SELECT COUNT(*), COALESCE(SUM(difficulty >= 4), 0) FROM words
+    )
+    WHERE id = 1
+'''
+
+
+def _progress_triggers(cursor: sqlite3.Cursor):
+    """Версия 7: счетчики прогресса поддерживаются триггерами"""
+    # Изученным считается слово со сложностью 4 и выше
+    cursor.execute('''
+        CREATE TRIGGER words_progress_insert AFTER INSERT ON words BEGIN
+            UPDATE user_progress
+            SET total_words = total_words + 1,
+                learned_words = learned_words + (new.difficulty >= 4)
+            WHERE id = 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER words_progress_delete AFTER DELETE ON words BEGIN
+            UPDATE user_progress
+            SET total_words = total_words - 1,
+                learned_words = learned_words - (old.difficulty >= 4)
+            WHERE id = 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER words_progress_update AFTER UPDATE OF difficulty ON words
+        WHEN (new.difficulty >= 4) != (old.difficulty >= 4) BEGIN
+            UPDATE user_progress
+            SET learned_words = learned_words + (new.difficulty >= 4) - (old.difficulty >= 4)
+            WHERE id = 1;
+        END
+    ''')
+
+    # Счетчики, накопившие расхождения при ручном обновлении
+    cursor.execute(REBUILD_PROGRESS)
+
+
+# Начало недели (понедельник) для метки времени в секундах эпохи
+WEEK_START = "date({0}, 'unixepoch', 'localtime', 'weekday 0', '-6 days')"
+
+
+def _review_events(cursor: sqlite3.Cursor):
+    """Версия 8: журнал повторений и дневные/недельные сводки"""
+    # Журнал только дополняется: удаление слова не стирает его историю
+    cursor.execute('''
+        CREATE TABLE review_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER NOT NULL,
+            reviewed_at INTEGER NOT NULL,
+            quality INTEGER,
+            learned INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_review_events_word ON review_events (word_id, reviewed_at)
+    ''')
+
+    # Сводки по локальным дням и неделям ведутся триггером при каждой записи
+    cursor.execute('''
+        CREATE TABLE review_daily (
+            day TEXT PRIMARY KEY,
+            reviews INTEGER NOT NULL DEFAULT 0,
+            learned INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE review_weekly (
+            week TEXT PRIMARY KEY,
+            reviews INTEGER NOT NULL DEFAULT 0,
+            learned INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER review_events_rollup AFTER INSERT ON review_events BEGIN
+            INSERT INTO review_daily (day, reviews, learned)
+            VALUES (date(new.reviewed_at, 'unixepoch', 'localtime'), 1, new.learned)
+            ON CONFLICT (day) DO UPDATE
+            SET reviews = reviews + 1, learned = learned + excluded.learned;
+            INSERT INTO review_weekly (week, reviews, learned)
+            VALUES ({WEEK_START.format('new.reviewed_at')}, 1, new.learned)
+            ON CONFLICT (week) DO UPDATE
+            SET reviews = reviews + 1, learned = learned + excluded.learned;
+        END
+    ''')
+
+    # История до журнала: последнее повторение каждого слова
+    cursor.execute('''
+        INSERT INTO review_events (word_id, reviewed_at, learned)
+        SELECT id, last_reviewed, difficulty >= 4 FROM words
+        WHERE last_reviewed IS NOT NULL
+        ORDER BY last_reviewed
+    ''')
+
+
+# Длины серий подряд идущих дней активности: дни одной серии имеют
+# одинаковую разность julianday(day) - номер дня по порядку
+STREAK_RUNS = '''
+    SELECT COUNT(*) AS length, MAX(day) AS last
+    FROM (SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS run
+          FROM review_daily)
+    GROUP BY run
+'''
+
+# Пересчет последней и самой длинной серии за один проход по дням активности
+REBUILD_STREAK = f'''
+    UPDATE user_progress
+    SET (streak_days, longest_streak) = (
+        SELECT length, MAX(length) OVER () FROM ({STREAK_RUNS})
+        ORDER BY last DESC LIMIT 1
+    )
+    WHERE id = 1 AND EXISTS (SELECT 1 FROM review_daily)
+'''
+
+
+def _streak_triggers(cursor: sqlite3.Cursor):
+    """Версия 9: серия дней по дневной сводке активности
+
+    streak_days - длина серии, заканчивающейся последним днем активности
+    (текущей ее считает get_user_progress, если этот день сегодня или
+    вчера), longest_streak - самая длинная серия.
+    """
+    cursor.execute("ALTER TABLE user_progress ADD COLUMN longest_streak INTEGER DEFAULT 0")
+
+    # Новый последний день продлевает серию или начинает новую: один
+    # поиск по первичному ключу review_daily
+    cursor.execute('''
+        CREATE TRIGGER review_daily_streak AFTER INSERT ON review_daily
+        WHEN NOT EXISTS (SELECT 1 FROM review_daily WHERE day > new.day) BEGIN
+            UPDATE user_progress
+            SET streak_days = CASE
+                WHEN EXISTS (SELECT 1 FROM review_daily WHERE day = date(new.day, '-1 day'))
+                THEN streak_days + 1 ELSE 1 END
+            WHERE id = 1;
+            UPDATE user_progress
+            SET longest_streak = max(longest_streak, streak_days)
+            WHERE id = 1;
+        END
+    ''')
+
+    # День в прошлом (повторение задним числом) может склеить серии
+    cursor.execute(f'''
+        CREATE TRIGGER review_daily_streak_past AFTER INSERT ON review_daily
+        WHEN EXISTS (SELECT 1 FROM review_daily WHERE day > new.day) BEGIN
+            {REBUILD_STREAK};
+        END
+    ''')
+
+    cursor.execute("UPDATE user_progress SET streak_days = 0 WHERE id = 1")
+    cursor.execute(REBUILD_STREAK)
+
+
+# Список миграций: (версия, функция). Новые миграции добавляются в конец.
+MIGRATIONS = [
+    (1, _initial_schema),
+    (2, _add_word_indexes),
+    (3, _add_keyset_index),
+    (4, _epoch_timestamps),
+    (5, _review_schedule),
+    (6, _full_text_search),
+    (7, _progress_triggers),
+    (8, _review_events),
+    (9, _streak_triggers),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Текущая версия схемы БД"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Применение недостающих миграций, возвращает итоговую версию"""
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    # DDL не открывает транзакцию неявно, поэтому начинаем ее сами:
+    # миграции применяются атомарно вместе с коммитом вызывающего кода
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+        # Другой процесс мог успеть обновить схему до блокировки
+        current = get_schema_version(conn)
+
+    cursor = conn.cursor()
+    for version, migration in MIGRATIONS:
+        if version > current:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            current = version
+    return current
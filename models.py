@@ -2,41 +2,140 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+def to_timestamp(value: Optional[datetime]) -> Optional[int]:
+    """Перевод datetime в секунды эпохи для хранения в БД"""
+    return int(value.timestamp()) if value is not None else None
+
+
+def from_timestamp(value: Optional[int]) -> Optional[datetime]:
+    """Перевод секунд эпохи из БД в локальное время"""
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
 class Word:
-    """Класс для представления слова"""
-    id: Optional[int] = None
-    word: str = ""
-    translation: str = ""
-    language: str = ""
-    difficulty: int = 1
-    last_reviewed: Optional[datetime] = None
-    created_at: Optional[datetime] = None
+    """Класс для представления слова
+    
+    Метки времени хранятся как секунды эпохи (как в БД) и превращаются
+    в datetime только при обращении к last_reviewed / created_at.
+    """
+    __slots__ = ('id', 'word', 'translation', 'language', 'difficulty',
+                 'last_reviewed_ts', 'created_ts')
+    
+    def __init__(self, id: Optional[int] = None, word: str = "", translation: str = "",
+                 language: str = "", difficulty: int = 1,
+                 last_reviewed: Optional[datetime] = None,
+                 created_at: Optional[datetime] = None):
+        self.id = id
+        self.word = word
+        self.translation = translation
+        self.language = language
+        self.difficulty = difficulty
+        self.last_reviewed_ts = to_timestamp(last_reviewed)
+        self.created_ts = to_timestamp(created_at)
+    
+    @classmethod
+    def from_row(cls, row: tuple) -> "Word":
+        """Быстрое создание из строки БД в порядке столбцов WORD_COLUMNS"""
+        word = cls.__new__(cls)
+        (word.id, word.word, word.translation, word.language, word.difficulty,
+         word.last_reviewed_ts, word.created_ts) = row
+        return word
+    
+    @property
+    def last_reviewed(self) -> Optional[datetime]:
+        return from_timestamp(self.last_reviewed_ts)
+    
+    @last_reviewed.setter
+    def last_reviewed(self, value: Optional[datetime]):
+        self.last_reviewed_ts = to_timestamp(value)
+    
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return from_timestamp(self.created_ts)
+    
+    @created_at.setter
+    def created_at(self, value: Optional[datetime]):
+        self.created_ts = to_timestamp(value)
+    
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    def __repr__(self):
+        return (f"Word(id={self.id!r}, word={self.word!r}, "
+                f"translation={self.translation!r}, language={self.language!r}, "
+                f"difficulty={self.difficulty!r}, last_reviewed={self.last_reviewed!r}, "
+                f"created_at={self.created_at!r})")
     
     def to_dict(self):
         """Преобразование в словарь для таблицы"""
+        last_reviewed = self.last_reviewed
+        created_at = self.created_at
         return {
             "id": self.id,
             "word": self.word,
             "translation": self.translation,
             "language": self.language,
             "difficulty": str(self.difficulty),
-            "last_reviewed": self.last_reviewed.strftime("%Y-%m-%d %H:%M") 
-                if self.last_reviewed else "Не изучено",
-            "created_at": self.created_at.strftime("%Y-%m-%d") 
-                if self.created_at else ""
+            "last_reviewed": last_reviewed.strftime("%Y-%m-%d %H:%M") 
+                if last_reviewed else "Не изучено",
+            "created_at": created_at.strftime("%Y-%m-%d") 
+                if created_at else ""
         }
 
+# Порядок столбцов таблицы words для Word.from_row
+WORD_COLUMNS = "id, word, translation, language, difficulty, last_reviewed, created_at"
+
 @dataclass
 class UserProgress:
     """Класс для отслеживания прогресса пользователя"""
     total_words: int = 0
     learned_words: int = 0
-    streak_days: int = 0
+    streak_days: int = 0  # Текущая серия дней активности подряд
     last_active: Optional[datetime] = None
+    longest_streak: int = 0  # Самая длинная серия за все время
     
     def get_progress_percentage(self):
         """Получить процент изученных слов"""
         if self.total_words == 0:
             return 0
-        return (self.learned_words / self.total_words) * 100
\ No newline at end of file
+        return (self.learned_words / self.total_words) * 100
+
+@dataclass
+class ReviewState:
+    """Состояние интервального повторения слова"""
+    word_id: int
+    due_at: int  # секунды эпохи
+    interval_days: float = 0
+    ease: float = 2.5
+    repetitions: int = 0
+
+@dataclass
+class ImportResult:
+    """Результат пакетного добавления слов"""
+    inserted: int = 0
+    skipped: int = 0
+    
+    @property
+    def total(self):
+        """Всего обработано слов"""
+        return self.inserted + self.skipped
+
+@dataclass
+class WordChange:
+    """Изменение слов в БД для инкрементального обновления интерфейса"""
+    ADDED = "added"
+    DELETED = "deleted"
+    UPDATED = "updated"
+    RELOADED = "reloaded"  # Изменено много строк, нужна полная перезагрузка
+    
+    action: str
+    word: Optional[Word] = None
+    previous: Optional[Word] = None  # Состояние слова до изменения
+    total_delta: int = 0
+    learned_delta: int = 0
+    due_at: Optional[int] = None  # Новый срок повторения, если он изменился
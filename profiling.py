@@ -0,0 +1,131 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List
+
+import settings
+
+# Границы корзин гистограммы времени вызова, мс
+HISTOGRAM_BOUNDS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+# Максимальная длина SQL одного запроса в журнале медленных запросов
+MAX_SQL_LENGTH = 500
+
+slow_log = logging.getLogger("database.slow")
+
+
+class MethodStats:
+    """Накопленная статистика вызовов одного метода"""
+    __slots__ = ('calls', 'errors', 'total_ms', 'max_ms', 'rows', 'statements', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.statements = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, elapsed_ms: float, rows: int, statements: int, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.statements += statements
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS, elapsed_ms)] += 1
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS]
+        labels.append(f">{HISTOGRAM_BOUNDS[-1]}ms")
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': self.total_ms,
+            'avg_ms': self.total_ms / self.calls if self.calls else 0.0,
+            'max_ms': self.max_ms,
+            'rows': self.rows,
+            'statements': self.statements,
+            'histogram': dict(zip(labels, self.histogram)),
+        }
+
+
+class QueryProfiler:
+    """Профилирование вызовов DatabaseManager
+
+    Замеряет время и число возвращенных строк для методов менеджера
+    (вызовы профилируемых методов изнутри других учитываются во внешнем),
+    собирает SQL вызова через set_trace_callback подключения и пишет
+    вызовы дольше порога в журнал медленных запросов (логгер database.slow).
+    Подключается только при включенном профилировании, иначе менеджер
+    работает без оберток.
+    """
+
+    def __init__(self, slow_query_ms: float = settings.SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._stats: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def trace(self, statement: str):
+        """Обработчик set_trace_callback: SQL текущего вызова"""
+        calls = getattr(self._local, 'calls', None)
+        if calls:
+            calls[-1].append(statement)
+
+    def wrap(self, name: str, method: Callable) -> Callable:
+        """Обертка метода с замером времени"""
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            calls = getattr(self._local, 'calls', None)
+            if calls is None:
+                calls = self._local.calls = []
+            if calls:
+                # Вложенный вызов (get_word -> get_words): его время и SQL
+                # входят в учет внешнего метода, отдельно не считаются
+                return method(*args, **kwargs)
+            statements: List[str] = []
+            calls.append(statements)
+            failed = True
+            result = None
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                calls.pop()
+                self._record(name, elapsed_ms, result, statements, failed)
+        return profiled
+
+    def _record(self, name: str, elapsed_ms: float, result, statements: List[str],
+                failed: bool):
+        """Учет вызова в статистике и журнале медленных запросов"""
+        # Строки считаются только у выборок-списков: числа и ImportResult - не строки
+        rows = len(result) if isinstance(result, (list, tuple)) else 0
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = MethodStats()
+            stats.add(elapsed_ms, rows, len(statements), failed)
+
+        if elapsed_ms >= self.slow_query_ms:
+            sql = "\n    ".join(statement[:MAX_SQL_LENGTH] for statement in statements)
+            slow_log.warning(
+                "%s: %.1f мс, строк: %d%s\n    %s",
+                name, elapsed_ms, rows, " (ошибка)" if failed else "", sql
+            )
+
+    def stats(self) -> Dict[str, dict]:
+        """Статистика по методам"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def reset(self):
+        """Сброс накопленной статистики"""
+        with self._lock:
+            self._stats.clear()
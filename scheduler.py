@@ -0,0 +1,143 @@
+import heapq
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models import ReviewState, WordChange, to_timestamp
+from exceptions import InvalidQualityError
+import settings
+
+# Минимальный коэффициент легкости SM-2
+MIN_EASE = 1.3
+
+
+def sm2(quality: int, repetitions: int, interval_days: float,
+        ease: float) -> Tuple[int, float, float]:
+    """Шаг алгоритма SM-2: новые (повторения, интервал в днях, легкость)
+
+    quality - оценка ответа от 0 (полный провал) до 5 (идеально).
+    """
+    if not 0 <= quality <= 5:
+        raise InvalidQualityError(quality)
+
+    if quality < 3:
+        # Слово забыто: повторяем заново с первого интервала
+        repetitions = 0
+        interval_days = 1
+    else:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease, 2)
+        repetitions += 1
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, interval_days, ease
+
+
+class ReviewScheduler:
+    """Очередь повторений с кэшем ближайших карточек в куче
+
+    Из БД загружаются settings.REVIEW_QUEUE_CACHE карточек с ближайшим
+    сроком (по индексу due_at), дальше выдача и перепланирование идут по
+    куче за O(log n). Устаревшие записи кучи удаляются лениво.
+    """
+
+    def __init__(self, db, cache_size: int = settings.REVIEW_QUEUE_CACHE):
+        self.db = db
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[int, int]] = []  # (due_at, word_id)
+        self._due: Dict[int, int] = {}  # актуальный due_at карточек в куче
+        self._horizon: Optional[int] = None  # граница загруженной части очереди
+        self._loaded = False
+        db.add_listener(self._on_change)
+
+    def close(self):
+        """Отписка от изменений БД"""
+        self.db.remove_listener(self._on_change)
+
+    def next_due(self, now: Optional[datetime] = None) -> Optional[int]:
+        """ID слова, которое пора повторить, или None"""
+        now_ts = to_timestamp(now or datetime.now())
+        with self._lock:
+            entry = self._peek()
+            if entry is None or entry[0] > now_ts:
+                return None
+            return entry[1]
+
+    def due_count(self, now: Optional[datetime] = None) -> int:
+        """Количество карточек к повторению среди загруженных в очередь"""
+        now_ts = to_timestamp(now or datetime.now())
+        with self._lock:
+            self._ensure_loaded()
+            return sum(1 for due in self._due.values() if due <= now_ts)
+
+    def review(self, word_id: int, quality: int,
+               now: Optional[datetime] = None) -> ReviewState:
+        """Запись ответа и перепланирование карточки"""
+        state = self.db.record_review(word_id, quality, now)
+        with self._lock:
+            self._schedule(word_id, state.due_at)
+        return state
+
+    def invalidate(self):
+        """Сброс кэша: очередь будет перечитана из БД"""
+        with self._lock:
+            self._loaded = False
+
+    def _ensure_loaded(self):
+        """Загрузка ближайших карточек из БД при необходимости"""
+        if self._loaded:
+            return
+        queue = self.db.get_review_queue(self.cache_size)
+        self._heap = list(queue)
+        heapq.heapify(self._heap)
+        self._due = {word_id: due for due, word_id in queue}
+        # Если загружено не все, карточки позже границы в куче не держим
+        self._horizon = queue[-1][0] if len(queue) == self.cache_size else None
+        self._loaded = True
+
+    def _peek(self) -> Optional[Tuple[int, int]]:
+        """Ближайшая актуальная запись кучи"""
+        self._ensure_loaded()
+        while self._heap:
+            due, word_id = self._heap[0]
+            if self._due.get(word_id) == due:
+                return due, word_id
+            heapq.heappop(self._heap)  # Запись устарела после перепланирования
+
+        if self._horizon is not None:
+            # Загруженная часть исчерпана, но в БД есть карточки дальше
+            self._loaded = False
+            self._ensure_loaded()
+            if self._heap:
+                return self._heap[0]
+        return None
+
+    def _schedule(self, word_id: int, due: Optional[int]):
+        """Обновление срока карточки в куче"""
+        if due is None or (self._horizon is not None and due > self._horizon):
+            self._due.pop(word_id, None)
+            return
+        self._due[word_id] = due
+        heapq.heappush(self._heap, (due, word_id))
+
+    def _on_change(self, change: WordChange):
+        """Синхронизация кэша с изменениями слов"""
+        with self._lock:
+            if not self._loaded:
+                return
+            if change.action == WordChange.ADDED:
+                self._schedule(change.word.id, change.word.created_ts)
+            elif change.action == WordChange.DELETED:
+                self._due.pop(change.word.id, None)
+            elif change.action == WordChange.UPDATED and change.due_at is not None:
+                # Повторение могли записать в обход планировщика: новый срок
+                # приходит в изменении, без запроса к БД
+                self._due.pop(change.word.id, None)
+                self._schedule(change.word.id, change.due_at)
+            elif change.action == WordChange.RELOADED:
+                self._loaded = False
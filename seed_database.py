@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent))
 
 from models import Word
 from database import DatabaseManager
+from columnar import WordColumns
 import settings
 
 def seed_database():
@@ -23,10 +24,7 @@ def seed_database():
     
     # Очищаем существующие данные (опционально)
     print("🗑️  Очистка старых данных...")
-    with db._get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM words")
-        cursor.execute("UPDATE user_progress SET total_words = 0, learned_words = 0, streak_days = 0")
+    db.clear_words()
     
     # Примеры слов для изучения по разным языкам
     words_data = [
@@ -96,39 +94,31 @@ def seed_database():
     
     # Создаем слова с разными датами для графика
     today = datetime.now()
-    added_words = 0
+    words = []
     
-    print("📝 Добавление слов...")
     for i, word_data in enumerate(words_data):
-        try:
-            # Создаем слово с рандомной датой в прошлом для тестирования графика
-            days_ago = i % 7  # Распределяем по последним 7 дням
-            created_date = today - timedelta(days=days_ago)
-            
-            word = Word(
-                word=word_data["word"],
-                translation=word_data["translation"],
-                language=word_data["language"],
-                difficulty=word_data["difficulty"],
-                created_at=created_date
-            )
-            
-            # Для некоторых слов добавляем дату изучения
-            if word_data["difficulty"] >= 4:
-                review_date = created_date + timedelta(days=1)
-                word.last_reviewed = review_date
-                
-                # Добавляем слово и отмечаем как изученное
-                word_id = db.add_word(word)
-                db.mark_as_learned(word_id)
-            else:
-                db.add_word(word)
-            
-            added_words += 1
-            print(f"  ✓ {word_data['word']} ({word_data['language']})")
-            
-        except Exception as e:
-            print(f"  ✗ Ошибка при добавлении {word_data['word']}: {e}")
+        # Создаем слово с рандомной датой в прошлом для тестирования графика
+        days_ago = i % 7  # Распределяем по последним 7 дням
+        created_date = today - timedelta(days=days_ago)
+        
+        word = Word(
+            word=word_data["word"],
+            translation=word_data["translation"],
+            language=word_data["language"],
+            difficulty=word_data["difficulty"],
+            created_at=created_date
+        )
+        
+        # Для некоторых слов добавляем дату изучения
+        if word_data["difficulty"] >= 4:
+            word.last_reviewed = created_date + timedelta(days=1)
+        
+        words.append(word)
+    
+    print("📝 Добавление слов...")
+    result = db.add_words(words)
+    added_words = result.inserted
+    print(f"  ✓ Добавлено: {result.inserted}, пропущено дубликатов: {result.skipped}")
     
     # Получаем и выводим статистику
     progress = db.get_user_progress()
@@ -142,11 +132,12 @@ def seed_database():
     
     # Выводим количество слов по языкам
     print(f"\n🌍 Распределение по языкам:")
-    for language in settings.SUPPORTED_LANGUAGES:
-        words = db.get_words_by_language(language)
-        if words:
-            learned = sum(1 for w in words if w.difficulty >= 4)
-            print(f"   {language}: {len(words)} слов ({learned} изучено)")
+    columns = WordColumns.from_database(db)
+    totals = columns.count_by_language()
+    learned = columns.count_by_language(learned_only=True)
+    for language, total in totals.items():
+        if total:
+            print(f"   {language}: {total} слов ({learned[language]} изучено)")
     
     return added_words
 
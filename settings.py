@@ -1,5 +1,4 @@
 # Настройки приложения
-import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent
@@ -7,14 +6,85 @@ BASE_DIR = Path(__file__).parent
 # Пути к файлам
 DATABASE_PATH = BASE_DIR / "data" / "language_app.db"
 LOG_FILE = BASE_DIR / "logs" / "app.log"
-
-# Создание директорий
-for path in [DATABASE_PATH.parent, LOG_FILE.parent]:
-    path.mkdir(parents=True, exist_ok=True)
+SLOW_QUERY_LOG = BASE_DIR / "logs" / "slow_queries.log"
 
 # Настройки приложения
 APP_NAME = "Language Learning App"
 APP_VERSION = "1.0.0"
 SUPPORTED_LANGUAGES = ["English", "Spanish", "French", "German", "Japanese", "Chinese", "Russian"]
 DEFAULT_LANGUAGE = "English"
-DIFFICULTY_LEVELS = [str(i) for i in range(1, 6)]  # 1-5
\ No newline at end of file
+FAST_STARTUP = True  # Окно показывается сразу, график и matplotlib загружаются после
+DIFFICULTY_LEVELS = [str(i) for i in range(1, 6)]  # 1-5
+
+# Настройки подключения к БД
+DB_POOLED = True  # Одно долгоживущее подключение на поток
+DB_CACHED_STATEMENTS = 256  # Размер кэша подготовленных запросов
+DB_WORKER_THREADS = 2  # Потоков для фоновых операций с БД в интерфейсе
+BULK_CHUNK_SIZE = 5000  # Размер пачки при пакетной вставке
+PAGE_SIZE = 500  # Размер страницы при постраничной выборке слов
+WORD_CACHE_SIZE = 256  # Недавно прочитанных слов в кэше get_word
+
+# Профили хранения: PRAGMA, применяемые к каждому подключению.
+# fast - WAL без fsync на каждую фиксацию (данные не теряются при падении
+# приложения, но последние транзакции могут пропасть при отключении питания),
+# durable - WAL с fsync на каждую фиксацию, legacy - умолчания SQLite.
+STORAGE_PROFILES = {
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # Кэш страниц в КиБ (отрицательное значение)
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "legacy": {},
+}
+DB_STORAGE_PROFILE = "fast"
+# Каталоги data/ и logs/ создаются при первой записи (DatabaseManager,
+# setup_logging), а не при импорте настроек. В режиме только для чтения
+# и для БД в памяти (DATABASE_PATH = ":memory:") каталог БД не создается
+DB_READ_ONLY = False  # Просмотр БД без записи (mode=ro), включается ключом --read-only
+
+# Шардирование: отдельный файл SQLite на каждый язык из SUPPORTED_LANGUAGES
+DB_SHARDED = False
+DB_SHARD_DIR = BASE_DIR / "data" / "shards"
+DB_SHARD_THREADS = 4  # Потоков для параллельных запросов по шардам
+
+# Профилирование запросов
+DB_PROFILING = False  # Замер вызовов DatabaseManager; выключено - без накладных расходов
+SLOW_QUERY_MS = 100  # Вызовы дольше порога пишутся в журнал медленных запросов
+
+# Очередь групповой фиксации
+COMMIT_BATCH_SIZE = 1000  # Максимум операций в одной транзакции
+COMMIT_MAX_DELAY_MS = 20  # Ожидание новых операций перед фиксацией
+
+# Настройки интервальных повторений
+REVIEW_QUEUE_CACHE = 1000  # Ближайших карточек в очереди в памяти
+
+# Настройки поиска
+SEARCH_LIMIT = 100  # Максимум результатов поиска
+SEARCH_DEBOUNCE_MS = 250  # Задержка поиска после последнего ввода
+SEARCH_FUZZY_CANDIDATES = 2000  # Строк на триграмму в нечетком поиске
+
+# Настройки экспорта и импорта
+TRANSFER_PROGRESS_EVERY = 5000  # Слов между сообщениями о прогрессе и проверками отмены
+
+# Настройки журнала
+LOG_PANEL_MAX_LINES = 1000  # Строк в панели журнала действий
+LOG_PANEL_FLUSH_MS = 100  # Интервал вывода накопленных строк в панель
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024  # Размер файла журнала до ротации
+LOG_FILE_BACKUPS = 3  # Число хранимых старых файлов журнала
+
+# Настройки графика прогресса
+GRAPH_RANGES = [7, 30, 365]  # Доступные периоды графика в днях
+DEFAULT_GRAPH_DAYS = 7
+
+# Настройки таблицы слов
+TABLE_PAGE_SIZE = 200  # Строк, подгружаемых за один fetchMore
+TABLE_CACHED_PAGES = 20  # Страниц, одновременно хранимых в памяти
\ No newline at end of file
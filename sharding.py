@@ -0,0 +1,401 @@
+import heapq
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Word, UserProgress, ImportResult, ReviewState, WordChange
+from database import DatabaseManager
+from exceptions import DatabaseError
+import settings
+
+# Шаг глобальных ID: глобальный ID = локальный ID * SHARD_ID_STRIDE + номер шарда.
+# Номер шарда - позиция языка в списке, поэтому языков не больше шага.
+SHARD_ID_STRIDE = 32
+
+
+def _page_order(word: Word) -> Tuple[Any, int]:
+    return (word.created_ts, word.id)
+
+
+def _streaks(days: Iterable[str]) -> Tuple[int, int]:
+    """Текущая (по сегодня или вчера) и самая длинная серия дней подряд"""
+    current = longest = 0
+    previous = None
+    for day in sorted(date.fromisoformat(day) for day in days):
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+    if previous is None or previous < date.today() - timedelta(days=1):
+        current = 0
+    return current, longest
+
+
+def _sum_by_date(parts: List[List[dict]]) -> List[dict]:
+    """Сложение статистик шардов по полю date"""
+    totals: Dict[str, dict] = {}
+    for stats in parts:
+        for stat in stats:
+            total = totals.get(stat['date'])
+            if total is None:
+                totals[stat['date']] = dict(stat)
+            else:
+                for name, value in stat.items():
+                    if name != 'date':
+                        total[name] += value
+    return [totals[day] for day in sorted(totals)]
+
+
+class ShardedDatabaseManager:
+    """Хранилище с отдельным файлом SQLite на каждый язык
+
+    Шард языка открывается при первом обращении: при записи файл
+    создается, при чтении участвуют только уже существующие шарды.
+    Запросы по всем языкам выполняются параллельно в пуле потоков,
+    результаты объединяются в порядке, который дает DatabaseManager.
+
+    ID слов глобальные: номер шарда закодирован в младших разрядах
+    (см. SHARD_ID_STRIDE), поэтому по ID сразу известен файл, а порядок
+    ID внутри шарда совпадает с порядком локальных ID. Каждый шард -
+    обычный DatabaseManager со своей схемой, миграциями и счетчиками.
+    Транзакции не охватывают несколько шардов: пакетная вставка
+    фиксируется по шардам. В режиме read_only шарды открываются только
+    для чтения (mode=ro), а каталог и новые файлы не создаются.
+    """
+
+    def __init__(self, shard_dir: Optional[str] = None,
+                 languages: Optional[List[str]] = None, read_only: bool = False,
+                 **manager_options):
+        self.shard_dir = Path(shard_dir if shard_dir is not None else settings.DB_SHARD_DIR)
+        self.languages = list(languages if languages is not None else settings.SUPPORTED_LANGUAGES)
+        if len(self.languages) > SHARD_ID_STRIDE:
+            raise DatabaseError(f"Слишком много языков для шардирования: {len(self.languages)}")
+        self.read_only = read_only
+        self._manager_options = dict(manager_options, read_only=read_only)
+        self._shards: Dict[int, DatabaseManager] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[WordChange], None]] = []
+        self._pool = ThreadPoolExecutor(
+            max_workers=settings.DB_SHARD_THREADS, thread_name_prefix="shard"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Шарды и ID
+
+    def shard_path(self, language: str) -> Path:
+        """Файл шарда языка"""
+        return self.shard_dir / f"{language.lower()}.db"
+
+    def _shard_index(self, language: str) -> int:
+        try:
+            return self.languages.index(language)
+        except ValueError:
+            raise DatabaseError(f"Язык '{language}' не поддерживается хранилищем")
+
+    def _shard(self, index: int) -> DatabaseManager:
+        """Шард по номеру; файл создается при первом обращении"""
+        with self._lock:
+            shard = self._shards.get(index)
+            if shard is None:
+                if not self.read_only:
+                    self.shard_dir.mkdir(parents=True, exist_ok=True)
+                shard = DatabaseManager(
+                    str(self.shard_path(self.languages[index])), **self._manager_options
+                )
+                shard.add_listener(lambda change: self._forward(index, change))
+                self._shards[index] = shard
+            return shard
+
+    def _existing_shards(self) -> List[Tuple[int, DatabaseManager]]:
+        """Открытые шарды и шарды, файлы которых уже есть на диске"""
+        return [
+            (index, self._shard(index))
+            for index, language in enumerate(self.languages)
+            if index in self._shards or os.path.exists(self.shard_path(language))
+        ]
+
+    @staticmethod
+    def global_id(index: int, local_id: int) -> int:
+        return local_id * SHARD_ID_STRIDE + index
+
+    def _locate(self, word_id: int) -> Tuple[DatabaseManager, int]:
+        """Шард и локальный ID по глобальному ID"""
+        index, local_id = word_id % SHARD_ID_STRIDE, word_id // SHARD_ID_STRIDE
+        if index >= len(self.languages):
+            raise DatabaseError(f"Слово с ID {word_id} не найдено")
+        return self._shard(index), local_id
+
+    def _globalize(self, index: int, words: List[Word]) -> List[Word]:
+        for word in words:
+            word.id = self.global_id(index, word.id)
+        return words
+
+    def _fan_out(self, call: Callable[[int, DatabaseManager], Any]) -> List[Any]:
+        """Параллельный вызов для всех существующих шардов, результаты по порядку шардов"""
+        shards = self._existing_shards()
+        if len(shards) == 1:
+            return [call(*shards[0])]
+        futures = [self._pool.submit(call, index, shard) for index, shard in shards]
+        return [future.result() for future in futures]
+
+    # Подписки
+
+    def add_listener(self, listener: Callable[[WordChange], None]):
+        """Подписка на изменения слов во всех шардах"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[WordChange], None]):
+        """Отписка от изменений слов"""
+        self._listeners.remove(listener)
+
+    def _forward(self, index: int, change: WordChange):
+        """Передача изменения шарда подписчикам с глобальными ID"""
+        words = {id(word): word for word in (change.word, change.previous) if word is not None}
+        for word in words.values():
+            if word.id is not None:
+                word.id = self.global_id(index, word.id)
+        for listener in list(self._listeners):
+            listener(change)
+
+    # Запись
+
+    def add_word(self, word: Word) -> int:
+        """Добавление слова в шард его языка"""
+        index = self._shard_index(word.language)
+        return self.global_id(index, self._shard(index).add_word(word))
+
+    def add_words(self, words: Iterable[Word]) -> ImportResult:
+        """Пакетное добавление слов: пачки раскладываются по шардам языков
+
+        В каждом затронутом шарде открыта одна транзакция на все пачки;
+        шарды фиксируются вместе после разбора всех слов, поэтому ошибка
+        или отмена на середине не оставляет записанных пачек.
+        """
+        result = ImportResult()
+        buckets: Dict[int, List[Word]] = defaultdict(list)
+
+        with ExitStack() as transactions:
+            opened = set()
+
+            def flush(index: int):
+                shard = self._shard(index)
+                if index not in opened:
+                    transactions.enter_context(shard.transaction())
+                    opened.add(index)
+                part = shard.add_words(buckets.pop(index))
+                result.inserted += part.inserted
+                result.skipped += part.skipped
+
+            for word in words:
+                index = self._shard_index(word.language)
+                buckets[index].append(word)
+                if len(buckets[index]) >= settings.BULK_CHUNK_SIZE:
+                    flush(index)
+            for index in list(buckets):
+                flush(index)
+        return result
+
+    def delete_word(self, word_id: int) -> WordChange:
+        """Удаление слова по глобальному ID"""
+        shard, local_id = self._locate(word_id)
+        return shard.delete_word(local_id)
+
+    def mark_as_learned(self, word_id: int) -> WordChange:
+        """Отметить слово как изученное"""
+        shard, local_id = self._locate(word_id)
+        return shard.mark_as_learned(local_id)
+
+    def _group_ids(self, word_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """Локальные ID, сгруппированные по номеру шарда"""
+        by_shard: Dict[int, List[int]] = defaultdict(list)
+        for word_id in word_ids:
+            if word_id % SHARD_ID_STRIDE < len(self.languages):
+                by_shard[word_id % SHARD_ID_STRIDE].append(word_id // SHARD_ID_STRIDE)
+        return by_shard
+
+    def delete_words(self, word_ids: Iterable[int]) -> int:
+        """Удаление слов по списку глобальных ID: один запрос на шард"""
+        return sum(self._shard(index).delete_words(local_ids)
+                   for index, local_ids in self._group_ids(word_ids).items())
+
+    def mark_as_learned_many(self, word_ids: Iterable[int]) -> int:
+        """Отметить слова как изученные: один запрос на шард"""
+        return sum(self._shard(index).mark_as_learned_many(local_ids)
+                   for index, local_ids in self._group_ids(word_ids).items())
+
+    def record_review(self, word_id: int, quality: int,
+                      reviewed_at: Optional[datetime] = None) -> ReviewState:
+        """Запись ответа на карточку в шарде слова"""
+        shard, local_id = self._locate(word_id)
+        state = shard.record_review(local_id, quality, reviewed_at)
+        state.word_id = word_id
+        return state
+
+    def rebuild_stats(self) -> UserProgress:
+        """Пересчет счетчиков прогресса во всех шардах"""
+        self._fan_out(lambda index, shard: shard.rebuild_stats())
+        return self.get_user_progress()
+
+    def clear_words(self):
+        """Удаление слов во всех шардах"""
+        self._fan_out(lambda index, shard: shard.clear_words())
+
+    # Чтение
+
+    def get_word(self, word_id: int) -> Word:
+        """Слово по глобальному ID"""
+        shard, local_id = self._locate(word_id)
+        word = shard.get_word(local_id)
+        word.id = word_id
+        return word
+
+    def get_words(self, word_ids: Iterable[int]) -> List[Word]:
+        """Слова по списку глобальных ID в том же порядке"""
+        word_ids = list(word_ids)
+        found = {}
+        for index, local_ids in self._group_ids(word_ids).items():
+            for word in self._globalize(index, self._shard(index).get_words(local_ids)):
+                found[word.id] = word
+        return [found[word_id] for word_id in word_ids if word_id in found]
+
+    def get_all_words(self) -> List[Word]:
+        """Все слова в порядке get_all_words одного файла"""
+        parts = self._fan_out(
+            lambda index, shard: self._globalize(index, shard.get_all_words())
+        )
+        return list(heapq.merge(*parts, key=_page_order, reverse=True))
+
+    def get_words_page(self, after: Optional[Tuple[Any, int]] = None,
+                       limit: int = settings.PAGE_SIZE) -> List[Word]:
+        """Страница слов после ключа (created_at, глобальный ID)"""
+        def page(index: int, shard: DatabaseManager) -> List[Word]:
+            local_after = None
+            if after is not None:
+                # Локальные ID шарда, глобальный ID которых меньше ключа
+                created, word_id = after
+                local_after = (created, -((index - word_id) // SHARD_ID_STRIDE))
+            return self._globalize(index, shard.get_words_page(local_after, limit))
+
+        parts = self._fan_out(page)
+        merged = heapq.merge(*parts, key=_page_order, reverse=True)
+        return [word for _, word in zip(range(limit), merged)]
+
+    def iter_words(self, after: Optional[Tuple[Any, int]] = None,
+                   page_size: int = settings.PAGE_SIZE) -> Iterator[Word]:
+        """Ленивый обход слов всех шардов постранично"""
+        while True:
+            page = self.get_words_page(after, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = self.page_key(page[-1])
+
+    def iter_word_batches(self, batch_size: int = settings.BULK_CHUNK_SIZE) -> Iterator[List[tuple]]:
+        """Обход слов пачками кортежей по шардам (ID глобальные)"""
+        for index, shard in self._existing_shards():
+            for batch in shard.iter_word_batches(batch_size):
+                yield [(self.global_id(index, row[0]),) + tuple(row[1:]) for row in batch]
+
+    page_key = staticmethod(DatabaseManager.page_key)
+
+    def get_words_by_language(self, language: str) -> List[Word]:
+        """Слова языка: запрос только к его шарду"""
+        index = self._shard_index(language)
+        if not os.path.exists(self.shard_path(language)) and index not in self._shards:
+            return []
+        return self._globalize(index, self._shard(index).get_words_by_language(language))
+
+    def search(self, query: str, language: Optional[str] = None,
+               limit: int = settings.SEARCH_LIMIT) -> List[Word]:
+        """Поиск слов: по шарду языка или параллельно по всем шардам
+
+        Результаты шардов чередуются по позиции в выдаче, так что лучшие
+        совпадения каждого языка идут первыми.
+        """
+        if language is not None:
+            index = self._shard_index(language)
+            if not os.path.exists(self.shard_path(language)) and index not in self._shards:
+                return []
+            return self._globalize(index, self._shard(index).search(query, None, limit))
+
+        parts = self._fan_out(
+            lambda index, shard: self._globalize(index, shard.search(query, None, limit))
+        )
+        found = [word for rank in zip_longest(*parts) for word in rank if word is not None]
+        return found[:limit]
+
+    def get_review_queue(self, limit: int = settings.REVIEW_QUEUE_CACHE) -> List[Tuple[int, int]]:
+        """Ближайшие по сроку карточки всех шардов: пары (due_at, глобальный ID)"""
+        parts = self._fan_out(lambda index, shard: [
+            (due_at, self.global_id(index, word_id))
+            for due_at, word_id in shard.get_review_queue(limit)
+        ])
+        return [pair for _, pair in zip(range(limit), heapq.merge(*parts))]
+
+    def get_review_state(self, word_id: int) -> ReviewState:
+        """Состояние интервального повторения слова"""
+        shard, local_id = self._locate(word_id)
+        state = shard.get_review_state(local_id)
+        state.word_id = word_id
+        return state
+
+    def get_user_progress(self) -> UserProgress:
+        """Сумма счетчиков шардов
+
+        Серии дней шардов не складываются (активность в разных языках
+        в соседние дни - одна серия), поэтому они считаются по объединению
+        дней активности всех шардов.
+        """
+        def progress_and_days(index: int, shard: DatabaseManager):
+            return shard.get_user_progress(), shard.get_activity_calendar(None)
+
+        progress = UserProgress()
+        active_days = set()
+        for part, calendar in self._fan_out(progress_and_days):
+            progress.total_words += part.total_words
+            progress.learned_words += part.learned_words
+            if part.last_active and (progress.last_active is None
+                                     or part.last_active > progress.last_active):
+                progress.last_active = part.last_active
+            active_days.update(calendar)
+        progress.streak_days, progress.longest_streak = _streaks(active_days)
+        return progress
+
+    def get_activity_calendar(self, days: Optional[int] = 365) -> Dict[str, int]:
+        """Число повторений по дням во всех шардах"""
+        return {stat['date']: stat['reviews'] for stat in self.get_review_activity(days)}
+
+    def get_daily_stats(self, days: int = 7) -> List[dict]:
+        """Дневная статистика, просуммированная по шардам"""
+        return _sum_by_date(self._fan_out(lambda index, shard: shard.get_daily_stats(days)))
+
+    def get_review_activity(self, days: Optional[int] = None,
+                            weekly: bool = False) -> List[dict]:
+        """Активность повторений, просуммированная по шардам"""
+        return _sum_by_date(self._fan_out(
+            lambda index, shard: shard.get_review_activity(days, weekly)
+        ))
+
+    def stats(self) -> dict:
+        """Статистика профилирования по шардам"""
+        with self._lock:
+            shards = list(self._shards.items())
+        return {self.languages[index]: shard.stats() for index, shard in shards}
+
+    def close(self):
+        """Закрытие пула потоков и всех шардов"""
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            shards, self._shards = list(self._shards.values()), {}
+        for shard in shards:
+            shard.close()
@@ -0,0 +1,366 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Set
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from models import Word, WordChange
+import settings
+
+
+class _Page:
+    """Страница строк таблицы: ключ начала выборки и кэш слов"""
+    __slots__ = ('start', 'end', 'count', 'words', 'version')
+
+    def __init__(self, start, end, words: List[Word]):
+        self.start = start  # ключ (created_at, id), после которого начинается страница
+        self.end = end  # ключ последнего слова страницы
+        self.count = len(words)
+        self.words: Optional[List[Word]] = words
+        self.version = 0  # меняется при вставке и удалении строк страницы
+
+
+class WordTableModel(QAbstractTableModel):
+    """Модель таблицы слов с ленивой постраничной загрузкой из БД
+
+    Строки подгружаются страницами через canFetchMore/fetchMore по мере
+    прокрутки. В памяти хранится лишь скользящее окно из последних
+    использованных страниц, остальные перечитываются по ключу при обращении.
+    С executor перечитывание идет в фоне: до загрузки строки показывают
+    LOADING_TEXT, после нее модель сообщает dataChanged.
+    """
+
+    HEADERS = ["ID", "Слово", "Перевод", "Язык", "Сложность", "Последний повтор"]
+    LOADING_TEXT = "…"
+
+    def __init__(self, db, page_size: int = settings.TABLE_PAGE_SIZE,
+                 cached_pages: int = settings.TABLE_CACHED_PAGES,
+                 executor=None, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.executor = executor  # DbExecutor для загрузки страниц в фоне
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self._clear()
+
+    def _clear(self):
+        """Сброс загруженных страниц"""
+        self._pages: List[_Page] = []
+        self._offsets: List[int] = []  # номер первой строки каждой страницы
+        self._cache = OrderedDict()  # страницы со словами в памяти (LRU)
+        self._row_count = 0
+        self._exhausted = False
+        self._fetching = False
+        self._loading: Set[_Page] = set()  # страницы, перечитываемые в фоне
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        word = self.word_at(index.row())
+        if word is None:
+            return self.LOADING_TEXT  # Страница еще загружается
+
+        column = index.column()
+        if column == 0:
+            return str(word.id or "")
+        if column == 1:
+            return word.word
+        if column == 2:
+            return word.translation
+        if column == 3:
+            return word.language
+        if column == 4:
+            return str(word.difficulty)
+        if column == 5:
+            return (word.last_reviewed.strftime("%Y-%m-%d %H:%M")
+                    if word.last_reviewed else "Не изучено")
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Загрузка следующей страницы слов"""
+        if not self.canFetchMore(parent) or self._fetching:
+            return
+
+        after = self._pages[-1].end if self._pages else None
+        if self.executor is None:
+            self._append_page(after, self.db.get_words_page(after, self.page_size))
+            return
+
+        self._fetching = True
+        self.executor.submit(
+            self.db.get_words_page, after, self.page_size,
+            key=f"table-page-{id(self)}",
+            on_result=lambda words: self._append_page(after, words),
+            on_error=self._on_fetch_error
+        )
+
+    def _append_page(self, after, words: List[Word]):
+        """Добавление загруженной страницы в конец таблицы"""
+        self._fetching = False
+        if len(words) < self.page_size:
+            self._exhausted = True
+        if not words:
+            return
+
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(words) - 1)
+        self._pages.append(_Page(after, self.db.page_key(words[-1]), words))
+        self._offsets.append(first)
+        self._row_count += len(words)
+        self._touch(self._pages[-1])
+        self.endInsertRows()
+
+    def _on_fetch_error(self, error: Exception):
+        """Ошибка фоновой загрузки страницы"""
+        self._fetching = False
+        self.executor.failed.emit(error)
+
+    def refresh(self):
+        """Полная перезагрузка модели с первой страницы"""
+        self.beginResetModel()
+        self._clear()
+        self.endResetModel()
+        self.fetchMore()
+
+    def show_words(self, words: List[Word]):
+        """Показ готового списка слов (например, результатов поиска)
+
+        Список занимает одну страницу, которая всегда остается в кэше,
+        и не дополняется через fetchMore.
+        """
+        self.beginResetModel()
+        self._clear()
+        self._exhausted = True
+        if words:
+            page = _Page(None, self.db.page_key(words[-1]), list(words))
+            self._pages.append(page)
+            self._offsets.append(0)
+            self._row_count = page.count
+            self._touch(page)
+        self.endResetModel()
+
+    def word_at(self, row: int) -> Optional[Word]:
+        """Слово в строке таблицы (None, пока страница загружается в фоне)"""
+        if not 0 <= row < self._row_count:
+            return None
+
+        page_no = bisect_right(self._offsets, row) - 1
+        words = self._page_words(self._pages[page_no])
+        if words is None:
+            return None
+        offset = row - self._offsets[page_no]
+        return words[offset] if offset < len(words) else None
+
+    def words_at(self, rows: Iterable[int], on_result: Callable[[List[Word]], None]):
+        """Слова строк (например, выделенных) в порядке rows
+
+        Вытесненные страницы дочитываются в фоне без помещения в кэш,
+        чтобы большое выделение не вытесняло видимые строки. Если все
+        страницы в памяти или executor не задан, on_result вызывается сразу.
+        """
+        targets = []
+        for row in rows:
+            if 0 <= row < self._row_count:
+                page_no = bisect_right(self._offsets, row) - 1
+                targets.append((self._pages[page_no], row - self._offsets[page_no]))
+        missing = list(dict.fromkeys(page for page, _ in targets if page.words is None))
+        requests = [(page.start, page.count) for page in missing]
+
+        def collect(pages: List[List[Word]]):
+            loaded = dict(zip(missing, pages))
+            words = []
+            for page, offset in targets:
+                page_words = page.words if page.words is not None else loaded.get(page)
+                if page_words is not None and offset < len(page_words):
+                    words.append(page_words[offset])
+            on_result(words)
+
+        if not missing:
+            collect([])
+        elif self.executor is None:
+            collect(self._read_pages(requests))
+        else:
+            self.executor.submit(self._read_pages, requests,
+                                 key=f"table-rows-{id(self)}", on_result=collect)
+
+    def _read_pages(self, requests: List[tuple]) -> List[List[Word]]:
+        """Выборка страниц по парам (ключ начала, размер)"""
+        return [self.db.get_words_page(start, count) for start, count in requests]
+
+    def apply_change(self, change: WordChange):
+        """Точечное обновление строк по изменению из БД"""
+        if change.action == WordChange.ADDED:
+            self.insert_word(change.word)
+        elif change.action == WordChange.DELETED:
+            self.remove_word(change.word)
+        elif change.action == WordChange.UPDATED:
+            self.update_word(change.word)
+        else:
+            self.refresh()
+
+    def insert_word(self, word: Word):
+        """Вставка новой строки на ее место в порядке сортировки"""
+        key = self.db.page_key(word)
+        page_no = self._find_page(key)
+        if page_no is None:
+            if self._pages and not self._exhausted:
+                return  # Слово попадет в еще не загруженную часть таблицы
+            if not self._pages:
+                self._pages.append(_Page(None, key, []))
+                self._offsets.append(0)
+            page_no = len(self._pages) - 1
+            self._pages[page_no].end = key
+
+        page = self._pages[page_no]
+        if page.words is not None:
+            offset = sum(1 for other in page.words
+                         if other.id != word.id and self.db.page_key(other) > key)
+        else:
+            # Слов вытесненной страницы в памяти нет: строка добавляется в ее
+            # конец, а порядок восстановит перечитывание страницы при обращении
+            offset = page.count
+
+        row = self._offsets[page_no] + offset
+        self.beginInsertRows(QModelIndex(), row, row)
+        if page.words is not None:
+            page.words.insert(offset, word)
+        page.count += 1
+        page.version += 1
+        self._shift_offsets(page_no, 1)
+        self.endInsertRows()
+
+    def remove_word(self, word: Word):
+        """Удаление строки слова, уже удаленного из БД"""
+        key = self.db.page_key(word)
+        page_no = self._find_page(key)
+        if page_no is None:
+            return
+
+        page = self._pages[page_no]
+        if page.words is None:
+            # Как и при вставке: убираем последнюю строку вытесненной страницы
+            offset = page.count - 1
+        else:
+            offset = next(
+                (i for i, other in enumerate(page.words) if other.id == word.id), None
+            )
+            if offset is None:
+                return
+
+        row = self._offsets[page_no] + offset
+        self.beginRemoveRows(QModelIndex(), row, row)
+        if page.words is not None:
+            del page.words[offset]
+        page.count -= 1
+        page.version += 1
+        self._shift_offsets(page_no, -1)
+        if not page.count:
+            # Пустая страница не нужна: ее начало переходит к следующей
+            if page_no + 1 < len(self._pages):
+                self._pages[page_no + 1].start = page.start
+            del self._pages[page_no]
+            del self._offsets[page_no]
+            self._cache.pop(page, None)
+            self._loading.discard(page)
+        self.endRemoveRows()
+
+    def update_word(self, word: Word):
+        """Обновление данных строки без изменения ее позиции"""
+        page_no = self._find_page(self.db.page_key(word))
+        if page_no is None:
+            return
+
+        page = self._pages[page_no]
+        if page.words is None:
+            return  # Страница будет перечитана при обращении
+        for offset, other in enumerate(page.words):
+            if other.id == word.id:
+                page.words[offset] = word
+                row = self._offsets[page_no] + offset
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, self.columnCount() - 1)
+                )
+                return
+
+    def _find_page(self, key) -> Optional[int]:
+        """Номер загруженной страницы, в диапазон которой попадает ключ"""
+        for page_no, page in enumerate(self._pages):
+            if key >= page.end:
+                return page_no
+        return None
+
+    def _shift_offsets(self, page_no: int, delta: int):
+        """Сдвиг номеров строк страниц после вставки или удаления"""
+        for i in range(page_no + 1, len(self._offsets)):
+            self._offsets[i] += delta
+        self._row_count += delta
+
+    def _page_words(self, page: _Page) -> Optional[List[Word]]:
+        """Слова страницы: из кэша или повторной выборкой по ключу
+
+        С executor выборка запускается в фоне и возвращается None.
+        """
+        if page.words is None:
+            if self.executor is not None:
+                self._load_page(page)
+                return None
+            page.words = self.db.get_words_page(page.start, page.count)
+        self._touch(page)
+        return page.words
+
+    def _load_page(self, page: _Page):
+        """Фоновое перечитывание вытесненной страницы"""
+        if page in self._loading:
+            return
+        self._loading.add(page)
+        version = page.version
+        self.executor.submit(
+            self.db.get_words_page, page.start, page.count,
+            on_result=lambda words: self._on_page_loaded(page, version, words),
+            on_error=lambda error: self._on_page_error(page, error)
+        )
+
+    def _on_page_loaded(self, page: _Page, version: int, words: List[Word]):
+        """Загруженная страница: слова в кэш и перерисовка ее строк"""
+        if page not in self._loading:
+            return  # Модель сброшена или страница удалена
+        self._loading.discard(page)
+        if page.version != version:
+            # Пока шла выборка, строки страницы изменились: читаем заново
+            self._load_page(page)
+            return
+
+        page.words = words
+        self._touch(page)
+        first = self._offsets[self._pages.index(page)]
+        self.dataChanged.emit(
+            self.index(first, 0), self.index(first + page.count - 1, self.columnCount() - 1)
+        )
+
+    def _on_page_error(self, page: _Page, error: Exception):
+        """Ошибка фонового перечитывания страницы"""
+        self._loading.discard(page)
+        self.executor.failed.emit(error)
+
+    def _touch(self, page: _Page):
+        """Отметка использования страницы и вытеснение старых из кэша"""
+        self._cache[page] = None
+        self._cache.move_to_end(page)
+        while len(self._cache) > self.cached_pages:
+            evicted, _ = self._cache.popitem(last=False)
+            evicted.words = None
@@ -0,0 +1,20 @@
+import pytest
+from PySide6.QtWidgets import QApplication
+from database import DatabaseManager
+
+# Создаем QApplication один раз для всех тестов
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+@pytest.fixture
+def db_manager():
+    """Фикстура для создания БД в памяти"""
+    manager = DatabaseManager(":memory:")
+    yield manager
+    
+    # Очистка после тестов
+    manager.close()
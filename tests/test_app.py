@@ -1,34 +1,27 @@
 import pytest
 from PySide6.QtWidgets import QApplication
 from app import LanguageLearningApp
-import tempfile
-import os
 
-# Создаем QApplication один раз для всех тестов
-@pytest.fixture(scope="session")
-def qapp():
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
+def wait_idle(app):
+    """Ожидание завершения фоновых операций с БД и доставки результатов"""
+    while app.executor.busy:
+        app.executor.wait()
+        QApplication.processEvents()
 
 class TestLanguageLearningApp:
     @pytest.fixture
     def app(self, qapp, monkeypatch):
-        """Фикстура для создания приложения с временной БД"""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            db_path = tmp.name
-        
+        """Фикстура для создания приложения с БД в памяти"""
         # Мокаем путь к БД
         import settings
-        monkeypatch.setattr(settings, 'DATABASE_PATH', db_path)
+        monkeypatch.setattr(settings, 'DATABASE_PATH', ":memory:")
         
         app_instance = LanguageLearningApp()
+        wait_idle(app_instance)
         yield app_instance
         
         # Очистка
-        app_instance.db._get_connection().close()
-        os.unlink(db_path)
+        app_instance.db.close()
         app_instance.close()
     
     def test_app_creation(self, app):
@@ -39,7 +32,7 @@ class TestLanguageLearningApp:
     def test_table_exists(self, app):
         """Тест наличия таблицы"""
         assert app.table is not None
-        assert app.table.columnCount() == 6
+        assert app.table.model().columnCount() == 6
     
     def test_input_fields_exist(self, app):
         """Тест наличия полей ввода"""
@@ -58,4 +51,143 @@ class TestLanguageLearningApp:
     def test_add_button_text(self, app):
         """Тест текста кнопки добавления"""
         assert app.add_button.text() == "Добавить слово"
-    
\ No newline at end of file
+        
+    def test_add_word_updates_incrementally(self, app, monkeypatch):
+        """Тест обновления таблицы и статистики без полной перезагрузки"""
+        from PySide6.QtWidgets import QMessageBox
+        monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+        monkeypatch.setattr(app, "_load_data", lambda: pytest.fail("полная перезагрузка"))
+        monkeypatch.setattr(app, "_show_error", pytest.fail)
+        
+        app.word_input.setText("Hello")
+        app.translation_input.setText("Привет")
+        app._add_word()
+        wait_idle(app)
+        
+        assert app.word_model.rowCount() == 1
+        assert app.word_model.word_at(0).word == "Hello"
+        assert app.total_words_label.text() == "Всего слов: 1"
+        assert app._daily_stats[-1]['added'] == 1
+    
+    def test_multi_select_batch_operations(self, app, monkeypatch):
+        """Тест пакетных операций над несколькими выделенными строками"""
+        from PySide6.QtWidgets import QMessageBox
+        from models import Word
+        monkeypatch.setattr(QMessageBox, "question", lambda *args: QMessageBox.Yes)
+        app.db.add_words(Word(word=f"w{i}", translation=f"с{i}", language="English")
+                         for i in range(5))
+        wait_idle(app)
+        
+        app.table.selectAll()
+        assert len(app.selected_word_ids) == 5
+        app._mark_as_learned()
+        wait_idle(app)
+        assert app.db.get_user_progress().learned_words == 5
+        
+        app.table.selectAll()
+        app._delete_word()
+        wait_idle(app)
+        assert app.word_model.rowCount() == 0
+        assert app.selected_word_ids == []
+        assert not app.delete_button.isEnabled()
+    
+    def test_busy_indicator(self, app):
+        """Тест индикатора фоновых операций"""
+        app.show()
+        app._update_graph()
+        assert app.busy_indicator.isVisible()
+        
+        wait_idle(app)
+        assert not app.busy_indicator.isVisible()
+    
+    def test_stale_refresh_cancelled(self, app, monkeypatch):
+        """Тест отмены устаревшего обновления"""
+        loaded = []
+        monkeypatch.setattr(app, "_on_data_loaded", loaded.append)
+        
+        app._load_data()
+        app._load_data()
+        wait_idle(app)
+        
+        assert len(loaded) == 1
+    
+    def test_search_filters_table(self, app):
+        """Тест поиска слов из строки поиска"""
+        from models import Word
+        app.db.add_words([
+            Word(word="Hello", translation="Привет", language="English"),
+            Word(word="Hola", translation="Привет", language="Spanish"),
+        ])
+        wait_idle(app)
+        
+        app.search_input.setText("hel")
+        app._run_search()
+        wait_idle(app)
+        assert [app.word_model.word_at(row).word
+                for row in range(app.word_model.rowCount())] == ["Hello"]
+        
+        app.search_input.clear()
+        app._run_search()
+        wait_idle(app)
+        assert app.word_model.rowCount() == 2
+    
+    def test_import_words(self, app, monkeypatch, tmp_path):
+        """Тест импорта слов из файла через меню"""
+        from PySide6.QtWidgets import QFileDialog
+        path = tmp_path / "words.jsonl"
+        path.write_text('{"word": "Hello", "translation": "Привет"}\n', encoding="utf-8")
+        monkeypatch.setattr(QFileDialog, "getOpenFileName",
+                            lambda *args, **kwargs: (str(path), ""))
+        
+        app._import_words()
+        wait_idle(app)
+        assert app.db.get_user_progress().total_words == 1
+        assert app.word_model.rowCount() == 1
+    
+    def test_read_only_viewer(self, qapp, monkeypatch, tmp_path):
+        """Тест режима просмотра БД только для чтения"""
+        import settings
+        from database import DatabaseManager
+        from models import Word
+        db_path = str(tmp_path / "words.db")
+        with DatabaseManager(db_path) as manager:
+            manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        monkeypatch.setattr(settings, 'DATABASE_PATH', db_path)
+        monkeypatch.setattr(settings, 'DB_READ_ONLY', True)
+        
+        viewer = LanguageLearningApp()
+        try:
+            wait_idle(viewer)
+            assert viewer.word_model.rowCount() == 1
+            assert not viewer.add_button.isEnabled()
+            assert not viewer.import_action.isEnabled()
+            viewer.table.selectAll()
+            assert not viewer.delete_button.isEnabled()
+        finally:
+            viewer.close()
+    
+    def test_graph_range(self, app):
+        """Тест смены периода графика"""
+        from models import Word
+        app.db.add_word(Word(word="Hello", translation="Привет", language="English"))
+        wait_idle(app)
+        
+        app._ensure_chart()
+        app.graph_range_combo.setCurrentIndex(app.graph_range_combo.findData(30))
+        wait_idle(app)
+        
+        assert app.graph_days == 30
+        assert "30" in app.graph_label.text()
+        assert "30" in app.canvas.axes.get_title()
+    
+    def test_chart_created_after_show(self, app):
+        """Тест отложенного создания графика при первом показе окна"""
+        assert app.chart is None
+        ready = []
+        app.chart_ready.connect(lambda: ready.append(True))
+        
+        app.show()
+        QApplication.processEvents()
+        
+        assert ready == [True]
+        assert app.canvas is not None
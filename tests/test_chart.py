@@ -0,0 +1,45 @@
+import pytest
+from datetime import date, timedelta
+from chart import MplCanvas, ProgressChart, MAX_DATE_LABELS
+
+TODAY = date(2024, 3, 10)
+
+def day(offset):
+    """Дата за offset дней до TODAY в формате статистики"""
+    return (TODAY - timedelta(days=offset)).isoformat()
+
+class TestProgressChart:
+    @pytest.fixture
+    def chart(self, qapp):
+        """График на холсте без окна"""
+        return ProgressChart(MplCanvas(width=6, height=4, dpi=100))
+
+    def test_unchanged_stats_not_redrawn(self, chart):
+        """Тест пропуска перерисовки при тех же данных"""
+        stats = [{'date': day(1), 'added': 3, 'learned': 1}]
+        assert chart.update(stats, 7, TODAY)
+        assert not chart.update([dict(stat) for stat in stats], 7, TODAY)
+
+    def test_bars_updated_in_place(self, chart):
+        """Тест обновления высот столбцов без их пересоздания"""
+        chart.update([{'date': day(1), 'added': 3, 'learned': 1}], 7, TODAY)
+        bars = chart._added_bars
+
+        assert chart.update([{'date': day(1), 'added': 5, 'learned': 1}], 7, TODAY)
+        assert chart._added_bars is bars
+        assert bars[6].get_height() == 5
+        assert len(bars) == 8
+
+    def test_range_change_rebuilds(self, chart):
+        """Тест перестроения столбцов при смене периода"""
+        stats = [{'date': day(1), 'added': 3, 'learned': 1}]
+        chart.update(stats, 7, TODAY)
+        chart.update(stats, 365, TODAY)
+
+        assert len(chart._added_bars) == 366
+        assert len(chart.canvas.axes.get_xticks()) <= MAX_DATE_LABELS
+
+    def test_empty_stats(self, chart):
+        """Тест заглушки при отсутствии данных"""
+        chart.update([], 7, TODAY)
+        assert chart.canvas.axes.texts[0].get_text() == 'Нет данных'
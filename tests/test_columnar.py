@@ -0,0 +1,89 @@
+import pytest
+import time
+import tempfile
+import os
+from datetime import datetime, timedelta
+from models import Word
+from database import DatabaseManager
+from columnar import WordColumns, NO_TIMESTAMP
+
+class TestWordColumns:
+    @pytest.fixture
+    def db_manager(self, db_manager):
+        """БД в памяти со словами разных языков, сложности и дат"""
+        now = datetime.now()
+        db_manager.add_words([
+            Word(word="hello", translation="привет", language="English",
+                 difficulty=1, created_at=now),
+            Word(word="world", translation="мир", language="English",
+                 difficulty=5, created_at=now, last_reviewed=now),
+            Word(word="hola", translation="привет", language="Spanish",
+                 difficulty=4, created_at=now - timedelta(days=2)),
+            Word(word="salut", translation="привет", language="Klingon",
+                 difficulty=2, created_at=now - timedelta(days=30)),
+        ])
+        return db_manager
+    
+    def test_snapshot_columns(self, db_manager):
+        """Тест загрузки снимка"""
+        columns = WordColumns.from_database(db_manager)
+        
+        assert len(columns) == 4
+        assert "Klingon" in columns.languages
+        assert (columns.last_reviewed == NO_TIMESTAMP).sum() == 3
+    
+    def test_count_by_language(self, db_manager):
+        """Тест группировки по языку"""
+        columns = WordColumns.from_database(db_manager)
+        
+        assert columns.count_by_language()["English"] == 2
+        assert columns.count_by_language(learned_only=True)["English"] == 1
+        assert columns.count_by_language()["Klingon"] == 1
+        assert columns.count_by_language()["French"] == 0
+    
+    def test_count_by_difficulty(self, db_manager):
+        """Тест группировки по сложности"""
+        columns = WordColumns.from_database(db_manager)
+        
+        assert columns.count_by_difficulty() == {1: 1, 2: 1, 3: 0, 4: 1, 5: 1}
+        assert columns.language_difficulty_matrix().sum() == 4
+    
+    def test_daily_stats_match_database(self, db_manager):
+        """Тест совпадения дневной статистики с SQL-версией"""
+        columns = WordColumns.from_database(db_manager)
+        
+        assert columns.daily_stats(days=7) == db_manager.get_daily_stats(days=7)
+        assert len(columns.daily_stats(days=None)) == 3
+    
+    def test_daily_stats_across_dst(self, monkeypatch):
+        """Тест: зимние и летние записи попадают в свои дни при летнем времени"""
+        monkeypatch.setenv("TZ", "Europe/Berlin")
+        time.tzset()
+        try:
+            with DatabaseManager(":memory:") as manager:
+                manager.add_words(
+                    Word(word=f"w{i}", translation="слово", language="English",
+                         created_at=created)
+                    for i, created in enumerate([
+                        datetime(2024, 1, 15, 23, 30), datetime(2024, 1, 16, 0, 30),
+                        datetime(2024, 7, 15, 23, 30), datetime(2024, 7, 16, 0, 30),
+                    ])
+                )
+                stats = WordColumns.from_database(manager).daily_stats(days=None)
+                assert [day['date'] for day in stats] == \
+                    ["2024-01-15", "2024-01-16", "2024-07-15", "2024-07-16"]
+                assert stats == manager.get_daily_stats(days=10000)
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+    
+    def test_empty_database(self):
+        """Тест снимка пустой БД"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
+            db_path = tmp.name
+        
+        with DatabaseManager(db_path) as manager:
+            columns = WordColumns.from_database(manager)
+            assert len(columns) == 0
+            assert columns.daily_stats() == []
+        os.unlink(db_path)
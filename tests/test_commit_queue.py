@@ -0,0 +1,70 @@
+import pytest
+import tempfile
+import os
+from models import Word, WordChange
+from database import DatabaseManager
+from commit_queue import CommitQueue
+from exceptions import DatabaseError
+
+class TestStorageProfile:
+    def _journal_mode(self, manager):
+        """Текущий режим журнала БД"""
+        with manager._get_connection() as conn:
+            return conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    def test_profiles_applied(self):
+        """Тест применения PRAGMA профиля хранения"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with DatabaseManager(os.path.join(tmp_dir, "fast.db"), profile="fast") as manager:
+                assert self._journal_mode(manager) == "wal"
+                with manager._get_connection() as conn:
+                    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+            with DatabaseManager(os.path.join(tmp_dir, "legacy.db"), profile="legacy") as manager:
+                assert self._journal_mode(manager) == "delete"
+
+    def test_unknown_profile(self):
+        """Тест неизвестного профиля хранения"""
+        with pytest.raises(DatabaseError):
+            DatabaseManager(":memory:", profile="turbo")
+
+class TestCommitQueue:
+    def test_batched_writes(self, db_manager):
+        """Тест выполнения пакета записей с результатами операций"""
+        with CommitQueue(db_manager, max_delay_ms=50) as commits:
+            futures = [
+                commits.submit(db_manager.add_word,
+                               Word(word=f"w{i}", translation=f"п{i}", language="English"))
+                for i in range(100)
+            ]
+            ids = [future.result(timeout=5) for future in futures]
+
+        assert len(set(ids)) == 100
+        assert db_manager.get_user_progress().total_words == 100
+
+    def test_failed_operation_isolated(self, db_manager):
+        """Тест: ошибка одной операции не отменяет остальные"""
+        changes = []
+        db_manager.add_listener(changes.append)
+
+        with CommitQueue(db_manager, max_delay_ms=50) as commits:
+            first = commits.submit(db_manager.add_word,
+                                   Word(word="Hello", translation="Привет", language="English"))
+            duplicate = commits.submit(db_manager.add_word,
+                                       Word(word="Hello", translation="Привет", language="English"))
+            failing = commits.submit(db_manager.mark_as_learned, 12345)
+            commits.flush()
+
+        assert first.result() is not None
+        with pytest.raises(DatabaseError):
+            duplicate.result()
+        with pytest.raises(DatabaseError):
+            failing.result()
+        assert [change.action for change in changes] == [WordChange.ADDED]
+        assert len(db_manager.get_all_words()) == 1
+
+    def test_submit_after_close(self, db_manager):
+        """Тест постановки операции в закрытую очередь"""
+        commits = CommitQueue(db_manager)
+        commits.close()
+        with pytest.raises(DatabaseError):
+            commits.submit(db_manager.get_user_progress)
@@ -1,25 +1,12 @@
 import pytest
 import tempfile
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from models import Word
 from database import DatabaseManager
 from exceptions import DatabaseError
 
 class TestDatabaseManager:
-    @pytest.fixture
-    def db_manager(self):
-        """Фикстура для создания временной БД"""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            db_path = tmp.name
-        
-        manager = DatabaseManager(db_path)
-        yield manager
-        
-        # Очистка после тестов
-        manager._get_connection().close()
-        os.unlink(db_path)
-    
     def test_add_word(self, db_manager):
         """Тест добавления слова"""
         word = Word(
@@ -93,4 +80,457 @@ class TestDatabaseManager:
         
         assert isinstance(progress.total_words, int)
         assert isinstance(progress.learned_words, int)
-        assert isinstance(progress.streak_days, int)
\ No newline at end of file
+        assert isinstance(progress.streak_days, int)
+    
+    def test_progress_counters_follow_changes(self, db_manager):
+        """Тест счетчиков прогресса, которые ведут триггеры"""
+        first = db_manager.add_word(Word(word="One", translation="Один", language="English"))
+        db_manager.add_words([
+            Word(word="Two", translation="Два", language="English", difficulty=4),
+            Word(word="One", translation="Один", language="English"),
+        ])
+        db_manager.mark_as_learned(first)
+        change = db_manager.mark_as_learned(first)
+        
+        progress = db_manager.get_user_progress()
+        assert (progress.total_words, progress.learned_words) == (2, 2)
+        assert change.learned_delta == 0
+        
+        db_manager.delete_word(first)
+        progress = db_manager.get_user_progress()
+        assert (progress.total_words, progress.learned_words) == (1, 1)
+    
+    def test_rebuild_stats(self, db_manager):
+        """Тест пересчета расходящихся счетчиков"""
+        db_manager.add_word(Word(word="One", translation="Один", language="English", difficulty=5))
+        with db_manager._get_connection() as conn:
+            conn.execute("UPDATE user_progress SET total_words = 10, learned_words = 7")
+        
+        progress = db_manager.rebuild_stats()
+        assert (progress.total_words, progress.learned_words) == (1, 1)
+    
+    def test_pooled_connection_reused(self, db_manager):
+        """Тест повторного использования подключения в потоке"""
+        with db_manager._get_connection() as first:
+            pass
+        with db_manager._get_connection() as second:
+            pass
+        
+        assert first is second
+    
+    def test_close_reopens_connection(self, tmp_path):
+        """Тест закрытия пула и повторного открытия подключения"""
+        db_manager = DatabaseManager(str(tmp_path / "test.db"))
+        with db_manager._get_connection() as conn:
+            pass
+        
+        db_manager.close()
+        
+        with pytest.raises(Exception):
+            conn.execute("SELECT 1")
+        assert db_manager.get_user_progress().total_words == 0
+        db_manager.close()
+    
+    def test_connection_per_call_mode(self):
+        """Тест режима без пула подключений"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
+            db_path = tmp.name
+        
+        with DatabaseManager(db_path, pooled=False) as manager:
+            word_id = manager.add_word(
+                Word(word="Test", translation="Тест", language="English", difficulty=1)
+            )
+            assert manager.get_all_words()[0].id == word_id
+        os.unlink(db_path)
+    
+    def test_add_words_bulk(self, db_manager):
+        """Тест пакетного добавления слов"""
+        db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        
+        result = db_manager.add_words([
+            Word(word="Hello", translation="Привет", language="English"),
+            Word(word="Hello", translation="Hola", language="Spanish"),
+            Word(word="Apple", translation="Яблоко", language="English", difficulty=4),
+            Word(word="Apple", translation="Яблоко", language="English", difficulty=4),
+        ])
+        
+        assert result.inserted == 2
+        assert result.skipped == 2
+        assert len(db_manager.get_all_words()) == 3
+        
+        progress = db_manager.get_user_progress()
+        assert progress.total_words == 3
+        assert progress.learned_words == 1
+    
+    def test_add_words_invalid_rolls_back(self, db_manager):
+        """Тест: недопустимая сложность - ошибка, а не пропуск слова"""
+        with pytest.raises(DatabaseError):
+            db_manager.add_words([
+                Word(word="Hello", translation="Привет", language="English"),
+                Word(word="World", translation="Мир", language="English", difficulty=9),
+            ])
+        assert db_manager.get_user_progress().total_words == 0
+    
+    def _query_plan(self, db_manager, sql, params=()):
+        """План выполнения запроса одной строкой"""
+        with db_manager._get_connection() as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return " | ".join(row['detail'] for row in rows)
+    
+    def test_schema_version(self, db_manager):
+        """Тест установки актуальной версии схемы"""
+        import migrations
+        
+        with db_manager._get_connection() as conn:
+            assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+    
+    def test_duplicate_check_uses_index(self, db_manager):
+        """Тест использования уникального индекса при проверке дубликата"""
+        plan = self._query_plan(
+            db_manager,
+            "SELECT id FROM words WHERE word = ? AND language = ?", ("a", "English")
+        )
+        assert "idx_words_language_word" in plan
+    
+    def test_words_by_language_uses_index(self, db_manager):
+        """Тест использования индекса в выборке по языку"""
+        plan = self._query_plan(
+            db_manager,
+            "SELECT * FROM words WHERE language = ? ORDER BY difficulty DESC", ("English",)
+        )
+        assert "idx_words_language_difficulty" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_all_words_order_uses_index(self, db_manager):
+        """Тест сортировки всех слов по индексу"""
+        plan = self._query_plan(
+            db_manager, "SELECT * FROM words ORDER BY created_at DESC, id DESC"
+        )
+        assert "idx_words_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_daily_stats_uses_covering_index(self, db_manager):
+        """Тест покрывающего индекса для дневной статистики"""
+        plan = self._query_plan(
+            db_manager,
+            "SELECT DATE(created_at, 'unixepoch', 'localtime'), COUNT(*), "
+            "SUM(difficulty >= 4) FROM words WHERE created_at >= ? GROUP BY 1", (0,)
+        )
+        assert "COVERING INDEX idx_words_created_difficulty" in plan
+    
+    def test_upgrade_legacy_database(self):
+        """Тест обновления БД без версии схемы на месте"""
+        import sqlite3
+        import migrations
+        
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
+            db_path = tmp.name
+        
+        conn = sqlite3.connect(db_path)
+        migrations._initial_schema(conn.cursor())
+        conn.executemany(
+            "INSERT INTO words (word, translation, language, difficulty, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [("Hello", "Привет", "English", 1, "2024-01-02 03:04:05.123456"),
+             ("Hello", "Привет", "English", 4, "2024-01-03 00:00:00")]
+        )
+        conn.execute("UPDATE user_progress SET total_words = 2, learned_words = 1")
+        conn.commit()
+        conn.close()
+        
+        with DatabaseManager(db_path) as manager:
+            words = manager.get_all_words()
+            assert len(words) == 1
+            assert words[0].created_at == datetime(2024, 1, 2, 3, 4, 5)
+            progress = manager.get_user_progress()
+            assert progress.total_words == 1
+            assert progress.learned_words == 0
+            with manager._get_connection() as conn:
+                assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+        os.unlink(db_path)
+    
+    def test_get_words_page(self, db_manager):
+        """Тест постраничной выборки по ключу"""
+        db_manager.add_words(
+            Word(word=f"w{i}", translation="т", language="English") for i in range(5)
+        )
+        
+        first = db_manager.get_words_page(limit=2)
+        second = db_manager.get_words_page(after=db_manager.page_key(first[-1]), limit=2)
+        
+        all_words = db_manager.get_all_words()
+        assert [w.id for w in first + second] == [w.id for w in all_words[:4]]
+    
+    def test_iter_words(self, db_manager):
+        """Тест ленивого обхода всех слов"""
+        db_manager.add_words(
+            Word(word=f"w{i}", translation="т", language="English") for i in range(7)
+        )
+        
+        ids = [w.id for w in db_manager.iter_words(page_size=3)]
+        assert ids == [w.id for w in db_manager.get_all_words()]
+    
+    def test_words_page_uses_index(self, db_manager):
+        """Тест выборки страницы по индексу без сортировки"""
+        plan = self._query_plan(
+            db_manager,
+            "SELECT * FROM words WHERE (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT ?", (1704067200, 10, 50)
+        )
+        assert "idx_words_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_change_events_after_commit(self, db_manager):
+        """Тест рассылки изменений после фиксации транзакции"""
+        from models import WordChange
+        
+        changes = []
+        db_manager.add_listener(changes.append)
+        
+        word_id = db_manager.add_word(Word(word="Test", translation="Тест", language="English"))
+        learned = db_manager.mark_as_learned(word_id)
+        deleted = db_manager.delete_word(word_id)
+        
+        assert [c.action for c in changes] == [
+            WordChange.ADDED, WordChange.UPDATED, WordChange.DELETED
+        ]
+        assert changes[0].word.id == word_id
+        assert learned.previous.difficulty == 1
+        assert learned.word.difficulty == 5
+        assert deleted.total_delta == -1
+    
+    def test_no_change_events_on_rollback(self, db_manager):
+        """Тест отсутствия событий при откате транзакции"""
+        db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        changes = []
+        db_manager.add_listener(changes.append)
+        
+        with pytest.raises(DatabaseError):
+            db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        
+        assert changes == []
+    
+    def test_search_prefix_and_substring(self, db_manager):
+        """Тест поиска по префиксу слова и подстроке перевода"""
+        db_manager.add_words([
+            Word(word="Hello", translation="Привет", language="English"),
+            Word(word="Shell", translation="Раковина", language="English"),
+            Word(word="Helado", translation="Мороженое", language="Spanish"),
+        ])
+        
+        assert [w.word for w in db_manager.search("he")] == ["Helado", "Hello"]
+        # Нечеткие совпадения идут после точных
+        assert [w.word for w in db_manager.search("hell")] == ["Hello", "Shell", "Helado"]
+        assert [w.word for w in db_manager.search("ривет")] == ["Hello"]
+        assert [w.word for w in db_manager.search("he", language="Spanish")] == ["Helado"]
+        assert db_manager.search("   ") == []
+    
+    def test_search_fuzzy(self, db_manager):
+        """Тест нечеткого поиска с опечаткой"""
+        db_manager.add_words([
+            Word(word="Restaurant", translation="Ресторан", language="English"),
+            Word(word="Rest", translation="Отдых", language="English"),
+        ])
+        
+        results = db_manager.search("restarant")
+        assert results[0].word == "Restaurant"
+    
+    def test_search_index_follows_changes(self, db_manager):
+        """Тест синхронизации поискового индекса с таблицей слов"""
+        word_id = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        assert [w.id for w in db_manager.search("ривет")] == [word_id]
+        
+        db_manager.delete_word(word_id)
+        assert db_manager.search("ривет") == []
+    
+    def test_get_word_and_words(self, db_manager):
+        """Тест выборки слов по ID"""
+        first = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        second = db_manager.add_word(Word(word="World", translation="Мир", language="English"))
+        
+        assert db_manager.get_word(first).word == "Hello"
+        assert [w.word for w in db_manager.get_words([second, 999, first])] == ["World", "Hello"]
+        with pytest.raises(DatabaseError):
+            db_manager.get_word(999)
+    
+    def test_get_word_cache_invalidated(self, db_manager):
+        """Тест сброса кэша слов при изменениях"""
+        word_id = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        cached = db_manager.get_word(word_id)
+        cached.difficulty = 3  # Изменение полученного объекта не портит кэш
+        assert db_manager.get_word(word_id).difficulty == 1
+        
+        db_manager.mark_as_learned(word_id)
+        assert db_manager.get_word(word_id).difficulty == 5
+        
+        db_manager.delete_word(word_id)
+        with pytest.raises(DatabaseError):
+            db_manager.get_word(word_id)
+    
+    def test_get_word_not_cached_in_rolled_back_transaction(self, db_manager):
+        """Тест: незафиксированные строки не попадают в кэш"""
+        with pytest.raises(DatabaseError):
+            with db_manager._get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO words (word, translation, language, created_at) "
+                    "VALUES ('Hello', 'Привет', 'English', 0)"
+                )
+                word_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                assert db_manager.get_word(word_id).word == "Hello"
+                raise RuntimeError("откат")
+        
+        with pytest.raises(DatabaseError):
+            db_manager.get_word(word_id)
+    
+    def test_delete_words(self, db_manager):
+        """Тест удаления нескольких слов одним запросом"""
+        db_manager.add_words(Word(word=f"w{i}", translation=f"с{i}", language="English",
+                                  difficulty=5 if i < 2 else 1) for i in range(5))
+        ids = [word.id for word in db_manager.get_all_words()]
+        changes = []
+        db_manager.add_listener(changes.append)
+        
+        words = {word.id: word for word in db_manager.get_all_words()}
+        to_delete = [word_id for word_id in ids if words[word_id].word in ("w0", "w3")]
+        assert db_manager.delete_words(to_delete + [999]) == 2
+        
+        progress = db_manager.get_user_progress()
+        assert progress.total_words == 3
+        assert progress.learned_words == 1
+        assert len(changes) == 1
+        assert (changes[0].total_delta, changes[0].learned_delta) == (-2, -1)
+        assert db_manager.delete_words([]) == 0
+    
+    def test_mark_as_learned_many(self, db_manager):
+        """Тест отметки нескольких слов как изученных одним запросом"""
+        db_manager.add_words(Word(word=f"w{i}", translation=f"с{i}", language="English",
+                                  difficulty=5 if i == 0 else 1) for i in range(4))
+        ids = [word.id for word in db_manager.get_all_words()]
+        
+        assert db_manager.mark_as_learned_many(ids) == 4
+        progress = db_manager.get_user_progress()
+        assert progress.learned_words == 4
+        assert progress.last_active is not None
+        assert all(word.difficulty == 5 and word.last_reviewed is not None
+                   for word in db_manager.get_all_words())
+    
+    def test_review_events_rollups(self, db_manager):
+        """Тест журнала повторений и дневных/недельных сводок"""
+        first = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        second = db_manager.add_word(Word(word="World", translation="Мир", language="English"))
+        third = db_manager.add_word(Word(word="Cat", translation="Кот", language="English"))
+        
+        db_manager.record_review(first, 4, reviewed_at=datetime(2024, 3, 4, 10, 0))  # понедельник
+        db_manager.record_review(first, 5, reviewed_at=datetime(2024, 3, 10, 22, 0))  # воскресенье
+        db_manager.record_review(second, 3, reviewed_at=datetime(2024, 3, 11, 9, 0))
+        db_manager.mark_as_learned(first)
+        db_manager.mark_as_learned(first)  # уже изучено: повторение без нового изученного
+        db_manager.mark_as_learned_many([second, third])
+        
+        history = db_manager.get_review_activity()
+        assert history[:3] == [
+            {'date': '2024-03-04', 'reviews': 1, 'learned': 0},
+            {'date': '2024-03-10', 'reviews': 1, 'learned': 0},
+            {'date': '2024-03-11', 'reviews': 1, 'learned': 0},
+        ]
+        today = datetime.now().date().isoformat()
+        assert history[3] == {'date': today, 'reviews': 4, 'learned': 3}
+        assert db_manager.get_review_activity(days=7) == history[3:]
+        
+        weeks = db_manager.get_review_activity(weekly=True)
+        assert weeks[:2] == [
+            {'date': '2024-03-04', 'reviews': 2, 'learned': 0},
+            {'date': '2024-03-11', 'reviews': 1, 'learned': 0},
+        ]
+        assert sum(week['reviews'] for week in weeks) == 7
+        
+        # История сохраняется после удаления слова и сбрасывается очисткой
+        db_manager.delete_word(first)
+        assert db_manager.get_review_activity(weekly=True) == weeks
+        db_manager.clear_words()
+        assert db_manager.get_review_activity() == []
+    
+    def test_streak_from_activity(self, db_manager):
+        """Тест серии дней по дням повторений"""
+        word_id = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        now = datetime.now()
+        
+        for days_ago in (6, 5, 3, 2, 1):
+            db_manager.record_review(word_id, 4, reviewed_at=now - timedelta(days=days_ago))
+        progress = db_manager.get_user_progress()
+        assert (progress.streak_days, progress.longest_streak) == (3, 3)
+        
+        # Второе повторение за день серию не меняет, новый день - продлевает
+        db_manager.mark_as_learned(word_id)
+        db_manager.mark_as_learned(word_id)
+        progress = db_manager.get_user_progress()
+        assert (progress.streak_days, progress.longest_streak) == (4, 4)
+        
+        # Повторение задним числом склеивает серии
+        db_manager.record_review(word_id, 4, reviewed_at=now - timedelta(days=4))
+        progress = db_manager.get_user_progress()
+        assert (progress.streak_days, progress.longest_streak) == (7, 7)
+        
+        calendar = db_manager.get_activity_calendar(30)
+        assert len(calendar) == 7
+        assert calendar[now.date().isoformat()] == 2
+        
+        assert db_manager.rebuild_stats().streak_days == 7
+    
+    def test_streak_lapsed(self, db_manager):
+        """Тест: серия, прерванная больше суток назад, не считается текущей"""
+        word_id = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        db_manager.record_review(word_id, 4, reviewed_at=datetime.now() - timedelta(days=3))
+        db_manager.record_review(word_id, 4, reviewed_at=datetime.now() - timedelta(days=2))
+        
+        progress = db_manager.get_user_progress()
+        assert (progress.streak_days, progress.longest_streak) == (0, 2)
+    
+    def test_memory_load_and_flush(self, tmp_path):
+        """Тест загрузки файла в память и сохранения обратно"""
+        db_path = str(tmp_path / "words.db")
+        with DatabaseManager(db_path) as manager:
+            manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        
+        with DatabaseManager(":memory:", load_from=db_path) as memory:
+            memory.add_word(Word(word="World", translation="Мир", language="English"))
+            # До сохранения файл не меняется
+            with DatabaseManager(db_path) as manager:
+                assert manager.get_user_progress().total_words == 1
+            memory.flush()
+        
+        with DatabaseManager(db_path) as manager:
+            assert sorted(w.word for w in manager.get_all_words()) == ["Hello", "World"]
+            assert manager.get_user_progress().total_words == 2
+    
+    def test_memory_shared_between_threads(self, db_manager):
+        """Тест: БД в памяти общая для всех потоков"""
+        import threading
+        thread = threading.Thread(target=db_manager.add_word, args=(
+            Word(word="Hello", translation="Привет", language="English"),
+        ))
+        thread.start()
+        thread.join()
+        assert [w.word for w in db_manager.get_all_words()] == ["Hello"]
+        
+        with pytest.raises(DatabaseError):
+            db_manager.flush()
+    
+    def test_read_only(self, tmp_path):
+        """Тест открытия БД только для чтения"""
+        db_path = str(tmp_path / "words.db")
+        with DatabaseManager(db_path) as manager:
+            manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+            
+            # Читатель не мешает писателю
+            with DatabaseManager(db_path, read_only=True) as reader:
+                assert [w.word for w in reader.get_all_words()] == ["Hello"]
+                manager.add_word(Word(word="World", translation="Мир", language="English"))
+                assert reader.get_user_progress().total_words == 2
+                
+                with pytest.raises(DatabaseError):
+                    reader.add_word(Word(word="Cat", translation="Кот", language="English"))
+        
+        with pytest.raises(DatabaseError, match="не найден"):
+            DatabaseManager(str(tmp_path / "missing.db"), read_only=True)
+        assert not (tmp_path / "missing.db").exists()
@@ -0,0 +1,58 @@
+import logging
+import pytest
+from log_view import LogView
+import log_config
+
+class TestLogView:
+    def test_lines_bounded(self, qapp):
+        """Тест ограничения числа строк в панели"""
+        view = LogView(max_lines=10, flush_ms=1000)
+        for i in range(25):
+            view.append_line(f"строка {i}")
+        view.flush()
+        for i in range(25, 30):
+            view.append_line(f"строка {i}")
+        
+        lines = view.lines()
+        assert len(lines) == 10
+        assert lines[0] == "строка 20"
+        assert lines[-1] == "строка 29"
+    
+    def test_appends_coalesced(self, qapp, monkeypatch):
+        """Тест вывода накопленных строк одной вставкой"""
+        view = LogView(max_lines=100, flush_ms=1000)
+        calls = []
+        original = view.appendPlainText
+        monkeypatch.setattr(view, "appendPlainText", lambda text: (calls.append(text), original(text)))
+        
+        for i in range(5):
+            view.append_line(f"строка {i}")
+        assert view.toPlainText() == ""
+        
+        view.flush()
+        assert len(calls) == 1
+        assert len(view.lines()) == 5
+
+class TestQueueLogging:
+    def test_rotating_file_through_queue(self, tmp_path):
+        """Тест записи журнала через очередь с ротацией файла"""
+        path = tmp_path / "test.log"
+        logger = logging.getLogger("test_log_view.queue")
+        logger.propagate = False
+        listener = log_config.queue_logging(
+            logger, log_config.rotating_file_handler(path, max_bytes=200, backups=2)
+        )
+        try:
+            for i in range(20):
+                logger.warning("сообщение %d", i)
+        finally:
+            listener.stop()
+            log_config._listeners.remove(listener)
+            logger.handlers.clear()
+            for handler in listener.handlers:
+                handler.close()
+        
+        assert path.exists()
+        assert (tmp_path / "test.log.1").exists()
+        assert not (tmp_path / "test.log.3").exists()
+        assert "сообщение 19" in path.read_text(encoding="utf-8")
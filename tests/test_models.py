@@ -39,6 +39,27 @@ class TestWord:
         assert result["language"] == "Russian"
         assert result["difficulty"] == "2"
         assert "2024-01-01" in result["last_reviewed"]
+    
+    def test_from_row_lazy_timestamps(self):
+        """Тест создания из строки БД с ленивым переводом времени"""
+        created = datetime(2024, 1, 1, 12, 30)
+        row = (1, "Test", "Тест", "English", 2, None, int(created.timestamp()))
+        
+        word = Word.from_row(row)
+        
+        assert word.created_ts == int(created.timestamp())
+        assert word.created_at == created
+        assert word.last_reviewed is None
+        assert word == Word(id=1, word="Test", translation="Тест", language="English",
+                            difficulty=2, created_at=created)
+    
+    def test_word_is_slotted(self):
+        """Тест отсутствия __dict__ у слова"""
+        word = Word(word="Test")
+        
+        assert not hasattr(word, "__dict__")
+        with pytest.raises(AttributeError):
+            word.extra = 1
 
 class TestUserProgress:
     def test_progress_percentage(self):
@@ -0,0 +1,73 @@
+import pytest
+import logging
+import tempfile
+import os
+from models import Word
+from database import DatabaseManager
+from profiling import slow_log
+
+class TestQueryProfiler:
+    @pytest.fixture
+    def db_manager(self):
+        """Фикстура для создания БД в памяти с профилированием"""
+        manager = DatabaseManager(":memory:", profiling=True)
+        yield manager
+
+        manager.close()
+
+    def test_method_stats(self, db_manager):
+        """Тест учета вызовов, строк и SQL по методам"""
+        db_manager.add_words(
+            Word(word=f"w{i}", translation=f"п{i}", language="English") for i in range(5)
+        )
+        db_manager.get_all_words()
+        db_manager.get_all_words()
+
+        stats = db_manager.stats()
+        assert stats['get_all_words']['calls'] == 2
+        assert stats['get_all_words']['rows'] == 10
+        assert stats['get_all_words']['statements'] >= 2
+        assert sum(stats['get_all_words']['histogram'].values()) == 2
+        assert stats['add_words']['calls'] == 1
+
+    def test_nested_calls_counted_once(self, db_manager):
+        """Тест: вложенный профилируемый вызов учитывается только во внешнем"""
+        word_id = db_manager.add_word(Word(word="Hello", translation="Привет", language="English"))
+        db_manager.get_word(word_id)
+        assert db_manager.delete_words([word_id]) == 1
+
+        stats = db_manager.stats()
+        assert stats['get_word']['calls'] == 1
+        assert 'get_words' not in stats
+        assert stats['add_word']['rows'] == 0
+        assert stats['delete_words']['rows'] == 0
+
+    def test_failed_call_counted(self, db_manager):
+        """Тест учета вызовов, завершившихся ошибкой"""
+        with pytest.raises(Exception):
+            db_manager.delete_word(12345)
+        assert db_manager.stats()['delete_word']['errors'] == 1
+
+    def test_slow_query_log(self, db_manager, monkeypatch):
+        """Тест записи медленных вызовов в отдельный журнал"""
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        monkeypatch.setattr(slow_log, "handlers", [handler])
+
+        db_manager.profiler.slow_query_ms = 0
+        db_manager.get_user_progress()
+
+        assert len(records) == 1
+        message = records[0].getMessage()
+        assert message.startswith("get_user_progress")
+        assert "user_progress" in message.split("\n", 1)[1]
+
+    def test_disabled_profiling(self):
+        """Тест работы без профилирования: методы не обернуты"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with DatabaseManager(os.path.join(tmp_dir, "plain.db"), profiling=False) as manager:
+                assert manager.profiler is None
+                assert 'get_all_words' not in vars(manager)
+                manager.get_all_words()
+                assert manager.stats() == {}
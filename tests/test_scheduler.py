@@ -0,0 +1,119 @@
+import pytest
+from datetime import datetime, timedelta
+from models import Word
+from scheduler import ReviewScheduler, sm2
+from exceptions import InvalidQualityError
+
+class TestSm2:
+    def test_first_intervals(self):
+        """Тест интервалов первых успешных повторений"""
+        repetitions, interval, ease = sm2(5, 0, 0, 2.5)
+        assert (repetitions, interval) == (1, 1)
+        repetitions, interval, ease = sm2(5, repetitions, interval, ease)
+        assert (repetitions, interval) == (2, 6)
+        repetitions, interval, _ = sm2(5, repetitions, interval, ease)
+        assert repetitions == 3
+        assert interval == pytest.approx(6 * ease)
+
+    def test_failed_answer_resets(self):
+        """Тест сброса повторений при забытом слове"""
+        repetitions, interval, ease = sm2(1, 4, 30, 2.5)
+        assert (repetitions, interval) == (0, 1)
+        assert ease < 2.5
+
+    def test_ease_lower_bound(self):
+        """Тест нижней границы коэффициента легкости"""
+        assert sm2(0, 0, 0, 1.3)[2] == 1.3
+
+    def test_invalid_quality(self):
+        """Тест некорректной оценки ответа"""
+        with pytest.raises(InvalidQualityError):
+            sm2(6, 0, 0, 2.5)
+
+class TestReviewQueue:
+    def _add_words(self, db_manager, count):
+        """Добавление слов с разным временем создания"""
+        base = datetime.now() - timedelta(days=count)
+        db_manager.add_words(
+            Word(word=f"w{i}", translation=f"п{i}", language="English",
+                 difficulty=1, created_at=base + timedelta(days=i))
+            for i in range(count)
+        )
+        return [word.id for word in reversed(db_manager.get_all_words())]
+
+    def test_new_words_are_due(self, db_manager):
+        """Тест: новые слова сразу доступны для повторения"""
+        word_id = db_manager.add_word(
+            Word(word="Hello", translation="Привет", language="English", difficulty=1)
+        )
+        due = db_manager.get_due_words(now=datetime.now() + timedelta(seconds=1))
+        assert [word.id for word in due] == [word_id]
+
+    def test_due_words_order(self, db_manager):
+        """Тест порядка выдачи: сначала самые просроченные"""
+        ids = self._add_words(db_manager, 5)
+        assert [word.id for word in db_manager.get_due_words()] == ids
+
+    def test_due_queue_uses_index(self, db_manager):
+        """Тест выборки очереди по индексу без сортировки"""
+        with db_manager._get_connection() as conn:
+            rows = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM words WHERE due_at <= ? "
+                "ORDER BY due_at, id LIMIT 10", (0,)
+            ).fetchall()
+        plan = " | ".join(row['detail'] for row in rows)
+        assert "idx_words_due" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_record_review(self, db_manager):
+        """Тест записи ответа и переноса срока"""
+        ids = self._add_words(db_manager, 2)
+        now = datetime.now()
+
+        state = db_manager.record_review(ids[0], 5, now)
+        assert state.repetitions == 1
+        assert state.interval_days == 1
+        assert db_manager.get_review_state(ids[0]) == state
+        assert [word.id for word in db_manager.get_due_words(now=now)] == [ids[1]]
+
+    def test_scheduler_next_due(self, db_manager):
+        """Тест выдачи карточек планировщиком"""
+        ids = self._add_words(db_manager, 3)
+        scheduler = ReviewScheduler(db_manager, cache_size=2)
+        now = datetime.now()
+
+        seen = []
+        while (word_id := scheduler.next_due(now)) is not None:
+            seen.append(word_id)
+            scheduler.review(word_id, 4, now)
+
+        assert seen == ids
+        assert scheduler.next_due(now + timedelta(days=2)) == ids[0]
+        scheduler.close()
+
+    def test_scheduler_tracks_changes(self, db_manager):
+        """Тест синхронизации очереди с добавлением и удалением слов"""
+        ids = self._add_words(db_manager, 1)
+        scheduler = ReviewScheduler(db_manager)
+        assert scheduler.next_due() == ids[0]
+
+        db_manager.delete_word(ids[0])
+        assert scheduler.next_due() is None
+
+        word_id = db_manager.add_word(
+            Word(word="Hello", translation="Привет", language="English", difficulty=1)
+        )
+        assert scheduler.next_due(datetime.now() + timedelta(seconds=1)) == word_id
+        scheduler.close()
+
+    def test_scheduler_tracks_outside_reviews(self, db_manager):
+        """Тест: повторение, записанное в обход планировщика, меняет очередь"""
+        ids = self._add_words(db_manager, 2)
+        scheduler = ReviewScheduler(db_manager)
+        now = datetime.now()
+        assert scheduler.next_due(now) == ids[0]
+
+        db_manager.record_review(ids[0], 5, now)
+        assert scheduler.next_due(now) == ids[1]
+        assert scheduler.due_count(now) == 1
+        scheduler.close()
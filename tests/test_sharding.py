@@ -0,0 +1,118 @@
+import pytest
+from datetime import datetime, timedelta
+from models import Word, WordChange
+from database import DatabaseManager
+from sharding import ShardedDatabaseManager, SHARD_ID_STRIDE
+from exceptions import DatabaseError
+
+class TestShardedDatabaseManager:
+    @pytest.fixture
+    def sharded(self, tmp_path):
+        """Фикстура шардированного хранилища во временном каталоге"""
+        manager = ShardedDatabaseManager(str(tmp_path / "shards"))
+        yield manager
+        manager.close()
+
+    @pytest.fixture
+    def filled(self, sharded):
+        """Слова трех языков с разными датами добавления"""
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        sharded.add_words(
+            Word(word=f"{language[:2]}{i}", translation=f"перевод {i}", language=language,
+                 difficulty=5 if i % 3 == 0 else 1, created_at=start + timedelta(minutes=i * 3 + n))
+            for n, language in enumerate(["English", "Spanish", "German"])
+            for i in range(20)
+        )
+        return sharded
+
+    def test_one_file_per_language(self, filled, tmp_path):
+        """Тест создания файлов только для использованных языков"""
+        files = sorted(path.name for path in (tmp_path / "shards").iterdir()
+                       if path.suffix == ".db")
+        assert files == ["english.db", "german.db", "spanish.db"]
+
+        with DatabaseManager(str(tmp_path / "shards" / "spanish.db")) as shard:
+            assert {word.language for word in shard.get_all_words()} == {"Spanish"}
+
+    def test_global_ids(self, sharded):
+        """Тест глобальных ID: операции по ID попадают в нужный шард"""
+        english_id = sharded.add_word(Word(word="Hello", translation="Привет", language="English"))
+        spanish_id = sharded.add_word(Word(word="Hola", translation="Привет", language="Spanish"))
+        assert english_id % SHARD_ID_STRIDE != spanish_id % SHARD_ID_STRIDE
+
+        sharded.mark_as_learned(spanish_id)
+        change = sharded.delete_word(english_id)
+        assert change.word.id == english_id
+
+        words = sharded.get_all_words()
+        assert [(word.id, word.difficulty) for word in words] == [(spanish_id, 5)]
+        assert sharded.get_word(spanish_id).word == "Hola"
+        assert sharded.get_words([english_id, spanish_id]) == words
+        with pytest.raises(DatabaseError):
+            sharded.get_word(english_id)
+
+    def test_merged_order_matches_single_file(self, filled, tmp_path):
+        """Тест: объединенная выдача совпадает с порядком одного файла"""
+        words = filled.get_all_words()
+        assert len(words) == 60
+        keys = [(word.created_ts, word.id) for word in words]
+        assert keys == sorted(keys, reverse=True)
+
+        # Постраничный обход через границы шардов дает тот же порядок
+        assert [word.id for word in filled.iter_words(page_size=7)] == [word.id for word in words]
+
+    def test_progress_and_daily_stats(self, filled):
+        """Тест суммирования счетчиков и дневной статистики по шардам"""
+        progress = filled.get_user_progress()
+        assert progress.total_words == 60
+        assert progress.learned_words == 21
+
+        filled.add_word(Word(word="Today", translation="Сегодня", language="French", difficulty=4))
+        stats = filled.get_daily_stats(7)
+        assert stats == [{'date': datetime.now().date().isoformat(), 'added': 1, 'learned': 1}]
+
+        filled.mark_as_learned_many([word.id for word in filled.get_all_words()[:4]])
+        assert filled.get_review_activity(7) == [
+            {'date': datetime.now().date().isoformat(), 'reviews': 4, 'learned': 3}
+        ]
+
+        # Повторения в разных языках в соседние дни - одна серия
+        spanish = filled.get_words_by_language("Spanish")[0]
+        filled.record_review(spanish.id, 4, reviewed_at=datetime.now() - timedelta(days=1))
+        progress = filled.get_user_progress()
+        assert (progress.streak_days, progress.longest_streak) == (2, 2)
+
+    def test_search_and_language(self, filled):
+        """Тест поиска по всем шардам и по шарду языка"""
+        assert {word.language for word in filled.search("перевод 1", limit=100)} == \
+            {"English", "Spanish", "German"}
+        assert [word.word for word in filled.search("sp1", language="Spanish")][0] == "Sp1"
+        assert filled.search("hello", language="Japanese") == []
+        assert len(filled.get_words_by_language("German")) == 20
+
+    def test_listener_receives_global_ids(self, sharded):
+        """Тест: подписчики получают изменения с глобальными ID"""
+        changes = []
+        sharded.add_listener(changes.append)
+        word_id = sharded.add_word(Word(word="Hola", translation="Привет", language="Spanish"))
+        sharded.delete_word(word_id)
+
+        assert [change.action for change in changes] == [WordChange.ADDED, WordChange.DELETED]
+        assert all(change.word.id == word_id for change in changes)
+
+    def test_read_only(self, filled, tmp_path):
+        """Тест режима только для чтения: чтение работает, запись отклоняется"""
+        filled.close()
+        with ShardedDatabaseManager(str(tmp_path / "shards"), read_only=True) as viewer:
+            assert viewer.get_user_progress().total_words == 60
+            with pytest.raises(DatabaseError):
+                viewer.add_word(Word(word="Hello", translation="Привет", language="English"))
+            # Файл шарда для нового языка не создается
+            with pytest.raises(DatabaseError):
+                viewer.add_word(Word(word="Bonjour", translation="Привет", language="French"))
+            assert not viewer.shard_path("French").exists()
+
+    def test_unsupported_language(self, sharded):
+        """Тест ошибки для языка без шарда"""
+        with pytest.raises(DatabaseError):
+            sharded.add_word(Word(word="Ciao", translation="Привет", language="Italian"))
@@ -0,0 +1,162 @@
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from models import Word
+from table_model import WordTableModel
+from workers import DbExecutor
+
+class TestWordTableModel:
+    @pytest.fixture
+    def db_manager(self, db_manager):
+        """БД в памяти с 25 словами: три страницы по 10"""
+        db_manager.add_words(
+            Word(word=f"word{i}", translation=f"слово{i}", language="English")
+            for i in range(25)
+        )
+        return db_manager
+    
+    @pytest.fixture
+    def model(self, qapp, db_manager):
+        """Модель с маленькими страницами и окном кэша"""
+        model = WordTableModel(db_manager, page_size=10, cached_pages=2)
+        model.refresh()
+        return model
+    
+    def test_first_page_loaded(self, model):
+        """Тест загрузки только первой страницы"""
+        assert model.rowCount() == 10
+        assert model.columnCount() == 6
+        assert model.canFetchMore()
+    
+    def test_fetch_more_until_exhausted(self, model):
+        """Тест подгрузки страниц до конца таблицы"""
+        while model.canFetchMore():
+            model.fetchMore()
+        
+        assert model.rowCount() == 25
+    
+    def test_data_matches_database_order(self, model, db_manager):
+        """Тест совпадения строк модели с порядком get_all_words"""
+        while model.canFetchMore():
+            model.fetchMore()
+        
+        expected = db_manager.get_all_words()
+        for row, word in enumerate(expected):
+            assert model.data(model.index(row, 0)) == str(word.id)
+            assert model.data(model.index(row, 1)) == word.word
+    
+    def test_sliding_window_evicts_pages(self, model):
+        """Тест вытеснения старых страниц и их повторной загрузки"""
+        while model.canFetchMore():
+            model.fetchMore()
+        
+        assert model._pages[0].words is None
+        first = model.word_at(0)
+        assert first is not None
+        assert model._pages[0].words is not None
+        assert sum(page.words is not None for page in model._pages) <= 2
+    
+    def test_header(self, model):
+        """Тест заголовков столбцов"""
+        assert model.headerData(1, Qt.Horizontal) == "Слово"
+    
+    def _ids(self, model):
+        """ID слов во всех строках модели"""
+        return [model.word_at(row).id for row in range(model.rowCount())]
+    
+    def test_insert_added_word(self, model, db_manager):
+        """Тест вставки новой строки без перезагрузки"""
+        db_manager.add_listener(model.apply_change)
+        db_manager.add_word(Word(word="new", translation="новое", language="English"))
+        
+        assert model.rowCount() == 11
+        assert model.word_at(0).word == "new"
+        assert self._ids(model) == [w.id for w in db_manager.get_all_words()[:11]]
+    
+    def test_remove_deleted_word(self, model, db_manager):
+        """Тест удаления строки без перезагрузки"""
+        db_manager.add_listener(model.apply_change)
+        model.fetchMore()
+        model.fetchMore()
+        
+        # Слово со страницы, вытесненной из кэша
+        word = model.word_at(3)
+        model.word_at(15)
+        model.word_at(24)
+        assert model._pages[0].words is None
+        db_manager.delete_word(word.id)
+        
+        assert model.rowCount() == 24
+        assert self._ids(model) == [w.id for w in db_manager.get_all_words()]
+    
+    def test_update_learned_word(self, model, db_manager):
+        """Тест обновления строки после отметки изученным"""
+        db_manager.add_listener(model.apply_change)
+        word = model.word_at(2)
+        
+        db_manager.mark_as_learned(word.id)
+        
+        assert model.data(model.index(2, 4)) == "5"
+        assert model.data(model.index(2, 5)) != "Не изучено"
+    
+    def test_show_words(self, model, db_manager):
+        """Тест показа готового списка слов без подгрузки"""
+        words = db_manager.search("word1")
+        model.show_words(words)
+        
+        assert model.rowCount() == len(words)
+        assert not model.canFetchMore()
+        assert model.data(model.index(0, 1)) == words[0].word
+    
+    @pytest.fixture
+    def executor(self, qapp):
+        executor = DbExecutor(max_threads=1)
+        yield executor
+        executor.shutdown()
+    
+    def _wait(self, executor):
+        """Ожидание доставки всех фоновых результатов"""
+        while executor.busy:
+            executor.wait()
+            QApplication.processEvents()
+    
+    @pytest.fixture
+    def async_model(self, db_manager, executor):
+        """Модель с фоновой загрузкой, все страницы получены"""
+        model = WordTableModel(db_manager, page_size=10, cached_pages=2, executor=executor)
+        model.refresh()
+        self._wait(executor)
+        while model.canFetchMore():
+            model.fetchMore()
+            self._wait(executor)
+        return model
+    
+    def test_evicted_page_loads_in_background(self, async_model, db_manager, executor):
+        """Тест: вытесненная страница читается в фоне, до загрузки - заглушка"""
+        assert async_model.rowCount() == 25
+        assert async_model._pages[0].words is None
+        changed = []
+        async_model.dataChanged.connect(
+            lambda first, last: changed.append((first.row(), last.row()))
+        )
+        
+        assert async_model.data(async_model.index(0, 1)) == WordTableModel.LOADING_TEXT
+        self._wait(executor)
+        
+        assert changed == [(0, 9)]
+        assert async_model.data(async_model.index(0, 1)) == db_manager.get_all_words()[0].word
+    
+    def test_remove_on_evicted_page(self, async_model, db_manager, executor):
+        """Тест удаления со страницы, вытесненной из кэша, без ее чтения"""
+        db_manager.add_listener(async_model.apply_change)
+        word = db_manager.get_all_words()[3]
+        
+        db_manager.delete_word(word.id)
+        assert async_model.rowCount() == 24
+        assert async_model._pages[0].words is None
+        assert not executor.busy
+        
+        words = []
+        async_model.words_at(range(async_model.rowCount()), words.extend)
+        self._wait(executor)
+        assert [w.id for w in words] == [w.id for w in db_manager.get_all_words()]
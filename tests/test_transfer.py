@@ -0,0 +1,154 @@
+import os
+import pytest
+from datetime import datetime
+from models import Word
+from database import DatabaseManager
+from sharding import ShardedDatabaseManager
+from exceptions import ImportFormatError, OperationCancelledError
+import settings
+import transfer
+
+
+class TestTransfer:
+    @pytest.fixture
+    def db_manager(self, tmp_path):
+        """Фикстура временной БД"""
+        manager = DatabaseManager(str(tmp_path / "words.db"))
+        yield manager
+        manager.close()
+
+    @pytest.fixture
+    def filled_db(self, db_manager):
+        """БД с несколькими словами"""
+        db_manager.add_words([
+            Word(word="Hello", translation="Привет", language="English", difficulty=1,
+                 created_at=datetime(2024, 1, 1, 10, 0, 0)),
+            Word(word="Tab\tword", translation="С табуляцией", language="English", difficulty=4),
+            Word(word="Hola", translation="Привет, \"мир\"", language="Spanish", difficulty=5,
+                 last_reviewed=datetime(2024, 2, 1, 9, 30, 0)),
+        ])
+        return db_manager
+
+    @pytest.mark.parametrize("fmt", ["csv", "jsonl", "anki"])
+    def test_round_trip(self, filled_db, tmp_path, fmt):
+        """Тест экспорта и повторного импорта во всех форматах"""
+        path = tmp_path / f"words{transfer.FORMATS[fmt][0]}"
+        assert transfer.export_words(filled_db, path) == 3
+
+        target = DatabaseManager(str(tmp_path / "target.db"))
+        try:
+            result = transfer.import_words(target, path)
+            assert result.inserted == 3
+            assert result.skipped == 0
+
+            words = {word.word: word for word in target.iter_words()}
+            assert words["Hola"].translation == "Привет, \"мир\""
+            assert words["Hola"].language == "Spanish"
+            assert words["Hola"].difficulty == 5
+            assert target.get_user_progress().learned_words == 2
+            if fmt == "anki":
+                assert "Tab word" in words
+            else:
+                assert "Tab\tword" in words
+                assert words["Hello"].created_at == datetime(2024, 1, 1, 10, 0, 0)
+                assert words["Hola"].last_reviewed == datetime(2024, 2, 1, 9, 30, 0)
+        finally:
+            target.close()
+
+    def test_import_skips_duplicates(self, filled_db, tmp_path):
+        """Тест пропуска уже существующих слов при импорте"""
+        path = tmp_path / "words.jsonl"
+        transfer.export_words(filled_db, path)
+
+        result = transfer.import_words(filled_db, path)
+        assert result.inserted == 0
+        assert result.skipped == 3
+        assert filled_db.get_user_progress().total_words == 3
+
+    def test_import_bad_line_rolls_back(self, db_manager, tmp_path):
+        """Тест: ошибка формата не оставляет частично импортированных слов"""
+        path = tmp_path / "words.csv"
+        path.write_text(
+            "word,translation,language,difficulty\n"
+            "Hello,Привет,English,1\n"
+            "World,Мир,English,9\n",
+            encoding="utf-8"
+        )
+
+        with pytest.raises(ImportFormatError):
+            transfer.import_words(db_manager, path)
+        assert db_manager.get_user_progress().total_words == 0
+
+    def test_sharded_import_bad_line_rolls_back(self, tmp_path, monkeypatch):
+        """Тест: в шардах ошибка после нескольких пачек не оставляет слов"""
+        monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+        path = tmp_path / "words.csv"
+        path.write_text(
+            "word,translation,language,difficulty\n"
+            + "".join(f"w{i},с{i},{'English' if i % 2 else 'Spanish'},1\n" for i in range(7))
+            + "World,Мир,English,9\n",
+            encoding="utf-8"
+        )
+
+        with ShardedDatabaseManager(str(tmp_path / "shards")) as sharded:
+            with pytest.raises(ImportFormatError):
+                transfer.import_words(sharded, path)
+            assert sharded.get_user_progress().total_words == 0
+
+    def test_import_not_utf8(self, db_manager, tmp_path):
+        """Тест файла не в UTF-8: ошибка формата с номером строки"""
+        path = tmp_path / "words.csv"
+        path.write_text(
+            "word,translation,language,difficulty\n"
+            "Hello,Привет,English,1\n",
+            encoding="cp1251"
+        )
+
+        with pytest.raises(ImportFormatError, match="Строка 2"):
+            transfer.import_words(db_manager, path)
+        assert db_manager.get_user_progress().total_words == 0
+
+    def test_import_missing_columns(self, db_manager, tmp_path):
+        """Тест CSV без обязательных столбцов"""
+        path = tmp_path / "words.csv"
+        path.write_text("name,value\nHello,Привет\n", encoding="utf-8")
+
+        with pytest.raises(ImportFormatError):
+            transfer.import_words(db_manager, path)
+
+    def test_cancel(self, filled_db, tmp_path, monkeypatch):
+        """Тест отмены: нет файла экспорта и импортированных слов"""
+        monkeypatch.setattr(settings, "TRANSFER_PROGRESS_EVERY", 1)
+        source = tmp_path / "source.csv"
+        transfer.export_words(filled_db, source)
+
+        path = tmp_path / "words.csv"
+        with pytest.raises(OperationCancelledError):
+            transfer.export_words(filled_db, path, cancelled=lambda: True)
+        assert not path.exists()
+        assert not os.path.exists(f"{path}.part")
+
+        target = DatabaseManager(str(tmp_path / "target.db"))
+        try:
+            with pytest.raises(OperationCancelledError):
+                transfer.import_words(target, source, cancelled=lambda: True)
+            assert target.get_user_progress().total_words == 0
+        finally:
+            target.close()
+
+    def test_progress(self, filled_db, tmp_path, monkeypatch):
+        """Тест отчета о прогрессе"""
+        monkeypatch.setattr(settings, "TRANSFER_PROGRESS_EVERY", 1)
+        reports = []
+        transfer.export_words(filled_db, tmp_path / "words.csv",
+                              progress=lambda done, total: reports.append((done, total)))
+        assert reports[0] == (1, 3)
+        assert reports[-1] == (3, 3)
+
+    def test_detect_format(self):
+        """Тест определения формата по расширению"""
+        assert transfer.detect_format("words.CSV") == "csv"
+        assert transfer.detect_format("words.ndjson") == "jsonl"
+        assert transfer.detect_format("deck.txt") == "anki"
+        with pytest.raises(ImportFormatError):
+            transfer.detect_format("words.xlsx")
@@ -0,0 +1,50 @@
+import pytest
+import threading
+from PySide6.QtWidgets import QApplication
+from workers import DbExecutor
+
+class TestDbExecutor:
+    @pytest.fixture
+    def executor(self, qapp):
+        executor = DbExecutor(max_threads=1)
+        yield executor
+        executor.shutdown()
+    
+    def _wait(self, executor):
+        """Ожидание доставки всех результатов"""
+        while executor.busy:
+            executor.wait()
+            QApplication.processEvents()
+    
+    def test_result_delivered_in_gui_thread(self, executor):
+        """Тест доставки результата в поток GUI"""
+        results = []
+        executor.submit(
+            threading.get_ident,
+            on_result=lambda ident: results.append((ident, threading.get_ident()))
+        )
+        self._wait(executor)
+        
+        worker_ident, gui_ident = results[0]
+        assert worker_ident != gui_ident
+        assert gui_ident == threading.get_ident()
+    
+    def test_error_delivered(self, executor):
+        """Тест доставки ошибки"""
+        errors = []
+        executor.submit(lambda: 1 / 0, on_error=errors.append)
+        self._wait(executor)
+        
+        assert isinstance(errors[0], ZeroDivisionError)
+    
+    def test_superseded_task_dropped(self, executor):
+        """Тест отбрасывания результата вытесненной задачи"""
+        gate = threading.Event()
+        results = []
+        executor.submit(gate.wait)  # Занимаем единственный поток
+        executor.submit(lambda: "old", key="refresh", on_result=results.append)
+        executor.submit(lambda: "new", key="refresh", on_result=results.append)
+        gate.set()
+        self._wait(executor)
+        
+        assert results == ["new"]
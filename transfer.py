@@ -0,0 +1,236 @@
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from models import Word, ImportResult
+from exceptions import ImportFormatError, OperationCancelledError
+import settings
+
+# Форматы обмена: расширение файла по умолчанию и описание для диалогов
+FORMATS = {
+    'csv': ('.csv', "CSV"),
+    'jsonl': ('.jsonl', "JSON Lines"),
+    'anki': ('.txt', "Anki (TSV)"),
+}
+
+FIELDS = ['word', 'translation', 'language', 'difficulty', 'last_reviewed', 'created_at']
+
+# Заголовок текстового файла Anki: разделитель и столбец с тегами
+ANKI_HEADER = "#separator:tab\n#html:false\n#tags column:3\n"
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def detect_format(path) -> str:
+    """Формат файла по расширению"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    if suffix in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if suffix in ('.txt', '.tsv'):
+        return 'anki'
+    raise ImportFormatError(f"Неизвестный формат файла: {suffix or path}")
+
+
+def _format_time(value: Optional[datetime]) -> str:
+    return value.isoformat(sep=' ', timespec='seconds') if value else ""
+
+
+def _parse_time(value) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _word_from_fields(fields: dict, line: int) -> Word:
+    """Слово из прочитанных полей с проверкой обязательных значений"""
+    try:
+        word = Word(
+            word=str(fields['word'] or "").strip(),
+            translation=str(fields['translation'] or "").strip(),
+            language=str(fields.get('language') or settings.DEFAULT_LANGUAGE).strip(),
+            difficulty=int(fields.get('difficulty') or 1),
+            last_reviewed=_parse_time(fields.get('last_reviewed')),
+            created_at=_parse_time(fields.get('created_at'))
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ImportFormatError(f"Строка {line}: некорректная запись ({e})")
+    if not word.word or not word.translation:
+        raise ImportFormatError(f"Строка {line}: пустое слово или перевод")
+    if not 1 <= word.difficulty <= 5:
+        raise ImportFormatError(f"Строка {line}: сложность должна быть от 1 до 5")
+    return word
+
+
+# Запись
+
+def write_csv(words: Iterable[Word], out: TextIO) -> Iterator[Word]:
+    """Запись слов в CSV с заголовком"""
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    for word in words:
+        writer.writerow([word.word, word.translation, word.language, word.difficulty,
+                         _format_time(word.last_reviewed), _format_time(word.created_at)])
+        yield word
+
+
+def write_jsonl(words: Iterable[Word], out: TextIO) -> Iterator[Word]:
+    """Запись слов в JSON Lines: по объекту на строку"""
+    for word in words:
+        out.write(json.dumps({
+            'word': word.word,
+            'translation': word.translation,
+            'language': word.language,
+            'difficulty': word.difficulty,
+            'last_reviewed': _format_time(word.last_reviewed) or None,
+            'created_at': _format_time(word.created_at) or None,
+        }, ensure_ascii=False))
+        out.write("\n")
+        yield word
+
+
+def write_anki(words: Iterable[Word], out: TextIO) -> Iterator[Word]:
+    """Запись слов в текстовый формат импорта Anki: слово, перевод, теги"""
+    out.write(ANKI_HEADER)
+    for word in words:
+        tags = f"lang::{word.language} difficulty::{word.difficulty}"
+        out.write(f"{_anki_field(word.word)}\t{_anki_field(word.translation)}\t{tags}\n")
+        yield word
+
+
+def _anki_field(value: str) -> str:
+    """Поле Anki без символов-разделителей"""
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'anki': write_anki}
+
+
+# Чтение
+
+def read_csv(lines: Iterable[str]) -> Iterator[Word]:
+    """Чтение слов из CSV с заголовком"""
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None or not {'word', 'translation'} <= set(reader.fieldnames):
+        raise ImportFormatError("В CSV нет столбцов word и translation")
+    for fields in reader:
+        yield _word_from_fields(fields, reader.line_num)
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[Word]:
+    """Чтение слов из JSON Lines"""
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ImportFormatError(f"Строка {line_no}: некорректный JSON ({e})")
+        if not isinstance(fields, dict):
+            raise ImportFormatError(f"Строка {line_no}: ожидался объект JSON")
+        yield _word_from_fields(fields, line_no)
+
+
+def read_anki(lines: Iterable[str]) -> Iterator[Word]:
+    """Чтение слов из текстового экспорта Anki (поля через табуляцию)
+
+    Первые два поля - слово и перевод, язык и сложность берутся из тегов
+    lang:: и difficulty::, если они есть.
+    """
+    for line_no, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("#"):
+            continue
+        columns = line.split("\t")
+        if len(columns) < 2:
+            raise ImportFormatError(f"Строка {line_no}: ожидалось минимум два поля")
+        fields = {'word': columns[0], 'translation': columns[1]}
+        for tag in (columns[2].split() if len(columns) > 2 else []):
+            name, _, value = tag.partition("::")
+            if name == 'lang':
+                fields['language'] = value
+            elif name == 'difficulty':
+                fields['difficulty'] = value
+        yield _word_from_fields(fields, line_no)
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl, 'anki': read_anki}
+
+
+# Экспорт и импорт файлов
+
+def _check_cancelled(cancelled: Optional[Callable[[], bool]]):
+    if cancelled is not None and cancelled():
+        raise OperationCancelledError("Операция отменена")
+
+
+def export_words(db, path, fmt: Optional[str] = None,
+                 progress: Optional[ProgressCallback] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """Потоковый экспорт всех слов в файл; возвращает число слов
+
+    Слова читаются из БД постранично, в памяти держится одна страница.
+    Файл пишется во временный и заменяет целевой только после успешного
+    завершения, поэтому отмена не оставляет обрезанный файл.
+    """
+    fmt = fmt or detect_format(path)
+    total = db.get_user_progress().total_words
+    tmp_path = f"{path}.part"
+    count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            for count, _ in enumerate(WRITERS[fmt](db.iter_words(), out), 1):
+                if count % settings.TRANSFER_PROGRESS_EVERY == 0:
+                    _check_cancelled(cancelled)
+                    if progress is not None:
+                        progress(count, total)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if progress is not None:
+        progress(count, count)
+    return count
+
+
+def _read_lines(stream, counter: list) -> Iterator[str]:
+    """Строки бинарного файла в UTF-8 с подсчетом прочитанных байт"""
+    for line_no, raw in enumerate(stream):
+        counter[0] += len(raw)
+        try:
+            line = raw.decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise ImportFormatError(f"Строка {line_no + 1}: файл не в кодировке UTF-8 ({e})")
+        yield line.lstrip('\ufeff') if line_no == 0 else line
+
+
+def import_words(db, path, fmt: Optional[str] = None,
+                 progress: Optional[ProgressCallback] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> ImportResult:
+    """Потоковый импорт слов из файла пакетной вставкой
+
+    Файл читается построчно, слова передаются в add_words генератором,
+    поэтому память не зависит от размера файла. Импорт выполняется одной
+    транзакцией: при ошибке формата или отмене БД не меняется. Прогресс
+    сообщается в байтах прочитанного файла.
+    """
+    fmt = fmt or detect_format(path)
+    total = os.path.getsize(path)
+    consumed = [0]
+
+    def words(stream):
+        for count, word in enumerate(READERS[fmt](_read_lines(stream, consumed)), 1):
+            if count % settings.TRANSFER_PROGRESS_EVERY == 0:
+                _check_cancelled(cancelled)
+                if progress is not None:
+                    progress(consumed[0], total)
+            yield word
+
+    with open(path, 'rb') as stream:
+        result = db.add_words(words(stream))
+    if progress is not None:
+        progress(total, total)
+    return result
@@ -0,0 +1,154 @@
+import threading
+from typing import Callable, Dict, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+import settings
+
+
+class DbTask(QRunnable):
+    """Операция с БД, выполняемая в пуле потоков"""
+
+    def __init__(self, executor: "DbExecutor", fn: Callable, args, kwargs,
+                 on_result: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.executor = executor
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            self.executor._task_done.emit(self, False, None)
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.executor._task_done.emit(self, False, e)
+        else:
+            self.executor._task_done.emit(self, True, result)
+
+
+class DbExecutor(QObject):
+    """Выполнение операций с БД в фоне с доставкой результатов в поток GUI
+
+    Задачи с одинаковым ключом вытесняют друг друга: результат устаревшего
+    запроса (например, перекрытого новым обновлением) не доставляется.
+    """
+
+    busy_changed = Signal(bool)
+    failed = Signal(object)  # Ошибка задачи без собственного обработчика
+    _task_done = Signal(object, bool, object)
+
+    def __init__(self, max_threads: int = settings.DB_WORKER_THREADS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks: Set[DbTask] = set()
+        self._latest: Dict[str, DbTask] = {}
+        self._task_done.connect(self._on_task_done)
+
+    @property
+    def busy(self) -> bool:
+        """Есть ли невыполненные задачи"""
+        return bool(self._tasks)
+
+    def submit(self, fn: Callable, *args, key: Optional[str] = None,
+               on_result: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> DbTask:
+        """Запуск операции в фоне"""
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                self.cancel(previous)
+
+        task = DbTask(self, fn, args, kwargs, on_result, on_error)
+        if key is not None:
+            self._latest[key] = task
+        self._tasks.add(task)
+        if len(self._tasks) == 1:
+            self.busy_changed.emit(True)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, task: DbTask):
+        """Отмена задачи: еще не начатая снимается с очереди, результат
+        уже выполняющейся будет отброшен"""
+        task.cancelled = True
+        if self.pool.tryTake(task):
+            self._finish(task)
+
+    def cancel_all(self):
+        """Отмена всех задач"""
+        for task in list(self._tasks):
+            self.cancel(task)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Ожидание завершения всех запущенных задач"""
+        return self.pool.waitForDone(msecs)
+
+    def shutdown(self):
+        """Отмена ожидающих задач и ожидание выполняющихся"""
+        self.cancel_all()
+        self.wait()
+
+    @Slot(object, bool, object)
+    def _on_task_done(self, task: DbTask, ok: bool, value):
+        """Доставка результата в потоке GUI"""
+        if task not in self._tasks:
+            return
+        self._finish(task)
+        if task.cancelled:
+            return
+        if ok:
+            if task.on_result is not None:
+                task.on_result(value)
+        elif value is not None:
+            if task.on_error is not None:
+                task.on_error(value)
+            else:
+                self.failed.emit(value)
+
+    def _finish(self, task: DbTask):
+        """Удаление задачи из списка активных"""
+        self._tasks.discard(task)
+        for key, latest in list(self._latest.items()):
+            if latest is task:
+                del self._latest[key]
+        if not self._tasks:
+            self.busy_changed.emit(False)
+
+
+class DbEvents(QObject):
+    """Передача изменений из БД в поток GUI"""
+
+    changed = Signal(object)
+
+
+class TaskProgress(QObject):
+    """Прогресс и отмена длительной фоновой операции
+
+    report и is_cancelled передаются в операцию как обратные вызовы и
+    безопасны для вызова из рабочего потока: прогресс доходит до потока
+    GUI сигналом.
+    """
+
+    changed = Signal(object, object)  # выполнено, всего (байты могут превышать int32)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = threading.Event()
+
+    def report(self, done: int, total: int):
+        self.changed.emit(done, total)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()